@@ -2,6 +2,9 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config.settings import settings
 from app.utils.logger import info, error
+from app.utils.projection import covering_index
+from app.schemas.complaint import ADMIN_COMPLAINT_LIST_PROJECTION, COMPLAINT_LIST_PROJECTION
+from app.utils.complaint_search import TEXT_INDEX_NAME, TEXT_INDEX_WEIGHTS
 from typing import Optional
 
 
@@ -47,6 +50,15 @@ class Database:
             cls.client.close()
             info("MongoDB connection closed")
     
+    @staticmethod
+    async def drop_other_text_indexes(collection, keep: str):
+        """Drop text indexes other than `keep` (MongoDB allows one per collection)"""
+        indexes = await collection.index_information()
+        for name, spec in indexes.items():
+            if name != keep and any(kind == "text" for _, kind in spec["key"]):
+                await collection.drop_index(name)
+                info(f"Dropped text index {name} (replaced by {keep})")
+    
     @classmethod
     async def create_indexes(cls):
         """Create all required database indexes"""
@@ -80,8 +92,16 @@ class Database:
         # Index on assignedTo for admin's assigned complaints
         await complaints.create_index("assignedTo")
         
-        # Index on createdAt for chronological queries
-        await complaints.create_index([("createdAt", -1)])
+        # Index on createdAt for chronological queries (_id breaks ties for cursors),
+        # carrying every admin list field so the admin list is a covered query
+        await complaints.create_index(
+            covering_index([("createdAt", -1), ("_id", -1)], ADMIN_COMPLAINT_LIST_PROJECTION)
+        )
+        
+        # Compound index for a customer's complaints, newest first (covers the list)
+        await complaints.create_index(
+            covering_index([("customerId", 1), ("createdAt", -1), ("_id", -1)], COMPLAINT_LIST_PROJECTION)
+        )
         
         # Compound index for open complaints by priority
         await complaints.create_index([("status", 1), ("priority", -1)])
@@ -89,14 +109,18 @@ class Database:
         # Compound index for assigned complaints
         await complaints.create_index([("assignedTo", 1), ("status", 1)])
         
-        # Text index for searching
-        await complaints.create_index([
-            ("complaintId", "text"),
-            ("subject", "text"),
-            ("description", "text"),
-            ("customerEmail", "text"),
-            ("customerName", "text")
-        ])
+        # Admin search (app/utils/complaint_search.py): complaint and order ID
+        # prefixes use the indexes above, emails the lowercased search.email
+        await complaints.create_index([("search.email", 1), ("createdAt", -1), ("_id", -1)])
+        
+        # Weighted text index for admin full-text search over subject and description
+        # (a collection holds one text index, so the earlier five-field one is replaced)
+        await cls.drop_other_text_indexes(complaints, TEXT_INDEX_NAME)
+        await complaints.create_index(
+            [(field, "text") for field in TEXT_INDEX_WEIGHTS],
+            name=TEXT_INDEX_NAME,
+            weights=TEXT_INDEX_WEIGHTS
+        )
         
         # Complaint Comments Collection Indexes
         comments = cls.db.complaint_comments
@@ -111,7 +135,7 @@ class Database:
         await comments.create_index("createdAt")
         
         # Compound index for complaint comments chronologically
-        await comments.create_index([("complaintId", 1), ("createdAt", 1)])
+        await comments.create_index([("complaintId", 1), ("createdAt", 1), ("_id", 1)])
         
         # Index on isInternal for filtering internal comments
         await comments.create_index("isInternal")
@@ -146,6 +170,39 @@ class Database:
         # Compound index for active assignments by admin
         await assignments.create_index([("assignedTo", 1), ("isActive", 1)])
 
+        # Email Outbox Collection Indexes
+        outbox = cls.db.email_outbox
+        
+        # Compound index for the sweeper's due-message lookup
+        await outbox.create_index([("status", 1), ("nextAttemptAt", 1)])
+        
+        # Compound index for reclaiming expired leases
+        await outbox.create_index([("status", 1), ("lockedUntil", 1)])
+        
+        # TTL index to expire delivered messages
+        await outbox.create_index(
+            "sentAt",
+            expireAfterSeconds=settings.EMAIL_OUTBOX_RETENTION_DAYS * 24 * 3600
+        )
+
+        # Statistics Outbox Collection Indexes
+        statistics_outbox = cls.db.outbox
+        
+        # Compound index for the dispatcher's due-event lookup
+        await statistics_outbox.create_index([("topic", 1), ("status", 1), ("nextAttemptAt", 1)])
+        
+        # Compound index for queue depth and oldest pending event
+        await statistics_outbox.create_index([("topic", 1), ("status", 1), ("createdAt", 1)])
+        
+        # Index for reading back a claimed batch
+        await statistics_outbox.create_index("claimId")
+        
+        # TTL index to expire delivered events
+        await statistics_outbox.create_index(
+            "deliveredAt",
+            expireAfterSeconds=settings.OUTBOX_RETENTION_DAYS * 24 * 3600
+        )
+
 
 async def get_database() -> AsyncIOMotorDatabase:
     """Dependency to get database instance"""
@@ -1,19 +1,50 @@
 """
 Email Configuration
-Configures SMTP for sending emails
+Queued, non-blocking SMTP delivery backed by a MongoDB outbox
+
+Handlers call send_email(), which records the message in the email_outbox
+collection and hands it to a bounded in-process queue. Worker tasks drain
+the queue in batches over a persistent SMTP connection; failed messages are
+retried with exponential backoff, and anything still pending when the
+service stops is picked up again from the outbox on the next start.
+
+Every hand-off carries a claim ID. A message put on the queue is "queued"
+under one claim; the worker that takes it off swaps that claim for a new
+one and a fresh lease ("sending") right before the SMTP call, and writes
+the outcome only under that claim. A copy whose claim was replaced in the
+meantime (e.g. requeued by a sweeper after its lease ran out while it
+waited) is dropped instead of being sent twice.
 """
-import smtplib
+import asyncio
+import time
+from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Optional, Tuple
+import aiosmtplib
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
 from app.config.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+OUTBOX_COLLECTION = "email_outbox"
+
+# Errors that mean the connection is gone, not that the message was rejected
+_CONNECTION_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+    asyncio.TimeoutError
+)
+
 
-def send_email(to_email: str, subject: str, html_body: str, text_body: str = None):
+def build_message(to_email: str, subject: str, html_body: str, text_body: str = None) -> MIMEMultipart:
     """
-    Send email via SMTP
+    Build a multipart email message
     
     Args:
         to_email: Recipient email address
@@ -22,37 +53,431 @@ def send_email(to_email: str, subject: str, html_body: str, text_body: str = Non
         text_body: Plain text email body (optional)
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        MIME message ready to send
     """
-    try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['From'] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add text part if provided
-        if text_body:
-            msg.attach(MIMEText(text_body, 'plain'))
-        
-        # Add HTML part
-        msg.attach(MIMEText(html_body, 'html'))
-        
-        # Connect to SMTP server
-        with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-            server.starttls()
-            server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
-            server.send_message(msg)
-        
-        logger.info(f"📧 Email sent successfully to {to_email}: {subject}")
+    msg = MIMEMultipart('alternative')
+    msg['From'] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+    msg['To'] = to_email
+    msg['Subject'] = subject
+        
+    # Add text part if provided
+    if text_body:
+        msg.attach(MIMEText(text_body, 'plain'))
+        
+    # Add HTML part
+    msg.attach(MIMEText(html_body, 'html'))
+        
+    return msg
+        
+        
+def is_permanent_failure(exc: Exception) -> bool:
+    """A 5xx reply means retrying the same message will not help"""
+    if isinstance(exc, aiosmtplib.SMTPRecipientsRefused):
+        return all(recipient.code >= 500 for recipient in exc.recipients)
+    if isinstance(exc, aiosmtplib.SMTPResponseException):
+        return exc.code >= 500
+    return False
+
+
+class EmailDispatcher:
+    """
+    Bounded queue, SMTP workers and outbox sweeper for outgoing email
+    
+    Each worker keeps its own SMTP connection open between batches, so
+    the connect/STARTTLS/login cost is paid once per connection rather
+    than once per message.
+    """
+    
+    def __init__(
+        self,
+        host: str = None,
+        port: int = None,
+        username: str = None,
+        password: str = None,
+        use_tls: bool = None,
+        enabled: bool = None,
+        queue_size: int = None,
+        workers: int = None,
+        batch_size: int = None,
+        max_attempts: int = None,
+        retry_base_delay: float = None,
+        retry_max_delay: float = None,
+        poll_interval: float = None,
+        lease: float = None,
+        timeout: float = None
+    ):
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.username = settings.EMAIL_USER if username is None else username
+        self.password = settings.EMAIL_PASSWORD if password is None else password
+        self.use_tls = settings.EMAIL_USE_TLS if use_tls is None else use_tls
+        self.enabled = bool(self.username and self.password) if enabled is None else enabled
+        self.queue_size = queue_size or settings.EMAIL_QUEUE_SIZE
+        self.workers = workers or settings.EMAIL_WORKERS
+        self.batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.EMAIL_MAX_ATTEMPTS
+        self.retry_base_delay = settings.EMAIL_RETRY_BASE_DELAY if retry_base_delay is None else retry_base_delay
+        self.retry_max_delay = settings.EMAIL_RETRY_MAX_DELAY if retry_max_delay is None else retry_max_delay
+        self.poll_interval = poll_interval or settings.EMAIL_OUTBOX_POLL_INTERVAL
+        self.lease = lease or settings.EMAIL_OUTBOX_LEASE
+        self.timeout = timeout or settings.EMAIL_SMTP_TIMEOUT
+        
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping: Optional[asyncio.Event] = None
+        self.stats = {"queued": 0, "deferred": 0, "sent": 0, "retried": 0, "failed": 0, "superseded": 0, "connections": 0}
+    
+    @property
+    def running(self) -> bool:
+        """Whether workers are currently consuming the queue"""
+        return bool(self._tasks)
+    
+    @property
+    def outbox(self):
+        """Outbox collection"""
+        return self.db[OUTBOX_COLLECTION]
+    
+    async def start(self, db: AsyncIOMotorDatabase):
+        """Start the workers and the outbox sweeper (called from the application lifespan)"""
+        if self.running or not self.enabled:
+            return
+        
+        self.db = db
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+        logger.info(
+            f"📧 Email queue started ({self.workers} workers, batch {self.batch_size}, "
+            f"queue size {self.queue_size})"
+        )
+    
+    async def stop(self, timeout: float = 10.0):
+        """
+        Drain the queue and stop the workers (called from the application lifespan)
+        
+        Messages that could not be sent within the timeout are released back
+        to the outbox and will be delivered after the next start.
+        """
+        if not self.running:
+            return
+        
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Email queue did not drain before shutdown")
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        # Release queued but unsent messages for the next start
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait()["claimId"])
+        if remaining:
+            await self.outbox.update_many(
+                {"claimId": {"$in": remaining}, "status": "queued"},
+                {"$set": {"status": "pending", "lockedUntil": None, "claimId": None}}
+            )
+        logger.info(f"Email queue stopped ({len(remaining)} messages left in outbox)")
+    
+    async def enqueue(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> bool:
+        """
+        Record a message in the outbox and queue it for delivery
+        
+        Never waits on SMTP. If the in-process queue is full (or the
+        workers are not running) the message stays pending in the outbox
+        and is picked up by the sweeper.
+        
+        Returns:
+            bool: True if the message was accepted, False otherwise
+        """
+        if not self.enabled:
+            logger.info(f"Email disabled - not sending to {to_email}: {subject}")
+            return False
+        
+        db = self.db
+        if db is None:
+            from app.config.database import Database
+            db = Database.db
+        if db is None:
+            logger.error(f"❌ No database for email outbox - dropping email to {to_email}")
+            return False
+        
+        now = datetime.utcnow()
+        doc = {
+            "to": to_email,
+            "subject": subject,
+            "htmlBody": html_body,
+            "textBody": text_body,
+            "status": "queued" if self.running else "pending",
+            "attempts": 0,
+            "nextAttemptAt": now,
+            "lockedUntil": now + timedelta(seconds=self.lease) if self.running else None,
+            "claimId": ObjectId() if self.running else None,
+            "lastError": None,
+            "createdAt": now,
+            "sentAt": None
+        }
+        await db[OUTBOX_COLLECTION].insert_one(doc)
+        
+        if self.running:
+            try:
+                self.queue.put_nowait(doc)
+                self.stats["queued"] += 1
+                return True
+            except asyncio.QueueFull:
+                await db[OUTBOX_COLLECTION].update_one(
+                    {"_id": doc["_id"], "claimId": doc["claimId"]},
+                    {"$set": {"status": "pending", "lockedUntil": None, "claimId": None}}
+                )
+        
+        self.stats["deferred"] += 1
         return True
+    
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open an authenticated SMTP connection"""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            timeout=self.timeout,
+            start_tls=self.use_tls
+        )
+        await smtp.connect()
+        if self.username:
+            await smtp.login(self.username, self.password)
+        self.stats["connections"] += 1
+        return smtp
+    
+    async def _deliver(self, smtp: Optional[aiosmtplib.SMTP], doc: Dict) -> aiosmtplib.SMTP:
+        """Send one message, reconnecting once if the connection was dropped"""
+        message = build_message(doc["to"], doc["subject"], doc["htmlBody"], doc.get("textBody"))
+        
+        if smtp is None or not smtp.is_connected:
+            smtp = await self._connect()
+        try:
+            await smtp.send_message(message)
+        except _CONNECTION_ERRORS:
+            # Idle connections get closed by the server; retry on a fresh one
+            smtp.close()
+            smtp = await self._connect()
+            await smtp.send_message(message)
+        return smtp
+    
+    async def _claim(self, doc: Dict) -> Optional[Dict]:
+        """
+        Take the lease on a dequeued message right before sending it
+        
+        Returns:
+            The message under a new claim ID, or None if its queue claim
+            was replaced (requeued elsewhere) or it is no longer queued
+        """
+        now = datetime.utcnow()
+        return await self.outbox.find_one_and_update(
+            {"_id": doc["_id"], "claimId": doc["claimId"], "status": "queued"},
+            {
+                "$set": {
+                    "status": "sending",
+                    "claimId": ObjectId(),
+                    "lockedUntil": now + timedelta(seconds=self.lease)
+                }
+            },
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _worker(self, index: int):
+        """Consume the queue in batches over a persistent connection"""
+        smtp: Optional[aiosmtplib.SMTP] = None
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                results: List[Tuple[Dict, Optional[Exception]]] = []
+                claimed_at = None
+                try:
+                    for queued in batch:
+                        try:
+                            doc = await self._claim(queued)
+                        except Exception as e:
+                            # Left queued; the sweeper retries it once the lease runs out
+                            logger.error(f"❌ Failed to claim email {queued['_id']}: {str(e)}")
+                            continue
+                        if doc is None:
+                            self.stats["superseded"] += 1
+                            continue
+                        
+                        claimed_at = claimed_at or time.monotonic()
+                        try:
+                            smtp = await self._deliver(smtp, doc)
+                            results.append((doc, None))
+                        except Exception as e:
+                            results.append((doc, e))
+                            if isinstance(e, _CONNECTION_ERRORS):
+                                smtp = None
+                
+                        # Record early on a slow server, before the oldest lease runs out
+                        if time.monotonic() - claimed_at > self.lease / 2:
+                            await self._flush_results(results)
+                            results, claimed_at = [], None
+                    
+                    await self._flush_results(results)
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            if smtp is not None and smtp.is_connected:
+                smtp.close()
+    
+    async def _flush_results(self, results: List[Tuple[Dict, Optional[Exception]]]):
+        """Record delivery outcomes, logging (not raising) outbox errors"""
+        try:
+            await self._record_results(results)
+        except Exception as e:
+            logger.error(f"❌ Failed to update email outbox: {str(e)}")
+    
+    async def _record_results(self, results: List[Tuple[Dict, Optional[Exception]]]):
+        """
+        Write a batch of delivery outcomes to the outbox in one round-trip
+        
+        Each update only applies while the message is still under the claim
+        it was sent with.
+        """
+        now = datetime.utcnow()
+        operations = []
+        
+        for doc, exc in results:
+            attempts = doc.get("attempts", 0) + 1
+            
+            if exc is None:
+                self.stats["sent"] += 1
+                logger.info(f"📧 Email sent successfully to {doc['to']}: {doc['subject']}")
+                update = {"status": "sent", "attempts": attempts, "sentAt": now, "lockedUntil": None, "claimId": None}
+            elif is_permanent_failure(exc) or attempts >= self.max_attempts:
+                self.stats["failed"] += 1
+                logger.error(f"❌ Failed to send email to {doc['to']} after {attempts} attempts: {str(exc)}")
+                update = {
+                    "status": "failed",
+                    "attempts": attempts,
+                    "lastError": str(exc),
+                    "lockedUntil": None,
+                    "claimId": None
+                }
+            else:
+                self.stats["retried"] += 1
+                delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+                logger.warning(f"Email to {doc['to']} failed (attempt {attempts}), retrying in {delay:.0f}s: {str(exc)}")
+                update = {
+                    "status": "pending",
+                    "attempts": attempts,
+                    "nextAttemptAt": now + timedelta(seconds=delay),
+                    "lastError": str(exc),
+                    "lockedUntil": None,
+                    "claimId": None
+                }
+            
+            operations.append(UpdateOne({"_id": doc["_id"], "claimId": doc["claimId"]}, {"$set": update}))
+        
+        if operations:
+            result = await self.outbox.bulk_write(operations, ordered=False)
+            if result.matched_count < len(operations):
+                logger.warning(
+                    f"{len(operations) - result.matched_count} email outcomes not recorded (lease expired and message reclaimed)"
+                )
+    
+    async def _claim_due(self) -> int:
+        """Move due outbox messages (retries, overflow, expired leases) onto the queue under a new claim"""
+        claimed = 0
+        while not self.queue.full():
+            now = datetime.utcnow()
+            doc = await self.outbox.find_one_and_update(
+                {
+                    "$or": [
+                        {"status": "pending", "nextAttemptAt": {"$lte": now}},
+                        {"status": {"$in": ["queued", "sending"]}, "lockedUntil": {"$lt": now}}
+                    ]
+                },
+                {
+                    "$set": {
+                        "status": "queued",
+                        "claimId": ObjectId(),
+                        "lockedUntil": now + timedelta(seconds=self.lease)
+                    }
+                },
+                sort=[("nextAttemptAt", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is None:
+                break
+            self.queue.put_nowait(doc)
+            claimed += 1
+        return claimed
+    
+    async def _sweeper(self):
+        """Periodically requeue messages waiting in the outbox"""
+        while not self._stopping.is_set():
+            try:
+                await self._claim_due()
+            except Exception as e:
+                logger.error(f"❌ Email outbox sweep failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def outbox_stats(self) -> Dict:
+        """Get queue depth, delivery counters and outbox status counts"""
+        counts = {}
+        if self.db is not None:
+            cursor = self.outbox.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+            counts = {entry["_id"]: entry["count"] async for entry in cursor}
         
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "queueDepth": self.queue.qsize() if self.queue else 0,
+            "queueSize": self.queue_size,
+            "workers": self.workers,
+            "counters": dict(self.stats),
+            "outbox": counts
+        }
+
+
+# Global dispatcher instance
+email_dispatcher = EmailDispatcher()
+
+
+async def send_email(to_email: str, subject: str, html_body: str, text_body: str = None):
+    """
+    Queue an email for delivery
+    
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        html_body: HTML email body
+        text_body: Plain text email body (optional)
+    
+    Returns:
+        bool: True if the email was accepted for delivery, False otherwise
+    """
+    try:
+        return await email_dispatcher.enqueue(to_email, subject, html_body, text_body)
     except Exception as e:
-        logger.error(f"❌ Failed to send email to {to_email}: {str(e)}")
+        logger.error(f"❌ Failed to queue email to {to_email}: {str(e)}")
         return False
 
 
-def verify_email_config():
+async def verify_email_config():
     """
     Verify email configuration by testing SMTP connection
     
@@ -60,14 +485,20 @@ def verify_email_config():
         bool: True if configuration is valid, False otherwise
     """
     try:
-        with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT, timeout=5) as server:
-            server.starttls()
-            server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            timeout=5,
+            start_tls=settings.EMAIL_USE_TLS
+        )
+        await smtp.connect()
+        await smtp.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
+        await smtp.quit()
         
         logger.info("✅ Email service configuration verified")
         return True
         
     except Exception as e:
         logger.warning(f"⚠️  Email service verification failed: {str(e)}")
-        logger.warning("Email notifications will be disabled")
+        logger.warning("Emails will stay in the outbox until the SMTP server is reachable")
         return False
@@ -0,0 +1,169 @@
+"""
+HTTP Client Configuration
+Shared, connection-pooled HTTP client for service-to-service calls
+"""
+import time
+import httpx
+from typing import Dict, Optional, Union
+from app.config.settings import settings
+from app.utils.logger import info, warning
+
+# Trace events that mark the moment a request got a connection from the pool
+_CONNECTION_ACQUIRED_EVENTS = {
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started"
+}
+
+
+class PoolWaitStats:
+    """Running statistics for time spent waiting on the connection pool"""
+
+    def __init__(self):
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        """Record one pool acquisition"""
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict:
+        """Get wait statistics in milliseconds"""
+        return {
+            "requests": self.requests,
+            "avgWaitMs": round(self.total_wait / self.requests * 1000, 3) if self.requests else 0.0,
+            "maxWaitMs": round(self.max_wait * 1000, 3)
+        }
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Async transport that measures how long each request waits for a connection"""
+
+    def __init__(self, wait_stats: PoolWaitStats, **kwargs):
+        super().__init__(**kwargs)
+        self.wait_stats = wait_stats
+
+    @property
+    def pool(self):
+        """Underlying httpcore connection pool"""
+        return self._pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        acquired = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event: str, event_info: dict):
+            nonlocal acquired
+            if not acquired and event in _CONNECTION_ACQUIRED_EVENTS:
+                acquired = True
+                self.wait_stats.record(time.perf_counter() - started)
+            if parent_trace is not None:
+                await parent_trace(event, event_info)
+
+        request.extensions["trace"] = trace
+        return await super().handle_async_request(request)
+
+
+class HTTPClient:
+    """
+    Lifespan-managed HTTP client shared by all outbound service clients
+
+    Keeps TCP/TLS connections alive between calls instead of opening a new
+    client (and handshake) per request.
+    """
+    client: Optional[httpx.AsyncClient] = None
+    transport: Optional[InstrumentedTransport] = None
+    wait_stats: PoolWaitStats = PoolWaitStats()
+
+    @classmethod
+    def _http2_enabled(cls) -> bool:
+        """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+        if not settings.HTTP2_ENABLED:
+            return False
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            warning("HTTP2_ENABLED is set but the h2 package is not installed - using HTTP/1.1")
+            return False
+
+    @classmethod
+    def _create_client(cls) -> httpx.AsyncClient:
+        """Build the pooled client from settings"""
+        cls.wait_stats = PoolWaitStats()
+        cls.transport = InstrumentedTransport(
+            cls.wait_stats,
+            http2=cls._http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        return httpx.AsyncClient(
+            transport=cls.transport,
+            timeout=build_timeout(settings.SERVICE_TIMEOUT)
+        )
+
+    @classmethod
+    async def start(cls):
+        """Create the shared client (called from the application lifespan)"""
+        if cls.client is None:
+            cls.client = cls._create_client()
+            info(
+                f"✅ HTTP client pool ready (max {settings.HTTP_MAX_CONNECTIONS} connections, "
+                f"{settings.HTTP_MAX_KEEPALIVE_CONNECTIONS} keep-alive)"
+            )
+
+    @classmethod
+    async def close(cls):
+        """Close all pooled connections (called from the application lifespan)"""
+        if cls.client is not None:
+            await cls.client.aclose()
+            cls.client = None
+            cls.transport = None
+            info("HTTP client pool closed")
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """
+        Get the shared client
+
+        Created lazily when used outside the application lifespan (scripts, tests).
+        """
+        if cls.client is None:
+            cls.client = cls._create_client()
+        return cls.client
+
+    @classmethod
+    def pool_stats(cls) -> Dict:
+        """Get connection pool usage for sizing the pool limits"""
+        connections = cls.transport.pool.connections if cls.transport else []
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "active": cls.client is not None,
+            "maxConnections": settings.HTTP_MAX_CONNECTIONS,
+            "maxKeepaliveConnections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "connections": len(connections),
+            "inUse": len(connections) - idle,
+            "idle": idle,
+            "poolWait": cls.wait_stats.snapshot()
+        }
+
+
+def build_timeout(seconds: Union[int, float]) -> httpx.Timeout:
+    """
+    Build a per-target timeout that also bounds the wait for a pooled connection
+
+    Args:
+        seconds: Connect/read/write timeout for the target service
+
+    Returns:
+        httpx Timeout
+    """
+    return httpx.Timeout(seconds, pool=settings.HTTP_POOL_TIMEOUT)
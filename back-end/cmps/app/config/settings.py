@@ -25,6 +25,7 @@ class Settings(BaseSettings):
     # JWT Configuration
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
+    JWT_CACHE_SIZE: int = 10000
     
     @property
     def SECRET_KEY(self) -> str:
@@ -39,6 +40,29 @@ class Settings(BaseSettings):
     # Service API Key
     SERVICE_API_KEY: str
     
+    # Service Timeouts (seconds)
+    SERVICE_TIMEOUT: int = 30
+    AUTH_SERVICE_TIMEOUT: float = 10.0
+    CUSTOMER_SERVICE_TIMEOUT: float = 10.0
+    ORDER_SERVICE_TIMEOUT: float = 10.0
+    
+    # Customer profile cache (CRMS lookups by user ID). Per process: CRMS
+    # invalidations reach one worker, the TTL bounds staleness in the others
+    CUSTOMER_CACHE_SIZE: int = 10000
+    CUSTOMER_CACHE_TTL_SECONDS: float = 60.0
+    CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS: float = 30.0
+    
+    # Batch lookups (internal batch endpoints take at most 500 IDs per call)
+    BATCH_LOOKUP_CHUNK_SIZE: int = 200
+    BATCH_LOOKUP_CONCURRENCY: int = 4
+    
+    # HTTP Client Pool (shared by all outbound service clients)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP2_ENABLED: bool = False
+    
     # Email Configuration
     EMAIL_HOST: str = "smtp.gmail.com"
     EMAIL_PORT: int = 587
@@ -46,9 +70,38 @@ class Settings(BaseSettings):
     EMAIL_PASSWORD: str = ""
     EMAIL_FROM: str = "noreply@rman-ecommerce.com"
     EMAIL_FROM_NAME: str = "R-MAN E-Commerce Support"
+    EMAIL_USE_TLS: bool = True
+    EMAIL_SMTP_TIMEOUT: float = 10.0
+    
+    # Email Queue (in-process queue backed by the email_outbox collection)
+    EMAIL_QUEUE_SIZE: int = 1000
+    EMAIL_WORKERS: int = 2
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_DELAY: float = 30.0
+    EMAIL_RETRY_MAX_DELAY: float = 3600.0
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 10.0
+    EMAIL_OUTBOX_LEASE: float = 300.0
+    EMAIL_OUTBOX_RETENTION_DAYS: int = 7
+    
+    # Statistics Outbox (CRMS statistics deltas delivered in the background)
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_MAX_ATTEMPTS: int = 20
+    OUTBOX_RETRY_BASE_DELAY: float = 5.0
+    OUTBOX_RETRY_MAX_DELAY: float = 600.0
+    OUTBOX_POLL_INTERVAL: float = 5.0
+    OUTBOX_FLUSH_DELAY: float = 0.2
+    OUTBOX_LEASE: float = 60.0
+    OUTBOX_RETENTION_DAYS: int = 7
     
     # Complaint Configuration
     COMPLAINT_ID_PREFIX: str = "CMP"
+    ORDER_ID_PREFIX: str = "ORD"
+    ID_SEQUENCE_BLOCK_SIZE: int = 1
+    
+    # Pagination totals (filtered counts are cached this long for includeTotal=estimated)
+    COUNT_CACHE_TTL_SECONDS: float = 10.0
+    COUNT_CACHE_SIZE: int = 1000
     
     # CORS Configuration
     CORS_ORIGINS: str = '["http://localhost:3000","http://localhost:3001"]'
@@ -61,8 +114,18 @@ class Settings(BaseSettings):
         except:
             return ["http://localhost:3000"]
     
+    # Index advisor at startup: off, warn or fail
+    INDEX_ADVISOR_MODE: str = "warn"
+    
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # text or json
+    # Background log writer: queued records beyond LOG_QUEUE_SIZE are dropped;
+    # INFO lines are capped per call site (0 = no cap) and can be sampled
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_INFO_RATE_LIMIT: float = 50.0
+    LOG_INFO_BURST: int = 100
+    LOG_INFO_SAMPLE_RATE: float = 1.0
     
     class Config:
         env_file = ".env"
@@ -3,10 +3,10 @@ Authentication dependencies
 JWT token validation for protected endpoints
 """
 from fastapi import Header, HTTPException, status, Depends
-from jose import JWTError, jwt
+from jose import JWTError
 from typing import Optional, Dict
-from app.config.settings import settings
 from app.utils.logger import error
+from app.utils.token_cache import decode_access_token
 
 
 async def get_current_user(authorization: str = Header(..., description="Bearer token")) -> Dict:
@@ -34,11 +34,7 @@ async def get_current_user(authorization: str = Header(..., description="Bearer
         
         # Decode and validate token
         try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = decode_access_token(token)
         except JWTError as e:
             error(f"JWT validation error: {str(e)}")
             raise HTTPException(
@@ -142,11 +138,7 @@ def get_optional_user(authorization: Optional[str] = Header(None)) -> Optional[D
         
         token = authorization.replace("Bearer ", "")
         
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = decode_access_token(token)
         
         user_id = payload.get("sub") or payload.get("userId")
         
@@ -8,8 +8,17 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
 from app.config.database import Database
+from app.config.http_client import HTTPClient
+from app.utils.counting import count_cache
+from app.utils.customer_cache import customer_cache
+from app.utils.outbox import statistics_outbox
+from app.utils.token_cache import token_cache
+from app.config.email import email_dispatcher, verify_email_config
+from app.services.email_templates import email_templates
+from app.services.external_services import get_customer_service_client
 from app.config.settings import settings
-from app.utils.logger import info
+from app.utils.logger import info, log_pipeline
+from app.utils.index_advisor import check_indexes
 from app.middleware.error_handlers import (
     http_exception_handler,
     validation_exception_handler,
@@ -27,17 +36,23 @@ async def lifespan(app: FastAPI):
     # Startup
     info("Starting Complaint Management Service (CMPS)...")
     await Database.connect_db()
+    await check_indexes(Database.db, settings.INDEX_ADVISOR_MODE)
+    await HTTPClient.start()
+    await statistics_outbox.start(Database.db, get_customer_service_client().apply_statistics_deltas)
     
-    # Verify email configuration
-    if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
+    # Compile email templates once
+    email_templates.load()
+    
+    # Verify email configuration and start the delivery queue
+    if email_dispatcher.enabled:
         try:
-            from app.config.email import verify_email_config
-            if verify_email_config():
+            if await verify_email_config():
                 info("✅ Email service configured and ready")
             else:
-                info("⚠️  Email service not available - notifications disabled")
+                info("⚠️  Email service not available - notifications will be retried from the outbox")
         except Exception as e:
             info(f"⚠️  Email service verification failed: {str(e)}")
+        await email_dispatcher.start(Database.db)
     else:
         info("ℹ️  Email credentials not configured - notifications disabled")
     
@@ -47,8 +62,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     info("Shutting down Complaint Management Service...")
+    await email_dispatcher.stop()
+    await statistics_outbox.stop()
+    await HTTPClient.close()
     await Database.disconnect_db()
     info("✅ Service shutdown complete")
+    log_pipeline.flush()
 
 
 # Create FastAPI application
@@ -164,6 +183,86 @@ async def health_check():
     }
 
 
+# JWT verification cache statistics
+@app.get("/health/token-cache", tags=["Health"])
+async def token_cache_stats():
+    """Verified-token cache size and hit/miss counters"""
+    return {
+        "success": True,
+        "message": "Token cache statistics",
+        "data": token_cache.stats()
+    }
+
+
+# Pagination count cache statistics
+@app.get("/health/count-cache", tags=["Health"])
+async def count_cache_stats():
+    """Cached filtered counts (includeTotal=estimated) size and hit/miss counters"""
+    return {
+        "success": True,
+        "message": "Count cache statistics",
+        "data": count_cache.stats()
+    }
+
+
+# Customer profile cache statistics
+@app.get("/health/customer-cache", tags=["Health"])
+async def customer_cache_stats():
+    """Cached CRMS customer profiles size, hit/miss and invalidation counters"""
+    return {
+        "success": True,
+        "message": "Customer cache statistics",
+        "data": customer_cache.stats()
+    }
+
+
+# HTTP client pool statistics
+@app.get("/health/http-pool", tags=["Health"])
+async def http_pool_stats():
+    """Outbound HTTP connection pool usage (in-use, idle, pool wait time)"""
+    return {
+        "success": True,
+        "message": "HTTP client pool statistics",
+        "data": HTTPClient.pool_stats()
+    }
+
+
+# Logging pipeline statistics
+@app.get("/health/logging", tags=["Health"])
+async def logging_stats():
+    """Log writer queue depth and dropped / rate-capped line counters"""
+    return {
+        "success": True,
+        "message": "Logging pipeline statistics",
+        "data": log_pipeline.stats()
+    }
+
+
+# Statistics outbox statistics
+@app.get("/health/outbox", tags=["Health"])
+async def outbox_stats():
+    """CRMS statistics outbox queue depth, delivery lag and counters"""
+    return {
+        "success": True,
+        "message": "Statistics outbox statistics",
+        "data": await statistics_outbox.outbox_stats()
+    }
+
+
+# Email queue statistics
+@app.get("/health/email-queue", tags=["Health"])
+async def email_queue_stats():
+    """Outbound email queue depth, delivery counters, outbox status counts and template cache"""
+    return {
+        "success": True,
+        "message": "Email queue statistics",
+        "data": {
+            **await email_dispatcher.outbox_stats(),
+            "templates": email_templates.stats()
+        }
+    }
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
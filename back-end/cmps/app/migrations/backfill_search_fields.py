@@ -0,0 +1,67 @@
+"""
+Backfill Search Fields Migration
+Populate the `search` subdocument used by admin complaint search on
+complaints created before it existed
+
+Run from the service root:
+    python -m app.migrations.backfill_search_fields
+"""
+import asyncio
+from pymongo import UpdateOne
+from app.config.database import Database
+from app.utils.complaint_search import search_fields
+from app.utils.logger import info
+
+BATCH_SIZE = 1000
+
+
+async def backfill_search_fields(db, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Set `search` on every complaint that is missing it
+    
+    Args:
+        db: Database instance
+        batch_size: Number of complaints updated per bulk write
+    
+    Returns:
+        Number of complaints updated
+    """
+    updated = 0
+    
+    while True:
+        cursor = db.complaints.find(
+            {"search": {"$exists": False}},
+            {"customerEmail": 1}
+        ).limit(batch_size)
+        complaints = await cursor.to_list(length=batch_size)
+        
+        if not complaints:
+            break
+        
+        operations = [
+            UpdateOne(
+                {"_id": complaint["_id"]},
+                {"$set": {"search": search_fields(complaint.get("customerEmail"))}}
+            )
+            for complaint in complaints
+        ]
+        
+        result = await db.complaints.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+        info("Backfilled search fields for %s complaints so far", updated)
+    
+    return updated
+
+
+async def main():
+    """Run the migration against the configured database"""
+    await Database.connect_db()
+    try:
+        updated = await backfill_search_fields(Database.db)
+        info("✅ Search field backfill complete: %s complaints updated", updated)
+    finally:
+        await Database.disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,12 +6,17 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from typing import Dict, Optional
 from datetime import datetime
 from bson import ObjectId
-import re
 from pydantic import BaseModel, Field
 
 from app.config.database import get_database
 from app.dependencies.auth import get_current_customer
+from app.schemas.complaint import ADMIN_COMPLAINT_LIST_PROJECTION
+from app.utils.complaint_search import FACET_FIELDS, SearchResult, parse_search, run_search
+from app.utils.counting import TotalMode, count_total
+from app.utils.cursor import decode_cursor, fetch_page
+from app.utils.outbox import statistics_outbox
 from app.utils.response import success_response
+from app.utils.json_response import FastJSONResponse, trusted_response
 from app.utils.logger import info, error
 
 
@@ -42,10 +47,31 @@ class UpdatePriorityRequest(BaseModel):
 
 router = APIRouter(
     prefix="/api/complaints",
-    tags=["Admin Complaints"]
+    tags=["Admin Complaints"],
+    default_response_class=FastJSONResponse
 )
 
 
+# Statuses counted in the customer's openComplaints statistic
+OPEN_STATUSES = {"Open", "In Progress", "Reopened"}
+
+
+async def sync_open_complaints(db, complaint: Dict, previous_status: str, new_status: str):
+    """Queue moving the complaint in or out of the customer's openComplaints count in CRMS"""
+    change = (new_status in OPEN_STATUSES) - (previous_status in OPEN_STATUSES)
+    customer_id = complaint.get("customerId")
+    
+    # Complaints filed without a CRMS profile carry a USR- fallback ID
+    if not change or not customer_id or customer_id.startswith("USR-"):
+        return
+    
+    try:
+        await statistics_outbox.publish(customer_id, {"openComplaints": change}, db=db)
+    except Exception as e:
+        # Log error but don't fail the status change
+        error(f"Failed to queue customer statistics update: {str(e)}")
+
+
 def verify_admin_role(current_user: Dict):
     """Verify user has administrator role"""
     user_role = current_user.get("role", "").lower()
@@ -67,6 +93,8 @@ async def list_all_complaints(
     customerId: Optional[str] = Query(None, description="Filter by customer ID"),
     sortBy: str = Query("createdAt", description="Sort field"),
     sortOrder: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    includeTotal: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     current_user: Dict = Depends(get_current_customer),
     db=Depends(get_database)
 ):
@@ -85,9 +113,12 @@ async def list_all_complaints(
     - customerId: Filter by customer ID
     - sortBy: Sort field (createdAt, priority, status, updatedAt)
     - sortOrder: Sort direction (asc/desc)
+    - includeTotal: exact (default), estimated or none
+    - cursor: Keyset cursor from a previous response (same sortBy/sortOrder)
     
     **Returns**: Paginated list of all complaints
     """
+    keyset_cursor = decode_cursor(cursor)
     try:
         # Verify admin access
         verify_admin_role(current_user)
@@ -116,13 +147,17 @@ async def list_all_complaints(
         # Determine sort direction
         sort_direction = -1 if sortOrder.lower() == "desc" else 1
         
-        # Get total count
-        total_items = await db.complaints.count_documents(query_filter)
-        total_pages = (total_items + limit - 1) // limit
+        # Get total count (exact, estimated or skipped)
+        total = await count_total(db.complaints, query_filter, includeTotal)
+        total_items = total.total
+        total_pages = (total_items + limit - 1) // limit if total_items is not None else None
         
         # Get complaints
-        cursor = db.complaints.find(query_filter).sort(sortBy, sort_direction).skip(skip).limit(limit)
-        complaints = await cursor.to_list(length=limit)
+        result = await fetch_page(
+            db.complaints, query_filter, [(sortBy, sort_direction)], limit, skip=skip, cursor=keyset_cursor,
+            projection=ADMIN_COMPLAINT_LIST_PROJECTION
+        )
+        complaints = result.docs
         
         # Format response
         complaint_list = []
@@ -149,16 +184,22 @@ async def list_all_complaints(
                 "currentPage": page,
                 "totalPages": total_pages,
                 "totalItems": total_items,
-                "itemsPerPage": limit
+                "itemsPerPage": limit,
+                "totalExact": total.exact,
+                "hasNextPage": result.has_next,
+                "hasPreviousPage": result.has_previous,
+                "nextCursor": result.next_cursor,
+                "prevCursor": result.prev_cursor
             }
         }
         
         info(f"Admin {current_user.get('email')} retrieved {len(complaint_list)} complaints")
         
-        return success_response(
+        # List items are plain values built from the documents; skip the response_model pass
+        return trusted_response(success_response(
             message="Complaints retrieved successfully",
             data=response_data
-        )
+        ))
         
     except HTTPException:
         raise
@@ -177,11 +218,14 @@ async def search_complaints(
     q: str = Query(..., min_length=1, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    statusFilter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    priority: Optional[str] = Query(None, description="Filter by priority"),
     current_user: Dict = Depends(get_current_customer),
     db=Depends(get_database)
 ):
     """
-    Search complaints by ID, subject, customer email, or order ID (Admin only)
+    Search complaints by ID, order ID, customer email or text (Admin only)
     
     **Authentication**: Required (Administrator only)
     
@@ -189,42 +233,47 @@ async def search_complaints(
     - q: Search query (required)
     - page: Page number (default: 1)
     - limit: Items per page (default: 10, max: 100)
+    - status, category, priority: Narrow the results (facet counts are not narrowed)
     
     **Search Fields**:
-    - Complaint ID (exact match)
-    - Subject (partial match, case-insensitive)
-    - Customer Email (partial match, case-insensitive)
-    - Order ID (exact match)
+    - Complaint ID (exact or prefix, e.g. CMP-2026-0001)
+    - Order ID (exact or prefix, e.g. ORD-2026-000045)
+    - Customer Email (exact or prefix, case-insensitive)
+    - Subject and description (full-text, ranked by relevance)
     
-    **Returns**: Paginated search results
+    **Returns**: Paginated search results ranked by relevance, with counts of
+    all matches by status, category and priority
     """
     try:
         # Verify admin access
         verify_admin_role(current_user)
         
-        # Build search query using $or for multiple fields
-        search_pattern = {"$regex": re.escape(q), "$options": "i"}
+        # Map the search text onto an indexed lookup or the text index
+        search = parse_search(q)
         
-        query_filter = {
-            "$or": [
-                {"complaintId": q},  # Exact match for complaint ID
-                {"subject": search_pattern},  # Partial match for subject
-                {"customerEmail": search_pattern},  # Partial match for email
-                {"orderId": q}  # Exact match for order ID
-            ]
-        }
+        filters = {}
+        if statusFilter:
+            filters["status"] = statusFilter
+        if category:
+            filters["category"] = category
+        if priority:
+            filters["priority"] = priority
         
         # Calculate pagination
         skip = (page - 1) * limit
         
-        # Get total count
-        total_items = await db.complaints.count_documents(query_filter)
+        # Page, total and facet counts in one aggregation
+        if search:
+            result = await run_search(
+                db.complaints, search, filters, skip, limit, ADMIN_COMPLAINT_LIST_PROJECTION
+            )
+        else:
+            # Nothing searchable in the text (e.g. only punctuation)
+            result = SearchResult(docs=[], total=0, facets={field: {} for field in FACET_FIELDS})
+        complaints = result.docs
+        total_items = result.total
         total_pages = (total_items + limit - 1) // limit
         
-        # Get complaints, sorted by relevance (createdAt desc)
-        cursor = db.complaints.find(query_filter).sort("createdAt", -1).skip(skip).limit(limit)
-        complaints = await cursor.to_list(length=limit)
-        
         # Format response
         complaint_list = []
         for complaint in complaints:
@@ -252,15 +301,18 @@ async def search_complaints(
                 "totalItems": total_items,
                 "itemsPerPage": limit
             },
-            "searchQuery": q
+            "facets": result.facets,
+            "searchQuery": q,
+            "searchType": search.kind if search else None
         }
         
-        info(f"Admin {current_user.get('email')} searched complaints with query: {q}, found {total_items} results")
+        info("Admin %s searched complaints with query: %s, found %s results", current_user.get('email'), q, total_items)
         
-        return success_response(
+        # List items are plain values built from the documents; skip the response_model pass
+        return trusted_response(success_response(
             message=f"Found {total_items} complaints matching '{q}'",
             data=response_data
-        )
+        ))
         
     except HTTPException:
         raise
@@ -345,7 +397,7 @@ async def assign_complaint(
         if complaint.get("customerEmail"):
             try:
                 from app.services.email_service import send_complaint_assigned_email
-                send_complaint_assigned_email(
+                await send_complaint_assigned_email(
                     customer_email=complaint.get("customerEmail"),
                     customer_name=complaint.get("customerName", "Customer"),
                     complaint_id=complaintId,
@@ -451,11 +503,13 @@ async def resolve_complaint(
         
         info(f"Complaint {complaintId} resolved by {user_id}")
         
+        await sync_open_complaints(db, complaint, previous_status, "Resolved")
+        
         # Send resolution email to customer
         if complaint.get("customerEmail"):
             try:
                 from app.services.email_service import send_complaint_resolved_email
-                send_complaint_resolved_email(
+                await send_complaint_resolved_email(
                     customer_email=complaint.get("customerEmail"),
                     customer_name=complaint.get("customerName", "Customer"),
                     complaint_id=complaintId,
@@ -571,6 +625,8 @@ async def reopen_complaint(
         
         info(f"Complaint {complaintId} reopened by {user_id}")
         
+        await sync_open_complaints(db, complaint, "Resolved", "Open")
+        
         return success_response(
             message="Complaint reopened successfully",
             data={
@@ -663,6 +719,8 @@ async def close_complaint(
         
         info(f"Complaint {complaintId} closed by {user_id}")
         
+        await sync_open_complaints(db, complaint, "Resolved", "Closed")
+        
         return success_response(
             message="Complaint closed successfully",
             data={
@@ -761,11 +819,13 @@ async def update_status(
         
         info(f"Complaint {complaintId} status updated from {previous_status} to {request.status}")
         
+        await sync_open_complaints(db, complaint, previous_status, request.status)
+        
         # Send status change email to customer
         if complaint.get("customerEmail"):
             try:
                 from app.services.email_service import send_complaint_status_changed_email
-                send_complaint_status_changed_email(
+                await send_complaint_status_changed_email(
                     customer_email=complaint.get("customerEmail"),
                     customer_name=complaint.get("customerName", "Customer"),
                     complaint_id=complaintId,
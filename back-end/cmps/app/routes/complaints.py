@@ -11,7 +11,8 @@ from app.config.database import get_database
 from app.dependencies.auth import get_current_customer
 from app.schemas.complaint import (
     CreateComplaintRequest,
-    ComplaintResponse
+    ComplaintResponse,
+    COMPLAINT_LIST_PROJECTION
 )
 from app.schemas.comment import (
     CreateCommentRequest,
@@ -22,13 +23,19 @@ from app.services.external_services import (
     get_order_service_client
 )
 from app.utils.complaint_id import generate_complaint_id
+from app.utils.complaint_search import search_fields
+from app.utils.counting import TotalMode, count_total
+from app.utils.cursor import decode_cursor, fetch_page
+from app.utils.outbox import statistics_outbox
 from app.utils.response import success_response
-from app.utils.logger import info, error
+from app.utils.json_response import FastJSONResponse, trusted_response
+from app.utils.logger import info, error, debug
 
 
 router = APIRouter(
     prefix="/api/complaints",
-    tags=["Complaints"]
+    tags=["Complaints"],
+    default_response_class=FastJSONResponse
 )
 
 
@@ -58,7 +65,7 @@ async def create_complaint(
     3. Generate unique complaint ID
     4. Save complaint to database
     5. Create history entry
-    6. Update customer statistics
+    6. Queue customer statistics update
     
     **Returns**: Created complaint information
     """
@@ -77,7 +84,7 @@ async def create_complaint(
         # Step 1: Get customer information
         customer_data = await customer_service.get_customer_by_user_id(user_id, token)
         
-        info(f"Customer data from CRMS: {customer_data}")
+        debug("Customer data from CRMS: %s", customer_data)
         
         if not customer_data:
             # For admin users or users without customer profiles, use basic user info
@@ -89,7 +96,7 @@ async def create_complaint(
             customer_id = customer_data.get("customerId")
             customer_email = customer_data.get("email") or current_user.get("email")
             customer_name = customer_data.get("name") or current_user.get("name", "")
-            info(f"Using customer data - ID: {customer_id}, Email: {customer_email}")
+            info("Using customer data - ID: %s, Email: %s", customer_id, customer_email)
         
         # Step 2: Validate order if provided
         order_id_string = None
@@ -175,6 +182,7 @@ async def create_complaint(
                 "platform": request.metadata.platform if request.metadata else None,
                 "source": request.metadata.source if request.metadata else "Web"
             },
+            "search": search_fields(customer_email),
             "createdAt": now,
             "updatedAt": now,
             "updatedBy": user_id
@@ -208,23 +216,23 @@ async def create_complaint(
         
         await db.complaint_history.insert_one(history_entry)
         
-        # Step 7: Update customer statistics
+        # Step 7: Queue the customer statistics update for CRMS
         try:
             # Only update if we have a real customer ID (not fallback)
             if customer_data and customer_id:
-                await customer_service.update_complaint_statistics(
-                    customer_id=customer_id,
-                    increment=True
+                await statistics_outbox.publish(
+                    customer_id,
+                    {"totalComplaints": 1, "openComplaints": 1, "lastComplaintDate": now},
+                    db=db
                 )
-                info(f"Updated complaint count for customer {customer_id}")
         except Exception as e:
             # Log error but don't fail the complaint creation
-            error(f"Failed to update customer statistics: {str(e)}")
+            error(f"Failed to queue customer statistics update: {str(e)}")
         
         # Step 8: Send confirmation email
         try:
             from app.services.email_service import send_complaint_created_email
-            send_complaint_created_email(
+            await send_complaint_created_email(
                 customer_email=customer_email,
                 customer_name=customer_name,
                 complaint_id=complaint_id,
@@ -275,6 +283,8 @@ async def get_my_complaints(
     category: Optional[str] = Query(None, description="Filter by category"),
     sortBy: str = Query("createdAt", description="Sort field"),
     sortOrder: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    includeTotal: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     current_user: Dict = Depends(get_current_customer),
     authorization: str = Header(None),
     db=Depends(get_database)
@@ -291,9 +301,12 @@ async def get_my_complaints(
     - category: Filter by category
     - sortBy: Sort field (createdAt, priority, status)
     - sortOrder: Sort direction (asc/desc)
+    - includeTotal: exact (default), estimated or none
+    - cursor: Keyset cursor from a previous response (same sortBy/sortOrder)
     
     **Returns**: Paginated list of customer's complaints
     """
+    keyset_cursor = decode_cursor(cursor)
     try:
         user_id = current_user["userId"]
         
@@ -329,13 +342,17 @@ async def get_my_complaints(
         # Determine sort direction
         sort_direction = -1 if sortOrder.lower() == "desc" else 1
         
-        # Get total count
-        total_items = await db.complaints.count_documents(query_filter)
-        total_pages = (total_items + limit - 1) // limit
+        # Get total count (exact, estimated or skipped)
+        total = await count_total(db.complaints, query_filter, includeTotal)
+        total_items = total.total
+        total_pages = (total_items + limit - 1) // limit if total_items is not None else None
         
         # Get complaints
-        cursor = db.complaints.find(query_filter).sort(sortBy, sort_direction).skip(skip).limit(limit)
-        complaints = await cursor.to_list(length=limit)
+        result = await fetch_page(
+            db.complaints, query_filter, [(sortBy, sort_direction)], limit, skip=skip, cursor=keyset_cursor,
+            projection=COMPLAINT_LIST_PROJECTION
+        )
+        complaints = result.docs
         
         # Format response
         complaint_list = []
@@ -358,16 +375,22 @@ async def get_my_complaints(
                 "currentPage": page,
                 "totalPages": total_pages,
                 "totalItems": total_items,
-                "itemsPerPage": limit
+                "itemsPerPage": limit,
+                "totalExact": total.exact,
+                "hasNextPage": result.has_next,
+                "hasPreviousPage": result.has_previous,
+                "nextCursor": result.next_cursor,
+                "prevCursor": result.prev_cursor
             }
         }
         
         info(f"Retrieved {len(complaint_list)} complaints for customer {customer_id}")
         
-        return success_response(
+        # List items are plain values built from the documents; skip the response_model pass
+        return trusted_response(success_response(
             message="Complaints retrieved successfully",
             data=response_data
-        )
+        ))
         
     except HTTPException:
         raise
@@ -630,7 +653,7 @@ async def add_comment(
             complaint.get("customerEmail")):
             try:
                 from app.services.email_service import send_complaint_comment_email
-                send_complaint_comment_email(
+                await send_complaint_comment_email(
                     customer_email=complaint.get("customerEmail"),
                     customer_name=complaint.get("customerName", "Customer"),
                     complaint_id=complaintId,
@@ -677,6 +700,8 @@ async def get_comments(
     complaintId: str,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    includeTotal: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     current_user: Dict = Depends(get_current_customer),
     authorization: str = Header(None),
     db=Depends(get_database)
@@ -693,9 +718,12 @@ async def get_comments(
     **Query Parameters**:
     - page: Page number (default: 1)
     - limit: Items per page (default: 20, max: 100)
+    - includeTotal: exact (default), estimated or none
+    - cursor: Keyset cursor from a previous response
     
     **Returns**: Paginated list of comments, sorted by createdAt ascending
     """
+    keyset_cursor = decode_cursor(cursor)
     try:
         user_id = current_user["userId"]
         user_role = current_user.get("role", "").lower()
@@ -748,13 +776,14 @@ async def get_comments(
         # Calculate pagination
         skip = (page - 1) * limit
         
-        # Get total count
-        total_items = await db.complaint_comments.count_documents(query_filter)
-        total_pages = (total_items + limit - 1) // limit
+        # Get total count (exact, estimated or skipped)
+        total = await count_total(db.complaint_comments, query_filter, includeTotal)
+        total_items = total.total
+        total_pages = (total_items + limit - 1) // limit if total_items is not None else None
         
         # Get comments, sorted by createdAt ascending
-        cursor = db.complaint_comments.find(query_filter).sort("createdAt", 1).skip(skip).limit(limit)
-        comments = await cursor.to_list(length=limit)
+        result = await fetch_page(db.complaint_comments, query_filter, [("createdAt", 1)], limit, skip=skip, cursor=keyset_cursor)
+        comments = result.docs
         
         # Format response
         comment_list = []
@@ -777,7 +806,12 @@ async def get_comments(
                 "currentPage": page,
                 "totalPages": total_pages,
                 "totalItems": total_items,
-                "itemsPerPage": limit
+                "itemsPerPage": limit,
+                "totalExact": total.exact,
+                "hasNextPage": result.has_next,
+                "hasPreviousPage": result.has_previous,
+                "nextCursor": result.next_cursor,
+                "prevCursor": result.prev_cursor
             }
         }
         
@@ -4,10 +4,12 @@ Routes for service-to-service communication
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Dict, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.config.database import get_database
 from app.dependencies.service_auth import verify_service_api_key
+from app.utils.customer_cache import customer_cache
 from app.utils.logger import info, error
 from app.utils.response import success_response
 
@@ -15,6 +17,22 @@ from app.utils.response import success_response
 router = APIRouter(prefix="/api/internal", tags=["Internal"])
 
 
+# Statuses counted as open / resolved in complaint summaries
+OPEN_STATUSES = ["Open", "In Progress", "Reopened"]
+RESOLVED_STATUSES = ["Resolved", "Closed"]
+
+
+class CustomerCacheInvalidation(BaseModel):
+    """Customer whose cached profile changed in CRMS"""
+    userId: Optional[str] = Field(None, description="User ID of the customer")
+    customerId: Optional[str] = Field(None, description="Customer ID")
+
+
+class ComplaintSummaryLookup(BaseModel):
+    """Customers whose complaint summaries are looked up in one call"""
+    customerIds: List[str] = Field(..., min_length=1, max_length=500, description="Customer IDs (at most 500)")
+
+
 @router.get("/customers/{customer_id}/complaints", response_model=Dict)
 async def get_customer_complaints(
     customer_id: str,
@@ -74,13 +92,13 @@ async def get_customer_complaints(
         # Count open complaints
         open_complaints = await db.complaints.count_documents({
             "customerId": customer_id,
-            "status": {"$in": ["Open", "In Progress", "Reopened"]}
+            "status": {"$in": OPEN_STATUSES}
         })
         
         # Count resolved complaints
         resolved_complaints = await db.complaints.count_documents({
             "customerId": customer_id,
-            "status": {"$in": ["Resolved", "Closed"]}
+            "status": {"$in": RESOLVED_STATUSES}
         })
         
         # Get last complaint date
@@ -141,6 +159,109 @@ async def get_customer_complaints(
         )
 
 
+@router.post("/customers/complaints/summary", response_model=Dict)
+async def get_customer_complaint_summaries(
+    request: ComplaintSummaryLookup,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    _: bool = Depends(verify_service_api_key)
+):
+    """
+    Get complaint summaries of many customers in one call
+    
+    **Authentication**: Requires valid service API key (X-Service-API-Key header)
+    
+    **Purpose**: Replaces one GET /customers/{customer_id}/complaints call
+    per customer when CRMS shows a page of customers
+    
+    Returns:
+    - summaries: Summary and status breakdown keyed by customer ID; customers
+      without complaints get a zero summary
+    """
+    customer_ids = list(dict.fromkeys(request.customerIds))
+    summaries = {
+        customer_id: {
+            "summary": {
+                "totalComplaints": 0,
+                "openComplaints": 0,
+                "resolvedComplaints": 0,
+                "lastComplaintDate": None
+            },
+            "statusBreakdown": {}
+        }
+        for customer_id in customer_ids
+    }
+    
+    try:
+        # One pass over the customerId index: counts and latest date per (customer, status)
+        pipeline = [
+            {"$match": {"customerId": {"$in": customer_ids}}},
+            {"$group": {
+                "_id": {"customerId": "$customerId", "status": "$status"},
+                "count": {"$sum": 1},
+                "lastComplaintDate": {"$max": "$createdAt"}
+            }}
+        ]
+        async for group in db.complaints.aggregate(pipeline):
+            customer = summaries[group["_id"]["customerId"]]
+            complaint_status = group["_id"].get("status")
+            summary = customer["summary"]
+            
+            customer["statusBreakdown"][complaint_status] = group["count"]
+            summary["totalComplaints"] += group["count"]
+            if complaint_status in OPEN_STATUSES:
+                summary["openComplaints"] += group["count"]
+            elif complaint_status in RESOLVED_STATUSES:
+                summary["resolvedComplaints"] += group["count"]
+            if group.get("lastComplaintDate") and (
+                summary["lastComplaintDate"] is None or group["lastComplaintDate"] > summary["lastComplaintDate"]
+            ):
+                summary["lastComplaintDate"] = group["lastComplaintDate"]
+        
+        for customer in summaries.values():
+            last_date = customer["summary"]["lastComplaintDate"]
+            customer["summary"]["lastComplaintDate"] = last_date.isoformat() if last_date else None
+        
+        info(f"Retrieved complaint summaries for {len(customer_ids)} customers")
+        
+        return success_response(
+            message="Customer complaint summaries retrieved successfully",
+            data={"summaries": summaries}
+        )
+    
+    except Exception as e:
+        error(f"Error retrieving customer complaint summaries: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve customer complaint summaries"
+        )
+
+
+@router.post("/customer-cache/invalidate", response_model=Dict)
+async def invalidate_customer_cache(
+    request: CustomerCacheInvalidation,
+    _: bool = Depends(verify_service_api_key)
+):
+    """
+    Drop a customer's cached profile
+    
+    **Authentication**: Requires valid service API key (X-Service-API-Key header)
+    
+    **Purpose**: Called by CRMS when a customer is created or their status,
+    type or profile changes, so the next lookup reads the new profile
+    
+    **Scope**: Clears the cache of the worker process that receives the
+    call only; other workers and replicas pick up the change when their
+    entry expires (CUSTOMER_CACHE_TTL_SECONDS)
+    """
+    if not request.userId and not request.customerId:
+        raise HTTPException(status_code=400, detail="userId or customerId is required")
+    
+    invalidated = customer_cache.invalidate(user_id=request.userId, customer_id=request.customerId)
+    return success_response(
+        message="Customer cache entry invalidated" if invalidated else "Customer was not cached",
+        data={"invalidated": invalidated}
+    )
+
 @router.get("/health", response_model=Dict)
 async def health_check():
     """
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
+from app.utils.projection import model_projection
 
 
 class ComplaintCategory(str, Enum):
@@ -100,6 +101,18 @@ class ComplaintListItem(BaseModel):
     updatedAt: datetime
 
 
+class AdminComplaintListItem(ComplaintListItem):
+    """Complaint item for admin list views"""
+    customerId: str
+    customerEmail: str
+    assignedTo: Optional[str] = None
+
+
+# Stored fields read for the customer and admin complaint lists
+COMPLAINT_LIST_PROJECTION = model_projection(ComplaintListItem)
+ADMIN_COMPLAINT_LIST_PROJECTION = model_projection(AdminComplaintListItem)
+
+
 class UpdateComplaintStatusRequest(BaseModel):
     """Request schema for updating complaint status"""
     status: ComplaintStatus = Field(..., description="New complaint status")
@@ -172,6 +185,11 @@ class ComplaintHistoryResponse(BaseModel):
 class PaginationMetadata(BaseModel):
     """Pagination metadata"""
     currentPage: int
-    totalPages: int
-    totalItems: int
+    totalPages: Optional[int]
+    totalItems: Optional[int]
     itemsPerPage: int
+    totalExact: bool = True
+    hasNextPage: Optional[bool] = None
+    hasPreviousPage: Optional[bool] = None
+    nextCursor: Optional[str] = None
+    prevCursor: Optional[str] = None
@@ -0,0 +1,184 @@
+"""
+Email Template Engine
+Precompiled Jinja2 templates for complaint notification emails
+
+Templates live in app/templates/email as <name>.html / <name>.txt pairs that
+extend a shared layout (header, CSS, sign-off, footer). Everything is
+compiled once at startup and kept in memory; a render only evaluates the
+per-message fields.
+"""
+import os
+import re
+import time
+from typing import Dict, List, NamedTuple
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template, select_autoescape
+from markupsafe import Markup, escape
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+# Subject line per template
+EMAIL_SUBJECTS = {
+    "complaint_created": "Complaint Registered: {{ complaint_id }} - R-MAN E-Commerce",
+    "complaint_status_changed": "Status Update: {{ complaint_id }} - R-MAN E-Commerce",
+    "complaint_resolved": "Complaint Resolved: {{ complaint_id }} - R-MAN E-Commerce",
+    "complaint_assigned": "Complaint Update: {{ complaint_id }} - R-MAN E-Commerce",
+    "complaint_comment": "New Comment: {{ complaint_id }} - R-MAN E-Commerce"
+}
+
+# Marks a per-recipient field in a batch render (never produced by escaping)
+_SLOT = "\x1a{}\x1a"
+_SLOT_PATTERN = re.compile("\x1a(\\w+)\x1a")
+
+
+class CompiledEmail(NamedTuple):
+    """Compiled subject, HTML and text templates for one email type"""
+    subject: Template
+    html: Template
+    text: Template
+
+
+class RenderedEmail(NamedTuple):
+    """Rendered email ready for send_email()"""
+    subject: str
+    html: str
+    text: str
+
+
+class EmailTemplateEngine:
+    """Loads, compiles and caches the email templates"""
+    
+    def __init__(self, template_dir: str = TEMPLATE_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(["html"], default_for_string=False),
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            keep_trailing_newline=True,
+            auto_reload=False,
+            cache_size=-1
+        )
+        self._compiled: Dict[str, CompiledEmail] = {}
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.render_seconds = 0.0
+    
+    def load(self):
+        """Compile every registered template (called from the application lifespan)"""
+        for name in EMAIL_SUBJECTS:
+            self._compile(name)
+    
+    def _compile(self, name: str) -> CompiledEmail:
+        """Compile one email type and keep it in the cache"""
+        compiled = CompiledEmail(
+            subject=self.env.from_string(EMAIL_SUBJECTS[name]),
+            html=self.env.get_template(f"{name}.html"),
+            text=self.env.get_template(f"{name}.txt")
+        )
+        self._compiled[name] = compiled
+        return compiled
+    
+    def get(self, name: str) -> CompiledEmail:
+        """
+        Get the compiled templates for an email type
+        
+        Args:
+            name: Template name (key of EMAIL_SUBJECTS)
+        
+        Returns:
+            Compiled templates
+        """
+        compiled = self._compiled.get(name)
+        if compiled is not None:
+            self.hits += 1
+            return compiled
+        
+        self.misses += 1
+        return self._compile(name)
+    
+    @staticmethod
+    def _render(compiled: CompiledEmail, context: Dict) -> RenderedEmail:
+        """Evaluate the compiled templates with the given fields"""
+        return RenderedEmail(
+            subject=compiled.subject.render(context),
+            html=compiled.html.render(context),
+            text=compiled.text.render(context)
+        )
+    
+    def render(self, name: str, **context) -> RenderedEmail:
+        """
+        Render one email
+        
+        Args:
+            name: Template name
+            **context: Template fields (customer_name, complaint_id, ...)
+        
+        Returns:
+            Rendered subject, HTML and text bodies
+        """
+        started = time.perf_counter()
+        rendered = self._render(self.get(name), context)
+        
+        self.renders += 1
+        self.render_seconds += time.perf_counter() - started
+        return rendered
+    
+    def render_batch(self, name: str, shared: Dict, recipients: List[Dict]) -> List[RenderedEmail]:
+        """
+        Render the same email for many recipients with one template pass
+        
+        The template is rendered once with the shared fields filled in and a
+        slot in place of every per-recipient field; each recipient then only
+        costs a substitution into that skeleton. Per-recipient fields must be
+        output as-is in the template (not used in conditions or filters).
+        
+        Args:
+            name: Template name
+            shared: Fields identical for every recipient
+            recipients: Per-recipient fields (e.g. customer_name, complaint_id)
+        
+        Returns:
+            One rendered email per recipient, in order
+        """
+        if not recipients:
+            return []
+        
+        started = time.perf_counter()
+        fields = {field for recipient in recipients for field in recipient}
+        skeleton = self._render(self.get(name), {
+            **shared,
+            **{field: Markup(_SLOT.format(field)) for field in fields}
+        })
+        
+        def fill(template: str, recipient: Dict, html: bool) -> str:
+            return _SLOT_PATTERN.sub(
+                lambda match: str(escape(recipient[match.group(1)])) if html else str(recipient[match.group(1)]),
+                template
+            )
+        
+        rendered = [
+            RenderedEmail(
+                subject=fill(skeleton.subject, recipient, html=False),
+                html=fill(skeleton.html, recipient, html=True),
+                text=fill(skeleton.text, recipient, html=False)
+            )
+            for recipient in recipients
+        ]
+        
+        self.renders += len(recipients)
+        self.render_seconds += time.perf_counter() - started
+        return rendered
+    
+    def stats(self) -> Dict:
+        """Get template cache and render statistics"""
+        return {
+            "compiled": len(self._compiled),
+            "cacheHits": self.hits,
+            "cacheMisses": self.misses,
+            "renders": self.renders,
+            "avgRenderMs": round(self.render_seconds / self.renders * 1000, 3) if self.renders else 0.0
+        }
+
+
+# Global template engine instance
+email_templates = EmailTemplateEngine()
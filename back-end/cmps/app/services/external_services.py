@@ -2,9 +2,12 @@
 Service clients for external service communication
 HTTP clients for Auth, Customer, and Order services
 """
-import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from fastapi.encoders import jsonable_encoder
 from app.config.settings import settings
+from app.config.http_client import HTTPClient, build_timeout
+from app.utils.batching import fetch_in_chunks
+from app.utils.customer_cache import customer_cache
 from app.utils.logger import error, info, warning
 
 
@@ -13,7 +16,7 @@ class AuthServiceClient:
     
     def __init__(self):
         self.base_url = settings.AUTH_SERVICE_URL
-        self.timeout = 10.0
+        self.timeout = build_timeout(settings.AUTH_SERVICE_TIMEOUT)
     
     async def validate_token(self, token: str) -> Optional[Dict]:
         """
@@ -26,17 +29,18 @@ class AuthServiceClient:
             User information if valid, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/auth/validate",
-                    headers={"Authorization": f"Bearer {token}"}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/auth/validate",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data")
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("data")
                 
-                return None
+            return None
                 
         except Exception as e:
             error(f"Auth Service validation error: {str(e)}")
@@ -54,17 +58,18 @@ class AuthServiceClient:
             User information if found
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/users/{user_id}",
-                    headers={"Authorization": f"Bearer {token}"}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/users/{user_id}",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data")
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("data")
                 
-                return None
+            return None
                 
         except Exception as e:
             error(f"Auth Service get user error: {str(e)}")
@@ -77,80 +82,187 @@ class CustomerServiceClient:
     def __init__(self):
         self.base_url = settings.CUSTOMER_SERVICE_URL
         self.api_key = settings.SERVICE_API_KEY
-        self.timeout = 10.0
+        self.timeout = build_timeout(settings.CUSTOMER_SERVICE_TIMEOUT)
     
+    async def _fetch_customer_by_user_id(self, user_id: str, token: str = None) -> Optional[Dict]:
+        """
+        Fetch customer information by user ID from Customer Service
+            
+        Returns:
+            Customer information, or None if the user has no customer profile
+        
+        Raises:
+            Exception if Customer Service could not answer
+        """
+        client = HTTPClient.get_client()
+        # If token is provided, use the /me endpoint (customer-facing)
+        if token:
+            response = await client.get(
+                f"{self.base_url}/api/customers/me",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=self.timeout
+            )
+        else:
+            # Try internal endpoint (service-to-service)
+            response = await client.get(
+                f"{self.base_url}/api/customers/internal/user/{user_id}",
+                headers={"x-api-key": self.api_key},
+                timeout=self.timeout
+            )
+                
+        if response.status_code == 200:
+            data = response.json()
+            # Handle both direct data and wrapped data responses
+            return data.get("data") if "data" in data else data
+                
+        if response.status_code == 404:
+            warning(f"Customer not found for user {user_id}")
+            return None
+        raise Exception(f"Customer Service returned status {response.status_code}")
+                
     async def get_customer_by_user_id(self, user_id: str, token: str = None) -> Optional[Dict]:
         """
-        Get customer information by user ID
+        Get customer information by user ID, from the profile cache or Customer Service
         
         Args:
             user_id: User ID
             token: Optional JWT token to use /me endpoint
-            
+        
         Returns:
             Customer information if found
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # If token is provided, use the /me endpoint (customer-facing)
-                if token:
-                    response = await client.get(
-                        f"{self.base_url}/api/customers/me",
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
-                else:
-                    # Try internal endpoint (service-to-service)
-                    response = await client.get(
-                        f"{self.base_url}/api/internal/customers/user/{user_id}",
-                        headers={"x-service-api-key": self.api_key}
-                    )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # Handle both direct data and wrapped data responses
-                    return data.get("data") if "data" in data else data
-                
-                warning(f"Customer not found for user {user_id}: {response.status_code}")
-                return None
-                
+            return await customer_cache.get_or_load(
+                user_id,
+                lambda: self._fetch_customer_by_user_id(user_id, token)
+            )
         except Exception as e:
             error(f"Customer Service get customer error: {str(e)}")
             return None
     
-    async def update_complaint_statistics(
-        self,
-        customer_id: str,
-        increment: bool = True
-    ) -> bool:
+    async def _fetch_customers_batch(self, id_field: str, ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch one chunk of customers from the CRMS batch lookup
+        
+        Args:
+            id_field: "customerIds" or "userIds"
+            ids: IDs of the chunk
+        
+        Returns:
+            Customers keyed by the requested ID
+        
+        Raises:
+            Exception if Customer Service could not answer
+        """
+        client = HTTPClient.get_client()
+        response = await client.post(
+            f"{self.base_url}/api/customers/internal/batch",
+            headers={"x-api-key": self.api_key},
+            json={id_field: ids},
+            timeout=self.timeout
+        )
+        
+        if response.status_code == 200:
+            data = response.json().get("data") or {}
+            return data.get("byCustomerId" if id_field == "customerIds" else "byUserId") or {}
+        raise Exception(f"Customer Service returned status {response.status_code}")
+    
+    async def get_customers_by_ids(self, customer_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many customers by customer ID, in parallel chunks
+        
+        Args:
+            customer_ids: Customer IDs
+        
+        Returns:
+            Customers keyed by customer ID (unknown IDs are absent)
+        """
+        return await fetch_in_chunks(
+            customer_ids,
+            lambda chunk: self._fetch_customers_batch("customerIds", chunk)
+        )
+    
+    async def get_customers_by_user_ids(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many customers by user ID, in parallel chunks
+        
+        Args:
+            user_ids: User IDs
+        
+        Returns:
+            Customers keyed by user ID (users without a profile are absent)
+        """
+        return await fetch_in_chunks(
+            user_ids,
+            lambda chunk: self._fetch_customers_batch("userIds", chunk)
+        )
+    
+    async def apply_statistics_delta(self, customer_id: str, delta: Dict) -> bool:
         """
-        Update customer complaint statistics
+        Add changes to a customer's statistics in CRMS
+        
+        CRMS applies the delta atomically on its stored values, so
+        concurrent complaint updates for the same customer are all counted.
         
         Args:
             customer_id: Customer ID
-            increment: True to increment, False to decrement
+            delta: Counter changes, e.g. {"totalComplaints": 1, "openComplaints": 1}
             
         Returns:
             True if successful
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.patch(
-                    f"{self.base_url}/api/internal/customers/{customer_id}/statistics",
-                    headers={"x-service-api-key": self.api_key},
-                    json={"complaintCount": 1 if increment else -1}
-                )
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/customers/internal/{customer_id}/statistics/delta",
+                headers={"x-api-key": self.api_key},
+                json=jsonable_encoder(delta),
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    info(f"Updated complaint count for customer {customer_id}")
-                    return True
+            if response.status_code == 200:
+                info(f"Applied statistics delta for customer {customer_id}: {delta}")
+                return True
                 
-                warning(f"Failed to update complaint statistics: {response.status_code}")
-                return False
+            warning(f"Failed to update complaint statistics: {response.status_code}")
+            return False
                 
         except Exception as e:
             error(f"Customer Service update statistics error: {str(e)}")
             return False
-
+    
+    async def apply_statistics_deltas(self, deltas: List[Dict]) -> bool:
+        """
+        Add changes to many customers' statistics in one CRMS call
+        
+        Args:
+            deltas: Deltas with a customerId each (at most 500 per call)
+        
+        Returns:
+            True if CRMS accepted the batch
+        """
+        try:
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/customers/internal/statistics/deltas",
+                headers={"x-api-key": self.api_key},
+                json={"deltas": jsonable_encoder(deltas)},
+                timeout=self.timeout
+            )
+            
+            if response.status_code == 200:
+                result = response.json().get("data") or {}
+                if result.get("notFound"):
+                    warning(f"Statistics deltas for unknown customers: {result['notFound']}")
+                return True
+            
+            warning(f"Failed to update complaint statistics: {response.status_code}")
+            return False
+        
+        except Exception as e:
+            error(f"Customer Service update statistics error: {str(e)}")
+            return False
+    
 
 class OrderServiceClient:
     """Client for Order Service communication"""
@@ -158,7 +270,7 @@ class OrderServiceClient:
     def __init__(self):
         self.base_url = settings.ORDER_SERVICE_URL
         self.api_key = settings.SERVICE_API_KEY
-        self.timeout = 10.0
+        self.timeout = build_timeout(settings.ORDER_SERVICE_TIMEOUT)
     
     async def get_order_by_id(self, order_id: str) -> Optional[Dict]:
         """
@@ -171,22 +283,54 @@ class OrderServiceClient:
             Order information if found
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/internal/orders/{order_id}",
-                    headers={"x-service-api-key": self.api_key}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/internal/orders/{order_id}",
+                headers={"x-service-api-key": self.api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    return response.json()
+            if response.status_code == 200:
+                return response.json()
                 
-                warning(f"Order not found: {order_id}")
-                return None
+            warning(f"Order not found: {order_id}")
+            return None
                 
         except Exception as e:
             error(f"Order Service get order error: {str(e)}")
             return None
     
+    async def _fetch_orders_batch(self, order_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch one chunk of orders from the ORMS batch lookup
+        
+        Raises:
+            Exception if Order Service could not answer
+        """
+        client = HTTPClient.get_client()
+        response = await client.post(
+            f"{self.base_url}/api/internal/orders/batch",
+            headers={"x-service-api-key": self.api_key},
+            json={"orderIds": order_ids},
+            timeout=self.timeout
+        )
+        
+        if response.status_code == 200:
+            return response.json().get("orders") or {}
+        raise Exception(f"Order Service returned status {response.status_code}")
+    
+    async def get_orders_by_ids(self, order_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many orders by order ID, in parallel chunks
+        
+        Args:
+            order_ids: Order IDs
+        
+        Returns:
+            Orders keyed by order ID (unknown IDs are absent)
+        """
+        return await fetch_in_chunks(order_ids, self._fetch_orders_batch)
+    
     async def verify_order_customer(self, order_id: str, customer_id: str) -> bool:
         """
         Verify that an order belongs to a specific customer
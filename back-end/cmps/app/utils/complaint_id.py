@@ -5,8 +5,12 @@ Generates unique complaint IDs in format: CMP-YYYY-NNNNNN
 from datetime import datetime
 from app.config.settings import settings
 from app.config.database import get_database
+from app.utils.sequence import SequenceGenerator, last_issued_number
 from typing import Optional
 
+# Shared per-process generator; block size > 1 reserves IDs in memory
+_sequence = SequenceGenerator(block_size=settings.ID_SEQUENCE_BLOCK_SIZE)
+
 
 async def generate_complaint_id() -> str:
     """
@@ -23,24 +27,15 @@ async def generate_complaint_id() -> str:
     # Get database
     db = await get_database()
     
-    # Find the highest complaint number for current year
     prefix = f"{settings.COMPLAINT_ID_PREFIX}-{current_year}-"
     
-    # Query for complaints from current year
-    last_complaint = await db.complaints.find_one(
-        {"complaintId": {"$regex": f"^{prefix}"}},
-        sort=[("complaintId", -1)]
+    # Atomically take the next number for this prefix and year
+    next_number = await _sequence.next_value(
+        db,
+        f"{settings.COMPLAINT_ID_PREFIX}-{current_year}",
+        seed=lambda: last_issued_number(db.complaints, "complaintId", prefix)
     )
     
-    if last_complaint:
-        # Extract number from last complaint ID
-        last_id = last_complaint["complaintId"]
-        last_number = int(last_id.split("-")[-1])
-        next_number = last_number + 1
-    else:
-        # First complaint of the year
-        next_number = 1
-    
     # Format with leading zeros (6 digits)
     complaint_id = f"{prefix}{next_number:06d}"
     
@@ -0,0 +1,191 @@
+"""
+Complaint Search
+Index-backed admin complaint search with ranking and facet counts
+
+Admin search used unanchored, case-insensitive $regex clauses on subject
+and customerEmail inside an $or, which no index can answer (every search
+scanned the whole collection), while the text index was never queried.
+Each kind of search text now maps onto an index:
+
+- Complaint IDs ("CMP-2026-000123", "cmp-2026-0001"): exact or prefix
+  range on the unique complaintId index
+- Order IDs ("ORD-2026-000045"): exact or prefix range on the orderId index
+- Emails (anything containing "@"): exact or prefix range on
+  search.email, the lowercased customer email
+- Anything else: full-text search over subject and description through
+  the weighted text index, ranked by text score (subject words weigh more)
+
+Lookups rank exact matches above prefix matches. One aggregation returns
+the page, the total and counts by status, category and priority; facet
+counts cover every match of the search text, before the status, category
+and priority filters, so they show what each filter would leave.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+from app.config.settings import settings
+
+# Text index over the searchable free-text fields (subject words weigh more)
+TEXT_INDEX_NAME = "complaint_search_text"
+TEXT_INDEX_WEIGHTS = {"subject": 5, "description": 1}
+
+# Fields counted per value for every search
+FACET_FIELDS = ("status", "category", "priority")
+
+# Words of a query passed to the text search (the rest are ignored)
+MAX_QUERY_WORDS = 10
+
+_WORD = re.compile(r"[^\W_]+")
+_COMPLETE_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]{2,}$")
+
+# Upper bound for prefix ranges on ASCII and BMP strings
+_PREFIX_END = "\uffff"
+
+
+class SearchQuery(NamedTuple):
+    """Index-backed match and ranking score for one search"""
+    kind: str
+    match: Dict[str, Any]
+    score: Any
+
+
+class SearchResult(NamedTuple):
+    """One page of ranked matches with the total and facet counts"""
+    docs: List[Dict[str, Any]]
+    total: int
+    facets: Dict[str, Dict[str, int]]
+
+
+def search_fields(customer_email: Optional[str]) -> Dict[str, Any]:
+    """The `search` subdocument stored on a complaint"""
+    return {"email": (customer_email or "").strip().lower()}
+
+
+def _prefix(field: str, value: str) -> Dict[str, Any]:
+    """Range condition matching values that start with `value`"""
+    return {field: {"$gte": value, "$lt": value + _PREFIX_END}}
+
+
+def _id_lookup(text: str, prefix: str) -> bool:
+    """Whether text is an ID with the given prefix (or the start of one)"""
+    upper = text.upper()
+    return upper.startswith(prefix) and (len(upper) == len(prefix) or not upper[len(prefix)].isalpha())
+
+
+def parse_search(text: Optional[str]) -> Optional[SearchQuery]:
+    """
+    Map an admin search box value onto an index-backed query
+    
+    Args:
+        text: Raw search text
+    
+    Returns:
+        SearchQuery, or None if the text contains nothing searchable
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    
+    for kind, prefix in (("complaintId", settings.COMPLAINT_ID_PREFIX), ("orderId", settings.ORDER_ID_PREFIX)):
+        if _id_lookup(text, prefix.upper()):
+            value = text.upper()
+            return SearchQuery(
+                kind=kind,
+                match=_prefix(kind, value),
+                score={"$cond": [{"$eq": [f"${kind}", value]}, 2, 1]}
+            )
+    
+    if "@" in text:
+        email = text.lower()
+        complete = bool(_COMPLETE_EMAIL.match(email))
+        return SearchQuery(
+            kind="email",
+            match={"search.email": email} if complete else _prefix("search.email", email),
+            score={"$cond": [{"$eq": ["$search.email", email]}, 2, 1]}
+        )
+    
+    # Plain words only: quotes and leading "-" would change $text semantics
+    words = list(dict.fromkeys(_WORD.findall(text.lower())))[:MAX_QUERY_WORDS]
+    if not words:
+        return None
+    return SearchQuery(
+        kind="text",
+        match={"$text": {"$search": " ".join(words)}},
+        score={"$meta": "textScore"}
+    )
+
+
+def build_search_pipeline(
+    search: SearchQuery,
+    filters: Dict[str, Any],
+    skip: int,
+    limit: int,
+    projection: Dict[str, int]
+) -> List[Dict[str, Any]]:
+    """
+    Aggregation returning one ranked page, the total and facet counts
+    
+    Args:
+        search: Parsed search
+        filters: Status / category / priority filters
+        skip: Offset into the ranked matches
+        limit: Page size
+        projection: Fields returned for each complaint (must include the facet fields)
+    
+    Returns:
+        Pipeline producing a single {"results", "total", <facet field>...} document
+    """
+    narrowed = [{"$match": filters}] if filters else []
+    facets = {
+        field: [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}}
+        ]
+        for field in FACET_FIELDS
+    }
+    return [
+        {"$match": search.match},
+        {"$project": {**projection, **{field: 1 for field in FACET_FIELDS}, "_score": search.score}},
+        {"$facet": {
+            "results": narrowed + [
+                {"$sort": {"_score": -1, "createdAt": -1, "_id": -1}},
+                {"$skip": skip},
+                {"$limit": limit},
+                {"$project": {"_score": 0}}
+            ],
+            "total": narrowed + [{"$count": "count"}],
+            **facets
+        }}
+    ]
+
+
+async def run_search(
+    collection,
+    search: SearchQuery,
+    filters: Dict[str, Any],
+    skip: int,
+    limit: int,
+    projection: Dict[str, int]
+) -> SearchResult:
+    """
+    Run a search in one round-trip
+    
+    Args:
+        collection: Motor complaints collection
+        search: Parsed search
+        filters: Status / category / priority filters
+        skip: Offset into the ranked matches
+        limit: Page size
+        projection: Fields returned for each complaint
+    
+    Returns:
+        SearchResult
+    """
+    pipeline = build_search_pipeline(search, filters, skip, limit, projection)
+    output = (await collection.aggregate(pipeline).to_list(length=1))[0]
+    
+    total = output["total"][0]["count"] if output["total"] else 0
+    facets = {
+        field: {bucket["_id"]: bucket["count"] for bucket in output[field] if bucket["_id"] is not None}
+        for field in FACET_FIELDS
+    }
+    return SearchResult(docs=output["results"], total=total, facets=facets)
@@ -0,0 +1,147 @@
+"""
+Counting
+Total item counts for paginated lists: exact, estimated or skipped
+
+count_documents walks every matching index entry, which on large
+collections costs more than fetching the page. Estimated totals use the
+collection's metadata count for unfiltered lists and a short-TTL cache of
+filtered counts, so grids that refresh every few seconds reuse one count.
+"""
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from bson import json_util
+from app.config.settings import settings
+
+# (collection name, normalized filter, count limit)
+CountKey = Tuple[str, str, Optional[int]]
+
+
+class TotalMode(str, Enum):
+    """How a list endpoint computes its total"""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class CountResult(NamedTuple):
+    """Total for a list, and whether it is an exact count taken now"""
+    total: Optional[int]
+    exact: bool
+
+
+def normalize_filter(query: Dict) -> str:
+    """Canonical form of a filter, so equal filters share a cache entry"""
+    return json_util.dumps(query, sort_keys=True)
+
+
+class CountCache:
+    """LRU map of (collection, normalized filter, limit) to (count, expires_at)"""
+    
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[CountKey, Tuple[int, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: CountKey) -> Optional[int]:
+        """
+        Get a cached count
+        
+        Returns:
+            Count, or None if not cached or older than the TTL
+        """
+        entry = self._entries.get(key)
+        
+        if entry is not None:
+            count, expires_at = entry
+            if self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return count
+            del self._entries[key]
+        
+        self.misses += 1
+        return None
+    
+    def put(self, key: CountKey, count: int):
+        """Cache a count for the TTL"""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        
+        self._entries[key] = (count, self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """Drop all cached counts"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global filtered-count cache instance
+count_cache = CountCache(max_size=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+async def count_total(
+    collection,
+    query: Dict,
+    mode: TotalMode = TotalMode.EXACT,
+    limit: Optional[int] = None
+) -> CountResult:
+    """
+    Count the items of a list in the requested mode
+    
+    - exact: count_documents on every call
+    - estimated: estimated_document_count for an empty filter, otherwise a
+      count_documents result reused for COUNT_CACHE_TTL_SECONDS
+    - none: no count at all
+    
+    Args:
+        collection: Motor collection
+        query: Filter for the list
+        mode: Total mode requested by the client
+        limit: Stop counting filtered matches at this many (for lists that
+            cannot page past a window anyway)
+    
+    Returns:
+        CountResult; exact is False for metadata counts and cache hits
+    """
+    if mode == TotalMode.NONE:
+        return CountResult(total=None, exact=False)
+    
+    count_options = {"limit": limit} if limit else {}
+    
+    if mode == TotalMode.EXACT:
+        return CountResult(total=await collection.count_documents(query, **count_options), exact=True)
+    
+    if not query:
+        return CountResult(total=await collection.estimated_document_count(), exact=False)
+    
+    key = (collection.name, normalize_filter(query), limit)
+    total = count_cache.get(key)
+    if total is not None:
+        return CountResult(total=total, exact=False)
+    
+    total = await collection.count_documents(query, **count_options)
+    count_cache.put(key, total)
+    return CountResult(total=total, exact=True)
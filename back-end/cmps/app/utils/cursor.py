@@ -0,0 +1,229 @@
+"""
+Keyset Pagination
+Opaque cursor tokens and keyset (seek) queries for list endpoints
+
+A cursor encodes the sort key values and _id of the first or last item of a
+page. The next page is read with a range condition on those values instead
+of skip(), so any page costs the same as the first one. Page numbers keep
+working; cursors are offered alongside them.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from bson import ObjectId, json_util
+from fastapi import HTTPException, status
+from app.utils.projection import add_fields
+
+SortSpec = List[Tuple[str, int]]
+
+# Values a cursor may carry (no documents or arrays, so no query operators)
+_CURSOR_VALUE_TYPES = (str, int, float, bool, datetime, ObjectId, type(None))
+
+
+class Cursor(NamedTuple):
+    """Decoded cursor: sort it was issued for, boundary values and direction"""
+    sort: SortSpec
+    values: List[Any]
+    backwards: bool
+
+
+class KeysetPage(NamedTuple):
+    """One page of documents with the cursors around it"""
+    docs: List[Dict]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+    has_next: bool
+    has_previous: bool
+
+
+def with_tiebreaker(sort: SortSpec) -> SortSpec:
+    """Append _id to the sort so every position in the order is unique"""
+    if any(field == "_id" for field, _ in sort):
+        return list(sort)
+    return list(sort) + [("_id", sort[-1][1] if sort else 1)]
+
+
+def _get_path(doc: Dict, path: str) -> Any:
+    """Read a dotted field path from a document"""
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def encode_cursor(sort: SortSpec, doc: Dict, backwards: bool = False) -> str:
+    """
+    Build the cursor token for a document
+    
+    Args:
+        sort: Sort specification including the _id tiebreaker
+        doc: First (backwards) or last (forwards) document of a page
+        backwards: True for a previous-page cursor
+    
+    Returns:
+        URL-safe opaque token
+    """
+    payload = json_util.dumps({
+        "s": [[field, direction] for field, direction in sort],
+        "v": [_get_path(doc, field) for field, _ in sort],
+        "b": backwards
+    })
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Cursor]:
+    """
+    Decode a cursor query parameter
+    
+    Args:
+        token: Token from nextCursor / prevCursor, or None
+    
+    Returns:
+        Decoded cursor, or None if no token was given
+    
+    Raises:
+        HTTPException: 400 if the token is malformed
+    """
+    if not token:
+        return None
+    
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        cursor = Cursor(
+            sort=[(field, direction) for field, direction in payload["s"]],
+            values=list(payload["v"]),
+            backwards=bool(payload["b"])
+        )
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        cursor = None
+    
+    if (
+        cursor is None
+        or len(cursor.sort) != len(cursor.values)
+        or not all(isinstance(field, str) and direction in (1, -1) for field, direction in cursor.sort)
+        or not all(isinstance(value, _CURSOR_VALUE_TYPES) for value in cursor.values)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    return cursor
+
+
+def _compare(field: str, operator: str, value: Any) -> Optional[Dict]:
+    """
+    Condition for `field` strictly after `value` in scan order
+    
+    Null and missing values sort before every other value in MongoDB, and a
+    plain $lt/$gt never matches them, so they are handled explicitly.
+    Returns None when no value can come after `value`.
+    """
+    if value is None:
+        return {field: {"$ne": None}} if operator == "$gt" else None
+    if operator == "$gt":
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: SortSpec, values: List[Any], backwards: bool = False) -> Dict:
+    """
+    Range condition selecting documents after (or before) a position
+    
+    For sort keys (a, b, _id) and boundary (va, vb, vid) this is
+    a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND _id > vid),
+    with > flipped per key for descending keys and for backwards scans.
+    
+    Args:
+        sort: Sort specification including the _id tiebreaker
+        values: Boundary values, one per sort key
+        backwards: Select documents before the boundary instead
+    
+    Returns:
+        MongoDB filter
+    """
+    branches = []
+    for position, (field, direction) in enumerate(sort):
+        forwards_ascending = (direction == 1) != backwards
+        condition = _compare(field, "$gt" if forwards_ascending else "$lt", values[position])
+        if condition is None:
+            continue
+        
+        equal = {prior: values[index] for index, (prior, _) in enumerate(sort[:position])}
+        branches.append({**equal, **condition})
+    
+    if not branches:
+        # Nothing can follow the boundary
+        return {"_id": {"$in": []}}
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+async def fetch_page(
+    collection,
+    query: Dict,
+    sort: SortSpec,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[Cursor] = None,
+    projection: Optional[Dict] = None
+) -> KeysetPage:
+    """
+    Fetch one page by offset or by cursor, and build cursors for its neighbours
+    
+    Args:
+        collection: Motor collection
+        query: Filter for the list
+        sort: Sort specification (an _id tiebreaker is appended)
+        limit: Page size
+        skip: Offset, used only when no cursor is given
+        cursor: Decoded cursor from the request
+        projection: Fields to return; the sort keys are added so cursors
+            can be built from the documents
+    
+    Returns:
+        KeysetPage with documents in sort order
+    
+    Raises:
+        HTTPException: 400 if the cursor was issued for a different sort
+    """
+    sort = with_tiebreaker(sort)
+    if projection is not None:
+        projection = add_fields(projection, [field for field, _ in sort])
+    
+    if cursor is None:
+        docs = await collection.find(query, projection).sort(sort).skip(skip).limit(limit + 1).to_list(length=limit + 1)
+        has_next = len(docs) > limit
+        has_previous = skip > 0
+        docs = docs[:limit]
+    else:
+        if cursor.sort != sort:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pagination cursor does not match the requested sort"
+            )
+        
+        boundary = keyset_filter(sort, cursor.values, cursor.backwards)
+        scan_sort = [(field, -direction) for field, direction in sort] if cursor.backwards else sort
+        docs = await collection.find(
+            {"$and": [query, boundary]} if query else boundary,
+            projection
+        ).sort(scan_sort).limit(limit + 1).to_list(length=limit + 1)
+        
+        more = len(docs) > limit
+        docs = docs[:limit]
+        if cursor.backwards:
+            docs.reverse()
+            has_next, has_previous = True, more
+        else:
+            has_next, has_previous = more, True
+    
+    return KeysetPage(
+        docs=docs,
+        next_cursor=encode_cursor(sort, docs[-1]) if has_next and docs else None,
+        prev_cursor=encode_cursor(sort, docs[0], backwards=True) if has_previous and docs else None,
+        has_next=has_next,
+        has_previous=has_previous
+    )
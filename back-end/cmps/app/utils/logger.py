@@ -1,40 +1,54 @@
-"""Logging utility for the application"""
-import logging
+"""
+Logging Utility
+Centralized logging configuration
+
+Records are written by the background thread of app/utils/log_pipeline.py;
+INFO lines are rate capped per call site (LOG_INFO_* settings). Pass values
+as %-style arguments, info("Order %s created", order_id), so they are only
+formatted for lines that are written; keyword arguments become structured
+fields of the record.
+"""
+from app.utils.log_pipeline import configure_logging
 
 # Import settings with try/except to handle initialization issues
 try:
     from app.config.settings import settings
     SERVICE_NAME = settings.SERVICE_NAME
     LOG_LEVEL = settings.LOG_LEVEL
+    USE_JSON = settings.LOG_FORMAT.lower() == "json"
+    PIPELINE_OPTIONS = {
+        "queue_size": settings.LOG_QUEUE_SIZE,
+        "info_rate_limit": settings.LOG_INFO_RATE_LIMIT,
+        "info_burst": settings.LOG_INFO_BURST,
+        "info_sample_rate": settings.LOG_INFO_SAMPLE_RATE
+    }
 except Exception:
     SERVICE_NAME = "complaint-service"
     LOG_LEVEL = "INFO"
+    USE_JSON = False
+    PIPELINE_OPTIONS = {}
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL, logging.INFO),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+# Configure logging (library loggers go through the same pipeline)
+logger, log_pipeline = configure_logging(
+    SERVICE_NAME, LOG_LEVEL, USE_JSON, capture_root=True, **PIPELINE_OPTIONS
 )
 
-logger = logging.getLogger(SERVICE_NAME)
 
-
-def info(message: str):
+def info(message: str, *args, **kwargs):
     """Log info message"""
-    logger.info(message)
+    logger.info(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def error(message: str):
+def error(message: str, *args, **kwargs):
     """Log error message"""
-    logger.error(message)
+    logger.error(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def warning(message: str):
+def warning(message: str, *args, **kwargs):
     """Log warning message"""
-    logger.warning(message)
+    logger.warning(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def debug(message: str):
+def debug(message: str, *args, **kwargs):
     """Log debug message"""
-    logger.debug(message)
+    logger.debug(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
@@ -0,0 +1,78 @@
+"""
+Response Projections
+MongoDB projections derived from the Pydantic models list endpoints return
+
+List endpoints map a handful of fields into their list item model but used
+to read whole documents, including long descriptions, notes and nested
+history. model_projection() builds the projection from the model's fields
+(using their aliases), so it follows the schema as fields are added or
+removed. covering_index() turns a list sort and projection into compound
+index keys that hold every projected field, so MongoDB can answer the
+list from the index alone (a covered query, no FETCH stage).
+"""
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Type
+from pydantic import BaseModel
+
+IndexKeys = List[Tuple[str, int]]
+
+_projections: Dict[tuple, Dict[str, int]] = {}
+
+
+def model_projection(
+    model: Type[BaseModel],
+    renames: Optional[Mapping[str, str]] = None,
+    extra: Iterable[str] = ()
+) -> Dict[str, int]:
+    """
+    Inclusion projection for the fields a response model reads
+    
+    Args:
+        model: Pydantic response model
+        renames: Model field name to stored field path, for fields that are
+            not stored under their own name (e.g. {"customerId": "_id"})
+        extra: Further stored fields the endpoint reads
+    
+    Returns:
+        New projection dictionary (safe to modify)
+    """
+    renames = dict(renames or {})
+    extra = tuple(extra)
+    key = (model, tuple(sorted(renames.items())), extra)
+    
+    if key not in _projections:
+        paths = [renames.get(name, field.alias or name) for name, field in model.model_fields.items()]
+        _projections[key] = {path: 1 for path in dict.fromkeys(paths + list(extra))}
+    return dict(_projections[key])
+
+
+def add_fields(projection: Dict, fields: Iterable[str]) -> Dict:
+    """
+    Add fields to an inclusion projection without path collisions
+    
+    A field already covered by a projected parent is skipped; projected
+    children of a new field are replaced by it.
+    """
+    result = dict(projection)
+    for field in fields:
+        parts = field.split(".")
+        if any(".".join(parts[:depth]) in result for depth in range(1, len(parts) + 1)):
+            continue
+        for path in [path for path in result if path.startswith(field + ".")]:
+            del result[path]
+        result[field] = 1
+    return result
+
+
+def covering_index(prefix: IndexKeys, projection: Mapping[str, object]) -> IndexKeys:
+    """
+    Index keys that cover a list query
+    
+    Args:
+        prefix: Equality and sort keys the list filters and sorts on
+        projection: Projection the list reads
+    
+    Returns:
+        The prefix followed by every projected field not already in it
+    """
+    indexed = {field for field, _ in prefix}
+    return list(prefix) + [(field, 1) for field in projection if field not in indexed]
@@ -0,0 +1,142 @@
+"""
+JSON Response Benchmark
+Serializes a 100-item admin complaint list page three ways: FastAPI's
+default path (response_model validation, then the stdlib JSON encoder), an
+opted-in router (validation, then orjson) and trusted_response (orjson
+only), and checks that all three produce the same JSON.
+No MongoDB required.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.utils.cursor import encode_cursor
+from app.utils.json_response import FastJSONResponse, orjson, trusted_response
+from app.utils.response import success_response
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+
+def complaint(n, now):
+    """Admin list item as built by list_all_complaints from the projected document"""
+    created = now - timedelta(minutes=n, microseconds=n * 1000)
+    return {
+        "complaintId": f"CMP-2026-{n:06d}",
+        "customerId": f"customer-{n % 500}",
+        "customerEmail": f"customer{n % 500}@example.com",
+        "customerName": f"Customer {n % 500}",
+        "orderId": f"ORD-2026-{n:06d}" if n % 4 else None,
+        "category": "Product Quality",
+        "subject": f"Damaged item in order {n}",
+        "status": "Resolved" if n % 3 == 0 else "Open",
+        "priority": "High" if n % 5 == 0 else "Medium",
+        "assignedTo": f"admin-{n % 7}" if n % 2 else None,
+        "assignedToName": f"Admin {n % 7}" if n % 2 else None,
+        "createdAt": created.isoformat(),
+        "updatedAt": created.isoformat()
+    }
+
+
+def build_page():
+    """Content list_all_complaints returns for one page"""
+    now = datetime.utcnow().replace(microsecond=0)
+    complaints = [complaint(n, now) for n in range(PAGE_SIZE)]
+    return success_response(
+        message="Complaints retrieved successfully",
+        data={
+            "complaints": complaints,
+            "pagination": {
+                "currentPage": 1,
+                "totalPages": 50,
+                "totalItems": 5000,
+                "itemsPerPage": PAGE_SIZE,
+                "totalExact": True,
+                "hasNextPage": True,
+                "hasPreviousPage": False,
+                "nextCursor": encode_cursor(
+                    [("createdAt", -1), ("_id", -1)],
+                    {"createdAt": now - timedelta(minutes=PAGE_SIZE), "_id": "65b2a1f0c3d4e5f6a7b80063"}
+                ),
+                "prevCursor": None
+            }
+        }
+    )
+
+
+def print_result(passed, message):
+    """Print check result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {message}")
+    return passed
+
+
+async def run_benchmark():
+    """Time each serialization path over the same page"""
+    content = build_page()
+    field = create_response_field("Response", Dict)
+    
+    async def default_path():
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+    
+    async def opted_in_router():
+        return FastJSONResponse(await serialize_response(field=field, response_content=content)).body
+    
+    async def trusted():
+        return trusted_response(content).body
+    
+    print(f"Admin complaint list page of {PAGE_SIZE} items, {ROUNDS} rounds (orjson {'installed' if orjson else 'NOT installed'})\n")
+    print(f"{'':<36} {'ms/page':>10} {'bytes':>10}")
+    
+    results = {}
+    for label, path in (
+        ("Default (validate + stdlib json)", default_path),
+        ("Opted-in router (validate + orjson)", opted_in_router),
+        ("trusted_response (orjson)", trusted)
+    ):
+        body = await path()
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            await path()
+        elapsed = (time.perf_counter() - started) / ROUNDS
+        results[label] = (elapsed, body)
+        print(f"{label:<36} {elapsed * 1000:>10.3f} {len(body):>10,}")
+    
+    print()
+    default, router, fast = results.values()
+    passed = print_result(
+        json.loads(default[1]) == json.loads(router[1]) == json.loads(fast[1]),
+        "All paths produce the same JSON"
+    )
+    passed &= print_result(
+        fast[0] < default[0],
+        f"trusted_response is {default[0] / fast[0]:.1f}x faster, "
+        f"opted-in router {default[0] / router[0]:.1f}x faster than the default path"
+    )
+    return passed
+
+
+def main():
+    """Run the JSON response benchmark"""
+    print("\n" + "=" * 80)
+    print("CMPS - JSON Response Benchmark".center(80))
+    print("=" * 80 + "\n")
+    
+    passed = asyncio.run(run_benchmark())
+    
+    print("\n" + "=" * 80)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
 from app.config.settings import settings
 from app.utils.logger import info, error
+from app.utils.projection import covering_index
+from app.schemas.customer import CUSTOMER_LIST_PROJECTION
 
 
 class Database:
@@ -80,17 +82,50 @@ class Database:
                     name="search_text_index"
                 ),
                 
+                # Admin autocomplete (app/utils/customer_autocomplete.py): typed word
+                # prefixes, newest customers first; email prefixes
+                IndexModel(
+                    [("search.grams", ASCENDING), ("customerSince", DESCENDING), ("_id", DESCENDING)],
+                    name="search_grams_customerSince_id"
+                ),
+                IndexModel([("search.email", ASCENDING)], name="search_email_index"),
+                
                 # Index on lastOrderDate for sorting
                 IndexModel([("lastOrderDate", DESCENDING)], name="lastOrderDate_index"),
                 
                 # Index on totalOrderValue for high-value customer queries
                 IndexModel([("totalOrderValue", DESCENDING)], name="totalOrderValue_index"),
                 
+                # Index on customerSince for the default admin listing sort
+                # (_id is the cursor pagination tiebreaker), carrying every
+                # list field so the listing is a covered query
+                IndexModel(
+                    covering_index(
+                        [("customerSince", DESCENDING), ("_id", DESCENDING)],
+                        CUSTOMER_LIST_PROJECTION
+                    ),
+                    name="customerSince_id_list_covering"
+                ),
+                
+                # Compound index for status-filtered admin listing
+                IndexModel(
+                    [("customerStatus", ASCENDING), ("customerSince", DESCENDING), ("_id", DESCENDING)],
+                    name="status_customerSince_id_compound"
+                ),
+                
                 # Index on createdAt for chronological queries
                 IndexModel([("createdAt", DESCENDING)], name="createdAt_index"),
             ]
             
             await customers_collection.create_indexes(indexes)
+            
+            # Shared rate limiter state: drop keys once idle (see app.utils.rate_limiter)
+            await cls.db.rate_limits.create_index(
+                [("expiresAt", ASCENDING)],
+                expireAfterSeconds=0,
+                name="expiresAt_ttl"
+            )
+            
             info("✅ Database indexes created successfully")
             
         except Exception as e:
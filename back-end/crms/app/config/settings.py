@@ -2,7 +2,7 @@
 Application Configuration
 Load and validate environment variables using Pydantic Settings
 """
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 import json
@@ -26,6 +26,7 @@ class Settings(BaseSettings):
     # JWT Configuration
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
+    JWT_CACHE_SIZE: int = 10000
     
     # Service-to-Service Communication
     AUTH_SERVICE_URL: str = "http://localhost:5001"
@@ -33,6 +34,30 @@ class Settings(BaseSettings):
     COMPLAINT_SERVICE_URL: str = "http://localhost:5004"
     SERVICE_API_KEY: str
     SERVICE_TIMEOUT: int = 30
+    AUTH_SERVICE_TIMEOUT: Optional[float] = None
+    ORDER_SERVICE_TIMEOUT: Optional[float] = None
+    COMPLAINT_SERVICE_TIMEOUT: Optional[float] = None
+    
+    # Customer 360 view: per-dependency deadlines and snapshot cache
+    CUSTOMER_360_ORDERS_DEADLINE_SECONDS: float = 2.0
+    CUSTOMER_360_COMPLAINTS_DEADLINE_SECONDS: float = 2.0
+    CUSTOMER_360_CACHE_TTL_SECONDS: float = 15.0
+    CUSTOMER_360_CACHE_SIZE: int = 1000
+    
+    # Batch lookups (internal batch endpoints take at most 500 IDs per call)
+    BATCH_LOOKUP_CHUNK_SIZE: int = 200
+    BATCH_LOOKUP_CONCURRENCY: int = 4
+    
+    # Statistics deltas: outbox event IDs remembered per customer, so a
+    # redelivered delta is not counted twice
+    STATISTICS_EVENT_WINDOW: int = 500
+    
+    # HTTP Client Pool (shared by all outbound service clients)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP2_ENABLED: bool = False
     
     # CORS Configuration
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:19006"]
@@ -41,10 +66,31 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    # Filtered counts are cached this long for includeTotal=estimated
+    COUNT_CACHE_TTL_SECONDS: float = 10.0
+    COUNT_CACHE_SIZE: int = 1000
+    
+    # Rate Limiting
+    # Algorithm: sliding_window or token_bucket; backend: memory (per worker)
+    # or mongo (shared across workers); key: ip, user or api_key
+    RATE_LIMIT_PER_MINUTE: int = 100
+    RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_ALGORITHM: str = "sliding_window"
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_KEY: str = "ip"
+    
+    # Index advisor at startup: off, warn or fail
+    INDEX_ADVISOR_MODE: str = "warn"
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    # Background log writer: queued records beyond LOG_QUEUE_SIZE are dropped;
+    # INFO lines are capped per call site (0 = no cap) and can be sampled
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_INFO_RATE_LIMIT: float = 50.0
+    LOG_INFO_BURST: int = 100
+    LOG_INFO_SAMPLE_RATE: float = 1.0
     
     model_config = SettingsConfigDict(
         env_file=".env",
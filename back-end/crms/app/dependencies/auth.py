@@ -75,6 +75,6 @@ async def get_customer_from_db(
     if customer:
         # Convert ObjectId to string
         customer["_id"] = str(customer["_id"])
-        debug(f"Customer record found for user {user_id}")
+        debug("Customer record found for user %s", user_id)
     
     return customer
@@ -7,8 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 from app.config.database import Database
+from app.config.http_client import HTTPClient
+from app.utils.counting import count_cache
+from app.services.customer_360 import customer_360_cache
+from app.utils.token_cache import token_cache
 from app.config.settings import settings
-from app.utils.logger import info
+from app.utils.logger import info, log_pipeline
+from app.utils.index_advisor import check_indexes
 from app.middleware.error_handler import (
     http_exception_handler,
     validation_exception_handler,
@@ -28,14 +33,18 @@ async def lifespan(app: FastAPI):
     # Startup
     info("Starting Customer Management Service (CRMS)...")
     await Database.connect_db()
+    await check_indexes(Database.db, settings.INDEX_ADVISOR_MODE)
+    await HTTPClient.start()
     info("✅ Service startup complete")
     
     yield
     
     # Shutdown
     info("Shutting down Customer Management Service...")
+    await HTTPClient.close()
     await Database.disconnect_db()
     info("✅ Service shutdown complete")
+    log_pipeline.flush()
 
 
 # Create FastAPI application
@@ -167,7 +176,14 @@ app.add_middleware(
 
 # Add security middleware (order matters: security -> rate limit -> logging)
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(RateLimitMiddleware, requests_per_minute=100, requests_per_hour=1000)
+app.add_middleware(
+    RateLimitMiddleware,
+    requests_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+    requests_per_hour=settings.RATE_LIMIT_PER_HOUR,
+    algorithm=settings.RATE_LIMIT_ALGORITHM,
+    backend=settings.RATE_LIMIT_BACKEND,
+    key=settings.RATE_LIMIT_KEY
+)
 app.add_middleware(RequestLoggingMiddleware)
 
 # Register error handlers
@@ -189,6 +205,61 @@ async def health_check():
     }
 
 
+# JWT verification cache statistics
+@app.get("/health/token-cache", tags=["Health"])
+async def token_cache_stats():
+    """Verified-token cache size and hit/miss counters"""
+    return {
+        "success": True,
+        "message": "Token cache statistics",
+        "data": token_cache.stats()
+    }
+
+
+# Pagination count cache statistics
+@app.get("/health/count-cache", tags=["Health"])
+async def count_cache_stats():
+    """Cached filtered counts (includeTotal=estimated) size and hit/miss counters"""
+    return {
+        "success": True,
+        "message": "Count cache statistics",
+        "data": count_cache.stats()
+    }
+
+
+# Customer 360 snapshot cache statistics
+@app.get("/health/customer-360-cache", tags=["Health"])
+async def customer_360_cache_stats():
+    """Cached customer 360 snapshots size and hit/miss counters"""
+    return {
+        "success": True,
+        "message": "Customer 360 cache statistics",
+        "data": customer_360_cache.stats()
+    }
+
+
+# HTTP client pool statistics
+@app.get("/health/http-pool", tags=["Health"])
+async def http_pool_stats():
+    """Outbound HTTP connection pool usage (in-use, idle, pool wait time)"""
+    return {
+        "success": True,
+        "message": "HTTP client pool statistics",
+        "data": HTTPClient.pool_stats()
+    }
+
+
+# Logging pipeline statistics
+@app.get("/health/logging", tags=["Health"])
+async def logging_stats():
+    """Log writer queue depth and dropped / rate-capped line counters"""
+    return {
+        "success": True,
+        "message": "Logging pipeline statistics",
+        "data": log_pipeline.stats()
+    }
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
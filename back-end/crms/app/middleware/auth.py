@@ -5,9 +5,9 @@ Validates JWT access tokens from Authorization header
 from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from app.config.settings import settings
+from jose import JWTError
 from app.utils.logger import error, debug
+from app.utils.token_cache import decode_access_token
 
 
 security = HTTPBearer(auto_error=False)
@@ -41,12 +41,7 @@ def decode_jwt_token(token: str) -> Optional[dict]:
         Decoded token payload if valid, None otherwise
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        return payload
+        return decode_access_token(token)
     except JWTError as e:
         error(f"JWT validation failed: {str(e)}")
         return None
@@ -97,7 +92,7 @@ async def get_token_payload(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    debug(f"Token validated for user: {email} (role: {role})")
+    debug("Token validated for user: %s (role: %s)", email, role)
     
     return payload
 
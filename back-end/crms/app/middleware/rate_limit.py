@@ -2,125 +2,148 @@
 Rate Limiting Middleware
 Prevents abuse by limiting the number of requests per IP/user
 """
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from typing import Callable, Dict
-from time import time
-from collections import defaultdict
-from app.utils.logger import warning
+import hashlib
+import math
+from fastapi import status
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+from app.config.settings import settings
+from app.middleware.error_handler import create_error_response
+from app.utils.logger import warning, error
+from app.utils.rate_limiter import RATE_LIMIT_COLLECTION, create_rate_limiter
+from app.utils.token_cache import decode_access_token
 
+# Client key precedence per RATE_LIMIT_KEY (each falls back to the next)
+KEY_STRATEGIES = {
+    "ip": ("ip",),
+    "user": ("user", "ip"),
+    "api_key": ("api_key", "user", "ip")
+}
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Error message per rejecting rule
+LIMIT_MESSAGES = {
+    "minute": "Too many requests. Please try again later.",
+    "hour": "Hourly rate limit exceeded. Please try again later."
+}
+
+
+def _mongo_collection():
+    """rate_limits collection (resolved per request; the DB connects in the lifespan)"""
+    from app.config.database import Database
+    return Database.get_db()[RATE_LIMIT_COLLECTION]
+
+
+class RateLimitMiddleware:
     """
-    Simple in-memory rate limiting middleware
+    Rate limiting middleware (pure ASGI)
     
     Limits:
-    - 100 requests per minute per IP
-    - 1000 requests per hour per IP
+    - 100 requests per minute per client
+    - 1000 requests per hour per client
     
-    Note: For production, consider using Redis-based rate limiting
+    The counting itself is done by app.utils.rate_limiter: token bucket or
+    sliding window counter, kept in process memory or in MongoDB so the
+    limits hold across workers. Clients are keyed by IP, verified JWT user
+    or service API key. Rejected requests get a 429 with Retry-After;
+    allowed responses get the limit headers added in the send callable.
+    If the shared store is unavailable, requests are let through.
     """
     
     def __init__(
         self,
         app: ASGIApp,
         requests_per_minute: int = 100,
-        requests_per_hour: int = 1000
+        requests_per_hour: int = 1000,
+        algorithm: str = "sliding_window",
+        backend: str = "memory",
+        key: str = "ip"
     ):
-        super().__init__(app)
+        if key not in KEY_STRATEGIES:
+            raise ValueError(f"Unknown rate limit key: {key}")
+        
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
-        
-        # In-memory storage: {client_ip: [(timestamp, count)]}
-        self.minute_requests: Dict[str, list] = defaultdict(list)
-        self.hour_requests: Dict[str, list] = defaultdict(list)
+        self.key_strategy = KEY_STRATEGIES[key]
+        self.limiter = create_rate_limiter(
+            algorithm,
+            backend,
+            requests_per_minute,
+            requests_per_hour,
+            get_collection=_mongo_collection
+        )
         
         # Excluded paths that don't count toward rate limit
-        self.excluded_paths = ["/health", "/docs", "/openapi.json", "/redoc"]
+        self.excluded_paths = frozenset(["/health", "/docs", "/openapi.json", "/redoc"])
     
-    async def dispatch(self, request: Request, call_next: Callable):
-        """Check rate limit before processing request"""
+        self.limit_headers = [
+            (b"x-ratelimit-limit-minute", str(requests_per_minute).encode()),
+            (b"x-ratelimit-limit-hour", str(requests_per_hour).encode())
+        ]
+    
+    def _client_key(self, scope: Scope) -> Optional[str]:
+        """Resolve the client key using the configured strategy"""
+        headers = Headers(scope=scope)
         
-        # Skip rate limiting for excluded paths
-        if request.url.path in self.excluded_paths:
-            return await call_next(request)
+        for strategy in self.key_strategy:
+            if strategy == "api_key":
+                api_key = headers.get("x-api-key")
+                # Only the real service key is trusted, or random keys would dodge the limit
+                if api_key and api_key == settings.SERVICE_API_KEY:
+                    return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+            
+            elif strategy == "user":
+                auth_header = headers.get("authorization")
+                if auth_header and auth_header.startswith("Bearer "):
+                    try:
+                        user_id = decode_access_token(auth_header[7:]).get("userId")
+                    except JWTError:
+                        user_id = None
+                    if user_id:
+                        return f"user:{user_id}"
+            
+            elif strategy == "ip":
+                client = scope.get("client")
+                if client:
+                    return f"ip:{client[0]}"
         
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
+        return None
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Check rate limit before processing request"""
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
         
-        # Skip rate limiting for unknown clients
-        if client_ip == "unknown":
-            return await call_next(request)
+        # Skip rate limiting for unidentifiable clients
+        client_key = self._client_key(scope)
+        if client_key is None:
+            await self.app(scope, receive, send)
+            return
         
-        current_time = time()
+        try:
+            rejected = await self.limiter.check(client_key)
+        except Exception as e:
+            error(f"Rate limiter unavailable, allowing request: {str(e)}")
+            rejected = None
         
-        # Check minute rate limit
-        if not self._check_rate_limit(
-            client_ip,
-            current_time,
-            self.minute_requests,
-            self.requests_per_minute,
-            60  # 1 minute
-        ):
-            warning(f"Rate limit exceeded (minute): {client_ip} on {request.url.path}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many requests. Please try again later."
+        if rejected is not None:
+            rule, result = rejected
+            warning(f"Rate limit exceeded ({rule}): {client_key} on {scope['path']}")
+            response = create_error_response(
+                message=LIMIT_MESSAGES.get(rule, LIMIT_MESSAGES["minute"]),
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS
             )
+            response.headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+            await response(scope, receive, send)
+            return
         
-        # Check hour rate limit
-        if not self._check_rate_limit(
-            client_ip,
-            current_time,
-            self.hour_requests,
-            self.requests_per_hour,
-            3600  # 1 hour
-        ):
-            warning(f"Rate limit exceeded (hour): {client_ip} on {request.url.path}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Hourly rate limit exceeded. Please try again later."
-            )
+        # Process request, adding rate limit headers
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + self.limit_headers
+            await send(message)
         
-        # Record this request
-        self._record_request(client_ip, current_time, self.minute_requests)
-        self._record_request(client_ip, current_time, self.hour_requests)
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit-Minute"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Limit-Hour"] = str(self.requests_per_hour)
-        
-        return response
-    
-    def _check_rate_limit(
-        self,
-        client_ip: str,
-        current_time: float,
-        storage: Dict[str, list],
-        limit: int,
-        window_seconds: int
-    ) -> bool:
-        """Check if request is within rate limit"""
-        
-        # Clean old entries
-        cutoff_time = current_time - window_seconds
-        storage[client_ip] = [
-            timestamp for timestamp in storage[client_ip]
-            if timestamp > cutoff_time
-        ]
-        
-        # Check if limit exceeded
-        return len(storage[client_ip]) < limit
-    
-    def _record_request(
-        self,
-        client_ip: str,
-        current_time: float,
-        storage: Dict[str, list]
-    ):
-        """Record a request timestamp"""
-        storage[client_ip].append(current_time)
+        await self.app(scope, receive, send_with_headers)
@@ -2,18 +2,15 @@
 Request/Response Logging Middleware
 Tracks all API requests and responses for monitoring and debugging
 """
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from time import time
-from typing import Callable
-import json
 from app.utils.logger import info, error, warning
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
-    Middleware to log all incoming requests and outgoing responses
+    Pure ASGI middleware to log all incoming requests and outgoing responses
     
     Tracks:
     - Request method, path, query params
@@ -21,39 +18,40 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     - Response status code
     - Response time
     - User information (if authenticated)
+    
+    X-Process-Time (time to response headers) and X-Service-Name are added to
+    the http.response.start message; the response log is written once the
+    body has been sent.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.excluded_paths = ["/health", "/docs", "/openapi.json", "/redoc"]
+        self.app = app
+        self.excluded_paths = frozenset(["/health", "/docs", "/openapi.json", "/redoc"])
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process and log request/response"""
         
         # Skip logging for excluded paths
-        if request.url.path in self.excluded_paths:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
         
         # Start timer
         start_time = time()
         
         # Extract request information
-        method = request.method
-        path = request.url.path
-        query_params = str(request.query_params) if request.query_params else None
-        client_host = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
+        method = scope["method"]
+        path = scope["path"]
+        query_params = scope.get("query_string", b"").decode("latin-1") or None
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
+        user_agent = Headers(scope=scope).get("user-agent", "unknown")
         
         # Extract user info from request state (set by auth middleware)
-        user_id = None
-        user_email = None
-        user_role = None
-        
-        if hasattr(request.state, "user"):
-            user = request.state.user
-            user_id = getattr(user, "user_id", None)
-            user_email = getattr(user, "email", None)
-            user_role = getattr(user, "role", None)
+        user = scope.get("state", {}).get("user")
+        user_id = getattr(user, "user_id", None)
+        user_email = getattr(user, "email", None)
+        user_role = getattr(user, "role", None)
         
         # Log incoming request
         request_log = {
@@ -68,44 +66,29 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             "user_role": user_role
         }
         
-        info(f"→ {method} {path} from {client_host}", **request_log)
+        info("→ %s %s from %s", method, path, client_host, **request_log)
+        
+        status_code = 500
+        
+        async def send_with_headers(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time_ms = round((time() - start_time) * 1000, 2)
+                
+                # Add custom headers
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-process-time", str(process_time_ms).encode()),
+                    (b"x-service-name", b"CRMS")
+                ]
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate response time
-            process_time = time() - start_time
-            process_time_ms = round(process_time * 1000, 2)
-            
-            # Log response
-            response_log = {
-                "type": "RESPONSE",
-                "method": method,
-                "path": path,
-                "status_code": response.status_code,
-                "duration_ms": process_time_ms,
-                "user_id": user_id
-            }
-            
-            # Log based on status code
-            if response.status_code >= 500:
-                error(f"✗ {method} {path} - {response.status_code} ({process_time_ms}ms)", **response_log)
-            elif response.status_code >= 400:
-                warning(f"⚠ {method} {path} - {response.status_code} ({process_time_ms}ms)", **response_log)
-            else:
-                info(f"✓ {method} {path} - {response.status_code} ({process_time_ms}ms)", **response_log)
-            
-            # Add custom headers
-            response.headers["X-Process-Time"] = str(process_time_ms)
-            response.headers["X-Service-Name"] = "CRMS"
-            
-            return response
-            
+            await self.app(scope, receive, send_with_headers)
         except Exception as e:
             # Log exception
-            process_time = time() - start_time
-            process_time_ms = round(process_time * 1000, 2)
+            process_time_ms = round((time() - start_time) * 1000, 2)
             
             error_log = {
                 "type": "ERROR",
@@ -116,5 +99,26 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "user_id": user_id
             }
             
-            error(f"✗ {method} {path} - ERROR: {str(e)}", **error_log)
+            error("✗ %s %s - ERROR: %s", method, path, e, **error_log)
             raise
+
+        # Calculate response time
+        process_time_ms = round((time() - start_time) * 1000, 2)
+        
+        # Log response
+        response_log = {
+            "type": "RESPONSE",
+            "method": method,
+            "path": path,
+            "status_code": status_code,
+            "duration_ms": process_time_ms,
+            "user_id": user_id
+        }
+        
+        # Log based on status code
+        if status_code >= 500:
+            error("✗ %s %s - %s (%sms)", method, path, status_code, process_time_ms, **response_log)
+        elif status_code >= 400:
+            warning("⚠ %s %s - %s (%sms)", method, path, status_code, process_time_ms, **response_log)
+        else:
+            info("✓ %s %s - %s (%sms)", method, path, status_code, process_time_ms, **response_log)
@@ -2,17 +2,33 @@
 Security Middleware
 Adds security headers and input sanitization
 """
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import html
 import re
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Headers added to every response (CSP allows the Swagger UI CDN)
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (
+        b"content-security-policy",
+        b"default-src 'self'; "
+        b"script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+        b"style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+        b"img-src 'self' data: https://cdn.jsdelivr.net; "
+        b"font-src 'self' data: https://cdn.jsdelivr.net"
+    ),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()")
+]
+
+
+class SecurityHeadersMiddleware:
     """
-    Middleware to add security headers to all responses
+    Pure ASGI middleware to add security headers to all responses
     
     Security headers:
     - X-Content-Type-Options: nosniff
@@ -20,35 +36,26 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - X-XSS-Protection: 1; mode=block
     - Strict-Transport-Security: HTTPS only
     - Content-Security-Policy: Restrict resource loading
+    
+    Headers are appended to the http.response.start message in the send
+    callable, so the response body (including streaming) passes through untouched.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Add security headers to response"""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        # CSP with Swagger UI support
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "img-src 'self' data: https://cdn.jsdelivr.net; "
-            "font-src 'self' data: https://cdn.jsdelivr.net"
-        )
-        
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + SECURITY_HEADERS
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
 def sanitize_input(text: str) -> str:
@@ -0,0 +1,69 @@
+"""
+Backfill Search Fields Migration
+Populate the `search` subdocument used by admin customer autocomplete on
+customers created before it existed
+
+Run from the service root:
+    python -m app.migrations.backfill_search_fields
+"""
+import asyncio
+from pymongo import UpdateOne
+from app.config.database import Database
+from app.utils.customer_autocomplete import search_fields
+from app.utils.logger import info
+
+BATCH_SIZE = 1000
+
+
+async def backfill_search_fields(db, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Set `search` on every customer that is missing it
+    
+    Args:
+        db: Database instance
+        batch_size: Number of customers updated per bulk write
+    
+    Returns:
+        Number of customers updated
+    """
+    updated = 0
+    
+    while True:
+        cursor = db.customers.find(
+            {"search": {"$exists": False}},
+            {"fullName": 1, "email": 1, "contactNumber": 1}
+        ).limit(batch_size)
+        customers = await cursor.to_list(length=batch_size)
+        
+        if not customers:
+            break
+        
+        operations = [
+            UpdateOne(
+                {"_id": customer["_id"]},
+                {"$set": {"search": search_fields(
+                    customer.get("fullName"), customer.get("email"), customer.get("contactNumber")
+                )}}
+            )
+            for customer in customers
+        ]
+        
+        result = await db.customers.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+        info("Backfilled search fields for %s customers so far", updated)
+    
+    return updated
+
+
+async def main():
+    """Run the migration against the configured database"""
+    await Database.connect_db()
+    try:
+        updated = await backfill_search_fields(Database.db)
+        info("✅ Search field backfill complete: %s customers updated", updated)
+    finally:
+        await Database.disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
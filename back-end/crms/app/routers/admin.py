@@ -13,22 +13,32 @@ from app.middleware.auth import get_current_user, JWTUser
 from app.middleware.role import require_admin
 from app.schemas.customer import (
     CustomerListItemResponse,
+    CUSTOMER_LIST_PROJECTION,
+    CustomerSuggestionResponse,
+    CUSTOMER_SUGGESTION_PROJECTION,
     CustomerDetailResponse,
     UpdateCustomerRequest,
     UpdateCustomerStatusRequest,
     UpdateCustomerTypeRequest,
     AddCustomerNotesRequest,
     CustomerStatisticsResponse,
+    Customer360Response,
     CustomerStatus,
     CustomerType
 )
 from app.schemas.response import APIResponse, PaginatedResponse
+from app.services.customer_cache_invalidation import invalidate_customer_caches
+from app.services.customer_360 import customer_360_cache, get_customer_360
 from app.utils.logger import info, error, debug, warning
-from app.utils.pagination import calculate_pagination, create_paginated_response
+from app.utils.pagination import calculate_pagination, attach_cursors, create_paginated_response
+from app.utils.cursor import decode_cursor, fetch_page
+from app.utils.json_response import FastJSONResponse, trusted_response
+from app.utils.counting import TotalMode, count_total
+from app.utils.customer_autocomplete import MAX_SUGGESTIONS, search_fields, suggest_customers
 from app.utils.validators import validate_object_id, sanitize_search_query
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @router.get(
@@ -41,7 +51,8 @@ Get paginated list of all customers with filtering and sorting capabilities.
 **Authentication Required**: Admin/Administrator role
 
 **Features**:
-- Pagination support
+- Pagination support (page numbers, or `cursor` from `nextCursor`/`prevCursor` for constant-cost deep pages)
+- `includeTotal`: exact (default), estimated (metadata count, or a count cached for a few seconds) or none; `totalExact` tells which
 - Filter by status (Active/Inactive/Suspended)
 - Filter by type (Regular/Premium/VIP)
 - Sort by any field (default: createdAt)
@@ -82,7 +93,8 @@ Get paginated list of all customers with filtering and sorting capabilities.
                             "totalItems": 100,
                             "itemsPerPage": 10,
                             "hasNextPage": True,
-                            "hasPreviousPage": False
+                            "hasPreviousPage": False,
+                            "totalExact": True
                         }
                     }
                 }
@@ -99,6 +111,8 @@ async def list_customers(
     db: Annotated[AsyncIOMotorDatabase, Depends(get_database)],
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     limit: int = Query(10, ge=1, le=100, description="Items per page (max 100)"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    includeTotal: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     status: Optional[str] = Query(None, description="Filter by status: Active, Inactive, or Suspended"),
     type: Optional[str] = Query(None, description="Filter by type: Regular, Premium, or VIP"),
     sortBy: str = Query("customerSince", description="Field to sort by"),
@@ -109,6 +123,8 @@ async def list_customers(
     
     Returns paginated customer list with comprehensive profile information.
     """
+    keyset_cursor = decode_cursor(cursor)
+    
     try:
         # Build filter query
         filter_query = {}
@@ -129,19 +145,23 @@ async def list_customers(
                 )
             filter_query["customerType"] = type
         
-        # Get total count
-        total_count = await db.customers.count_documents(filter_query)
+        # Get total count (exact, estimated or skipped)
+        total = await count_total(db.customers, filter_query, includeTotal)
         
         # Calculate pagination
-        skip, pagination_meta = calculate_pagination(page, limit, total_count)
+        skip, pagination_meta = calculate_pagination(page, limit, total.total, total.exact)
         
         # Build sort query
         sort_direction = -1 if sortOrder.lower() == "desc" else 1
         sort_query = [(sortBy, sort_direction)]
         
-        # Fetch customers
-        cursor = db.customers.find(filter_query).sort(sort_query).skip(skip).limit(limit)
-        customers = await cursor.to_list(length=limit)
+        # Fetch customers (by cursor when given, otherwise by page)
+        result = await fetch_page(
+            db.customers, filter_query, sort_query, limit, skip=skip, cursor=keyset_cursor,
+            projection=CUSTOMER_LIST_PROJECTION
+        )
+        customers = result.docs
+        attach_cursors(pagination_meta, result)
         
         # Convert to response format
         customer_list = [
@@ -163,10 +183,11 @@ async def list_customers(
             for customer in customers
         ]
         
-        return create_paginated_response(
+        # Items were validated as they were built; skip the response_model pass
+        return trusted_response(create_paginated_response(
             items=customer_list,
             pagination=pagination_meta
-        )
+        ))
         
     except HTTPException:
         raise
@@ -212,10 +233,10 @@ async def search_customers(
         # Calculate pagination
         skip, pagination_meta = calculate_pagination(page, limit, total_count)
         
-        # Fetch customers with text score
+        # Fetch the list fields with the text score
         cursor = db.customers.find(
             filter_query,
-            {"score": {"$meta": "textScore"}}
+            {**CUSTOMER_LIST_PROJECTION, "score": {"$meta": "textScore"}}
         ).sort([("score", {"$meta": "textScore"})]).skip(skip).limit(limit)
         
         customers = await cursor.to_list(length=limit)
@@ -240,10 +261,11 @@ async def search_customers(
             for customer in customers
         ]
         
-        return create_paginated_response(
+        # Items were validated as they were built; skip the response_model pass
+        return trusted_response(create_paginated_response(
             items=customer_list,
             pagination=pagination_meta
-        )
+        ))
         
     except HTTPException:
         raise
@@ -256,6 +278,68 @@ async def search_customers(
         )
 
 
+@router.get(
+    "/autocomplete",
+    response_model=APIResponse[List[CustomerSuggestionResponse]],
+    summary="Autocomplete Customers",
+    description="""
+Typeahead suggestions for the admin customer search box.
+
+**Authentication Required**: Admin/Administrator role
+
+**Matching**:
+- Every typed word must be the start of a word of the customer's name, email
+  (local part) or contact number: "jo" matches John and Jolene, "jo do"
+  matches John Doe
+- Text containing "@" matches the start of the email address
+- Case-insensitive
+
+**Ordering**: Newest customers first; customers with a whole-word match are
+listed first within the returned suggestions.
+
+One indexed query per call, no total count.
+    """
+)
+async def autocomplete_customers(
+    current_user: Annotated[JWTUser, Depends(require_admin)],
+    db: Annotated[AsyncIOMotorDatabase, Depends(get_database)],
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS, description="Suggestions to return")
+):
+    """
+    Suggest customers whose name, email or contact number starts with the typed words
+    """
+    try:
+        customers = await suggest_customers(db.customers, q, limit, CUSTOMER_SUGGESTION_PROJECTION)
+        
+        suggestions = [
+            CustomerSuggestionResponse(
+                customerId=str(customer["_id"]),
+                fullName=customer.get("fullName", ""),
+                email=customer.get("email", ""),
+                contactNumber=customer.get("contactNumber", ""),
+                customerStatus=customer["customerStatus"],
+                customerType=customer["customerType"]
+            )
+            for customer in customers
+        ]
+        
+        # Items were validated as they were built; skip the response_model pass
+        return trusted_response(APIResponse(
+            success=True,
+            message=f"{len(suggestions)} suggestions",
+            data=suggestions
+        ))
+    
+    except Exception as e:
+        error("Error autocompleting customers: %s", e)
+        from fastapi import status as http_status
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to autocomplete customers"
+        )
+
+
 @router.get(
     "/analytics",
     response_model=APIResponse[dict],
@@ -488,6 +572,60 @@ async def get_customer(
         )
 
 
+@router.get(
+    "/{customerId}/360",
+    response_model=APIResponse[Customer360Response],
+    summary="Get Customer 360 View",
+    description="""
+Profile, orders and complaints of a customer in one call
+
+**Behavior**:
+- The customer is read once; the Order and Complaint services are called concurrently
+- Each service has its own deadline (`CUSTOMER_360_ORDERS_DEADLINE_SECONDS`, `CUSTOMER_360_COMPLAINTS_DEADLINE_SECONDS`)
+- A slow or failing service does not fail the view: its section reports `timeout` or `error`
+  and carries the counters stored on the customer; `complete` is false
+- Complete snapshots are cached for `CUSTOMER_360_CACHE_TTL_SECONDS` (`cached` tells which);
+  `refresh=true` rebuilds the snapshot
+    """
+)
+async def get_customer_360_view(
+    customerId: str,
+    current_user: Annotated[JWTUser, Depends(require_admin)],
+    db: Annotated[AsyncIOMotorDatabase, Depends(get_database)],
+    limit: int = Query(10, ge=1, le=100, description="Number of recent orders and complaints"),
+    refresh: bool = Query(False, description="Skip the snapshot cache")
+):
+    """
+    Get the customer 360 view
+    """
+    if not validate_object_id(customerId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid customer ID format"
+        )
+    
+    try:
+        snapshot = await get_customer_360(db, customerId, limit, refresh=refresh)
+    except Exception as e:
+        error(f"Error building customer 360 view: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve customer 360 view"
+        )
+    
+    if not snapshot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    
+    return APIResponse(
+        success=True,
+        message="Customer 360 view retrieved successfully" if snapshot.complete else "Customer 360 view retrieved with partial results",
+        data=snapshot
+    )
+
+
 @router.put(
     "/{customerId}",
     response_model=APIResponse[CustomerDetailResponse],
@@ -529,6 +667,13 @@ async def update_customer(
             update_data["tags"] = request.tags
         if request.preferences is not None:
             update_data["preferences"] = request.preferences
+        if request.fullName is not None or request.contactNumber is not None:
+            # Keep the autocomplete fields in step with the name and number
+            update_data["search"] = search_fields(
+                update_data.get("fullName", existing_customer.get("fullName")),
+                existing_customer.get("email"),
+                update_data.get("contactNumber", existing_customer.get("contactNumber"))
+            )
         
         # Update metadata
         update_data["metadata.lastModifiedBy"] = current_user.user_id
@@ -567,6 +712,8 @@ async def update_customer(
             metadata=updated_customer.get("metadata", {})
         )
         
+        invalidate_customer_caches(updated_customer["userId"], customerId)
+        
         info(f"✅ Customer {customerId} updated by admin {current_user.email}")
         
         return APIResponse(
@@ -652,6 +799,8 @@ async def update_customer_status(
             metadata=updated_customer.get("metadata", {})
         )
         
+        invalidate_customer_caches(updated_customer["userId"], customerId)
+        
         info(f"✅ Customer {customerId} status updated to {request.status.value} by admin {current_user.email}")
         
         return APIResponse(
@@ -737,6 +886,8 @@ async def update_customer_type(
             metadata=updated_customer.get("metadata", {})
         )
         
+        invalidate_customer_caches(updated_customer["userId"], customerId)
+        
         info(f"✅ Customer {customerId} type updated to {request.type.value} by admin {current_user.email}")
         
         return APIResponse(
@@ -829,6 +980,9 @@ async def add_customer_notes(
             metadata=updated_customer.get("metadata", {})
         )
         
+        # Notes are only shown in CRMS; drop the 360 snapshots only
+        customer_360_cache.invalidate(customerId)
+        
         info(f"✅ Note added to customer {customerId} by admin {current_user.email}")
         
         return APIResponse(
@@ -891,6 +1045,8 @@ async def delete_customer(
             }
         )
         
+        invalidate_customer_caches(existing_customer["userId"], customerId)
+        
         info(f"✅ Customer {customerId} deleted (soft) by admin {current_user.email}")
         
         return APIResponse(
@@ -943,7 +1099,7 @@ async def get_customer_orders(
                 detail="Customer not found"
             )
         
-        # Get user ID for Order Service query
+        # Get user ID returned alongside the orders
         user_id = customer.get("userId")
         if not user_id:
             raise HTTPException(
@@ -951,10 +1107,10 @@ async def get_customer_orders(
                 detail="Customer has no associated user ID"
             )
         
-        # Fetch orders from Order Service
+        # Fetch orders from Order Service (orders are stored under the CRMS customer ID)
         try:
             order_data = await order_service_client.get_customer_orders(
-                customer_id=user_id,
+                customer_id=customerId,
                 page=1,
                 limit=limit,
                 status=status
@@ -1034,7 +1190,7 @@ async def get_customer_complaints(
                 detail="Customer not found"
             )
         
-        # Get user ID for Complaint Service query
+        # Get user ID returned alongside the complaints
         user_id = customer.get("userId")
         if not user_id:
             raise HTTPException(
@@ -1042,10 +1198,10 @@ async def get_customer_complaints(
                 detail="Customer has no associated user ID"
             )
         
-        # Fetch complaints from Complaint Service
+        # Fetch complaints from Complaint Service (complaints are stored under the CRMS customer ID)
         try:
             complaint_data = await complaint_service_client.get_customer_complaints(
-                customer_id=user_id,
+                customer_id=customerId,
                 page=1,
                 limit=limit,
                 status=status
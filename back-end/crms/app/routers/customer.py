@@ -18,6 +18,7 @@ from app.schemas.customer import (
     CustomerType
 )
 from app.schemas.response import APIResponse
+from app.utils.customer_autocomplete import search_fields
 from app.utils.logger import info, error, debug
 from app.models.customer import Customer
 
@@ -70,6 +71,9 @@ async def get_or_create_customer(
             "email": user_data.get("email"),
             "fullName": user_data.get("fullName", ""),
             "contactNumber": user_data.get("contactNumber", ""),
+            "search": search_fields(
+                user_data.get("fullName"), user_data.get("email"), user_data.get("contactNumber")
+            ),
             "customerStatus": CustomerStatus.ACTIVE.value,
             "customerType": CustomerType.REGULAR.value,
             "totalOrders": 0,
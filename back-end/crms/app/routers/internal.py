@@ -13,11 +13,20 @@ from app.middleware.service_auth import verify_service_api_key
 from app.schemas.customer import (
     CreateCustomerRequest,
     UpdateCustomerStatisticsRequest,
+    CustomerStatisticsDelta,
+    BatchStatisticsDeltaRequest,
+    BatchStatisticsDeltaResponse,
+    BatchCustomerLookupRequest,
+    BatchCustomerLookupResponse,
+    CustomerStatisticsResponse,
     CustomerDetailResponse,
     CustomerStatus,
     CustomerType
 )
 from app.schemas.response import APIResponse
+from app.services.customer_cache_invalidation import invalidate_customer_caches
+from app.utils.customer_statistics import apply_statistics_delta, apply_statistics_deltas
+from app.utils.customer_autocomplete import search_fields
 from app.utils.logger import info, error, debug, warning
 from app.utils.validators import validate_object_id
 
@@ -99,26 +108,7 @@ async def create_customer_internal(
         if existing_customer:
             warning(f"Customer already exists for userId: {request.userId}")
             # Return existing customer instead of error
-            customer_response = CustomerDetailResponse(
-                customerId=str(existing_customer["_id"]),
-                userId=existing_customer["userId"],
-                email=existing_customer["email"],
-                fullName=existing_customer.get("fullName", ""),
-                contactNumber=existing_customer.get("contactNumber", ""),
-                customerStatus=existing_customer["customerStatus"],
-                customerType=existing_customer["customerType"],
-                totalOrders=existing_customer["totalOrders"],
-                totalOrderValue=existing_customer["totalOrderValue"],
-                totalComplaints=existing_customer["totalComplaints"],
-                openComplaints=existing_customer["openComplaints"],
-                lastOrderDate=existing_customer.get("lastOrderDate"),
-                lastComplaintDate=existing_customer.get("lastComplaintDate"),
-                customerSince=existing_customer["customerSince"],
-                notes=existing_customer.get("notes", []),
-                tags=existing_customer.get("tags", []),
-                preferences=existing_customer.get("preferences", {}),
-                metadata=existing_customer.get("metadata", {})
-            )
+            customer_response = CustomerDetailResponse.from_document(existing_customer)
             
             return APIResponse(
                 success=True,
@@ -133,6 +123,7 @@ async def create_customer_internal(
             "email": request.email,
             "fullName": request.fullName or "",
             "contactNumber": request.contactNumber or "",
+            "search": search_fields(request.fullName, request.email, request.contactNumber),
             "customerStatus": CustomerStatus.ACTIVE.value,
             "customerType": CustomerType.REGULAR.value,
             "totalOrders": 0,
@@ -164,26 +155,10 @@ async def create_customer_internal(
         
         new_customer["_id"] = result.inserted_id
         
-        customer_response = CustomerDetailResponse(
-            customerId=str(new_customer["_id"]),
-            userId=new_customer["userId"],
-            email=new_customer["email"],
-            fullName=new_customer.get("fullName", ""),
-            contactNumber=new_customer.get("contactNumber", ""),
-            customerStatus=new_customer["customerStatus"],
-            customerType=new_customer["customerType"],
-            totalOrders=new_customer["totalOrders"],
-            totalOrderValue=new_customer["totalOrderValue"],
-            totalComplaints=new_customer["totalComplaints"],
-            openComplaints=new_customer["openComplaints"],
-            lastOrderDate=new_customer.get("lastOrderDate"),
-            lastComplaintDate=new_customer.get("lastComplaintDate"),
-            customerSince=new_customer["customerSince"],
-            notes=new_customer.get("notes", []),
-            tags=new_customer.get("tags", []),
-            preferences=new_customer.get("preferences", {}),
-            metadata=new_customer.get("metadata", {})
-        )
+        customer_response = CustomerDetailResponse.from_document(new_customer)
+        
+        # Clear any cached "no profile" answer for this user
+        invalidate_customer_caches(request.userId, str(new_customer["_id"]))
         
         info(f"✅ Customer created via internal endpoint: {request.email} (userId: {request.userId})")
         
@@ -207,7 +182,8 @@ async def create_customer_internal(
     "/{customerId}/statistics",
     response_model=APIResponse[CustomerDetailResponse],
     summary="Update Customer Statistics (Internal)",
-    description="Update customer order/complaint statistics from Order Service or Complaint Service"
+    description="Overwrite customer order/complaint statistics with absolute values. Superseded by the delta endpoints, which do not lose concurrent updates.",
+    deprecated=True
 )
 async def update_customer_statistics_internal(
     customerId: str,
@@ -275,26 +251,7 @@ async def update_customer_statistics_internal(
         # Fetch updated customer
         updated_customer = await db.customers.find_one({"_id": ObjectId(customerId)})
         
-        customer_response = CustomerDetailResponse(
-            customerId=str(updated_customer["_id"]),
-            userId=updated_customer["userId"],
-            email=updated_customer["email"],
-            fullName=updated_customer.get("fullName", ""),
-            contactNumber=updated_customer.get("contactNumber", ""),
-            customerStatus=updated_customer["customerStatus"],
-            customerType=updated_customer["customerType"],
-            totalOrders=updated_customer["totalOrders"],
-            totalOrderValue=updated_customer["totalOrderValue"],
-            totalComplaints=updated_customer["totalComplaints"],
-            openComplaints=updated_customer["openComplaints"],
-            lastOrderDate=updated_customer.get("lastOrderDate"),
-            lastComplaintDate=updated_customer.get("lastComplaintDate"),
-            customerSince=updated_customer["customerSince"],
-            notes=updated_customer.get("notes", []),
-            tags=updated_customer.get("tags", []),
-            preferences=updated_customer.get("preferences", {}),
-            metadata=updated_customer.get("metadata", {})
-        )
+        customer_response = CustomerDetailResponse.from_document(updated_customer)
         
         info(f"✅ Customer statistics updated: {customerId}")
         
@@ -314,6 +271,187 @@ async def update_customer_statistics_internal(
         )
 
 
+@router.post(
+    "/{customerId}/statistics/delta",
+    response_model=APIResponse[CustomerStatisticsResponse],
+    summary="Apply Customer Statistics Delta (Internal)",
+    description="""
+Add changes to a customer's order/complaint counters - **Internal Service API**
+
+**Authentication Required**: Service API Key (x-api-key header)
+
+**Behavior**:
+- Applied in one atomic update on the stored values, so concurrent orders and complaints are all counted
+- Counters never go below zero
+- lastOrderDate / lastComplaintDate only move forward
+- Returns the updated statistics
+    """
+)
+async def apply_customer_statistics_delta_internal(
+    customerId: str,
+    request: CustomerStatisticsDelta,
+    db: Annotated[AsyncIOMotorDatabase, Depends(get_database)],
+    _: Annotated[bool, Depends(verify_service_api_key)]
+):
+    """
+    Apply a statistics delta (called by Order Service or Complaint Service)
+    
+    One find_one_and_update: no prior read and no re-read afterwards.
+    """
+    if not validate_object_id(customerId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid customer ID format"
+        )
+    
+    try:
+        customer = await apply_statistics_delta(db.customers, customerId, request.model_dump())
+    except Exception as e:
+        error(f"Error applying customer statistics delta: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update customer statistics"
+        )
+    
+    if not customer:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    
+    statistics = CustomerStatisticsResponse(
+        totalOrders=customer["totalOrders"],
+        totalOrderValue=customer["totalOrderValue"],
+        totalComplaints=customer["totalComplaints"],
+        openComplaints=customer["openComplaints"],
+        lastOrderDate=customer.get("lastOrderDate"),
+        lastComplaintDate=customer.get("lastComplaintDate"),
+        customerSince=customer["customerSince"]
+    )
+    
+    debug(f"Customer statistics delta applied: {customerId}")
+    
+    return APIResponse(
+        success=True,
+        message="Customer statistics updated successfully",
+        data=statistics
+    )
+
+
+@router.post(
+    "/statistics/deltas",
+    response_model=APIResponse[BatchStatisticsDeltaResponse],
+    summary="Apply Customer Statistics Deltas in Batch (Internal)",
+    description="""
+Apply statistics deltas for many customers in one call - **Internal Service API**
+
+**Authentication Required**: Service API Key (x-api-key header)
+
+**Behavior**:
+- Up to 500 deltas per call; deltas for the same customer are summed
+- All customers are updated with one unordered bulk write
+- Unknown or malformed customer IDs are reported in `notFound`, the rest are still applied
+    """
+)
+async def apply_customer_statistics_deltas_internal(
+    request: BatchStatisticsDeltaRequest,
+    db: Annotated[AsyncIOMotorDatabase, Depends(get_database)],
+    _: Annotated[bool, Depends(verify_service_api_key)]
+):
+    """
+    Apply a batch of statistics deltas (called by Order Service or Complaint Service)
+    """
+    try:
+        applied, not_found = await apply_statistics_deltas(
+            db.customers,
+            [delta.model_dump() for delta in request.deltas]
+        )
+    except Exception as e:
+        error(f"Error applying customer statistics deltas: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update customer statistics"
+        )
+    
+    if not_found:
+        warning(f"Statistics deltas for unknown customers: {', '.join(not_found)}")
+    
+    info(f"✅ Customer statistics deltas applied: {applied} customers ({len(request.deltas)} deltas)")
+    
+    return APIResponse(
+        success=True,
+        message="Customer statistics updated successfully",
+        data=BatchStatisticsDeltaResponse(applied=applied, notFound=not_found)
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=APIResponse[BatchCustomerLookupResponse],
+    summary="Get Customers in Batch (Internal)",
+    description="""
+Look up many customers in one call - **Internal Service API**
+
+**Authentication Required**: Service API Key (x-api-key header)
+
+**Behavior**:
+- Up to 500 customer IDs and 500 user IDs per call, answered with one `$in` query
+- Customers are keyed by the requested customer ID (`byCustomerId`) and user ID (`byUserId`)
+- Unknown or malformed IDs are reported in `notFound`
+    """
+)
+async def get_customers_batch_internal(
+    request: BatchCustomerLookupRequest,
+    db: Annotated[AsyncIOMotorDatabase, Depends(get_database)],
+    _: Annotated[bool, Depends(verify_service_api_key)]
+):
+    """
+    Get many customers by customerId and/or userId (for service-to-service communication)
+    
+    Replaces one lookup call per customer when a service shows a page of entities
+    """
+    customer_ids = list(dict.fromkeys(request.customerIds))
+    user_ids = list(dict.fromkeys(request.userIds))
+    object_ids = [ObjectId(customer_id) for customer_id in customer_ids if validate_object_id(customer_id)]
+    
+    clauses = []
+    if object_ids:
+        clauses.append({"_id": {"$in": object_ids}})
+    if user_ids:
+        clauses.append({"userId": {"$in": user_ids}})
+    
+    try:
+        customers = await db.customers.find({"$or": clauses}, {"search": 0, "statisticsEvents": 0}).to_list(length=None) if clauses else []
+    except Exception as e:
+        error(f"Error fetching customers in batch: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve customers"
+        )
+    
+    by_customer_id = {}
+    by_user_id = {}
+    for customer in customers:
+        detail = CustomerDetailResponse.from_document(customer)
+        by_customer_id[detail.customerId] = detail
+        by_user_id[detail.userId] = detail
+    
+    result = BatchCustomerLookupResponse(
+        byCustomerId={customer_id: by_customer_id[customer_id] for customer_id in customer_ids if customer_id in by_customer_id},
+        byUserId={user_id: by_user_id[user_id] for user_id in user_ids if user_id in by_user_id},
+        notFound=[customer_id for customer_id in customer_ids if customer_id not in by_customer_id]
+        + [user_id for user_id in user_ids if user_id not in by_user_id]
+    )
+    
+    debug(f"Customers retrieved in batch: {len(customers)} of {len(customer_ids) + len(user_ids)} IDs")
+    
+    return APIResponse(
+        success=True,
+        message="Customers retrieved successfully",
+        data=result
+    )
+
+
 @router.get(
     "/user/{userId}",
     response_model=APIResponse[CustomerDetailResponse],
@@ -340,26 +478,7 @@ async def get_customer_by_user_id_internal(
                 detail="Customer not found"
             )
         
-        customer_response = CustomerDetailResponse(
-            customerId=str(customer["_id"]),
-            userId=customer["userId"],
-            email=customer["email"],
-            fullName=customer.get("fullName", ""),
-            contactNumber=customer.get("contactNumber", ""),
-            customerStatus=customer["customerStatus"],
-            customerType=customer["customerType"],
-            totalOrders=customer["totalOrders"],
-            totalOrderValue=customer["totalOrderValue"],
-            totalComplaints=customer["totalComplaints"],
-            openComplaints=customer["openComplaints"],
-            lastOrderDate=customer.get("lastOrderDate"),
-            lastComplaintDate=customer.get("lastComplaintDate"),
-            customerSince=customer["customerSince"],
-            notes=customer.get("notes", []),
-            tags=customer.get("tags", []),
-            preferences=customer.get("preferences", {}),
-            metadata=customer.get("metadata", {})
-        )
+        customer_response = CustomerDetailResponse.from_document(customer)
         
         debug(f"Customer retrieved by userId: {userId}")
         
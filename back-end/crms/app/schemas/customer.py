@@ -3,9 +3,11 @@ Customer Pydantic Schemas
 Define request/response validation schemas
 """
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, EmailStr, field_validator
+from typing import Dict, Optional, List
+from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
 from enum import Enum
+from app.utils.customer_statistics import naive_utc
+from app.utils.projection import model_projection
 
 
 # Enums
@@ -220,6 +222,101 @@ class UpdateCustomerStatisticsRequest(BaseModel):
     }
 
 
+class CustomerStatisticsDelta(BaseModel):
+    """
+    Customer Statistics Delta (Internal API)
+    
+    Changes to add to a customer's counters. Applied atomically on the
+    stored values, so concurrent updates from several services all count.
+    Counters never go below zero; dates only move forward.
+    """
+    totalOrders: int = Field(0, description="Change in order count (e.g. 1 for a new order, -1 for a cancellation)")
+    totalOrderValue: float = Field(0.0, description="Change in total order value")
+    totalComplaints: int = Field(0, description="Change in complaint count")
+    openComplaints: int = Field(0, description="Change in open complaint count")
+    lastOrderDate: Optional[datetime] = Field(None, description="Order date to record if later than the stored one")
+    lastComplaintDate: Optional[datetime] = Field(None, description="Complaint date to record if later than the stored one")
+    
+    @field_validator("lastOrderDate", "lastComplaintDate")
+    @classmethod
+    def to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Store and compare dates as naive UTC, whatever offset the caller sent"""
+        return naive_utc(value)
+    
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "totalOrders": 1,
+                "totalOrderValue": 149.99,
+                "lastOrderDate": "2026-01-26T10:30:00Z"
+            }
+        }
+    }
+
+
+class CustomerStatisticsDeltaItem(CustomerStatisticsDelta):
+    """Statistics delta for one customer in a batch"""
+    customerId: str = Field(..., description="Customer ID")
+    eventIds: List[str] = Field(
+        default_factory=list,
+        max_length=500,
+        description="Outbox events the delta was built from; counters are skipped if these were already applied"
+    )
+
+
+class BatchStatisticsDeltaRequest(BaseModel):
+    """
+    Batch Statistics Delta Request (Internal API)
+    
+    Deltas for many customers in one call; several deltas for the same
+    customer are summed before they are applied.
+    """
+    deltas: List[CustomerStatisticsDeltaItem] = Field(..., min_length=1, max_length=500, description="Deltas to apply")
+    
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "deltas": [
+                    {"customerId": "507f1f77bcf86cd799439011", "totalOrders": 1, "totalOrderValue": 149.99},
+                    {"customerId": "507f1f77bcf86cd799439012", "totalComplaints": 1, "openComplaints": 1}
+                ]
+            }
+        }
+    }
+
+
+class BatchStatisticsDeltaResponse(BaseModel):
+    """Outcome of a batch statistics delta"""
+    applied: int = Field(description="Number of customers updated")
+    notFound: List[str] = Field(default_factory=list, description="Customer IDs that matched no customer")
+
+
+class BatchCustomerLookupRequest(BaseModel):
+    """
+    Batch Customer Lookup Request (Internal API)
+    
+    Customers to look up in one call, by customer ID and/or user ID.
+    """
+    customerIds: List[str] = Field(default_factory=list, max_length=500, description="Customer IDs (at most 500)")
+    userIds: List[str] = Field(default_factory=list, max_length=500, description="User IDs (at most 500)")
+    
+    @model_validator(mode="after")
+    def require_ids(self):
+        """At least one ID to look up"""
+        if not self.customerIds and not self.userIds:
+            raise ValueError("customerIds or userIds is required")
+        return self
+    
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "customerIds": ["507f1f77bcf86cd799439011", "507f1f77bcf86cd799439012"],
+                "userIds": ["507f191e810c19729de860ea"]
+            }
+        }
+    }
+
+
 class AddCustomerNotesRequest(BaseModel):
     """
     Add Customer Notes Request
@@ -309,6 +406,31 @@ class CustomerDetailResponse(CustomerResponse):
         description="Customer metadata (login info, activity tracking)"
     )
 
+    
+    @classmethod
+    def from_document(cls, customer: dict) -> "CustomerDetailResponse":
+        """Build the response from a customer document"""
+        return cls(
+            customerId=str(customer["_id"]),
+            userId=customer["userId"],
+            email=customer["email"],
+            fullName=customer.get("fullName", ""),
+            contactNumber=customer.get("contactNumber", ""),
+            customerStatus=customer["customerStatus"],
+            customerType=customer["customerType"],
+            totalOrders=customer["totalOrders"],
+            totalOrderValue=customer["totalOrderValue"],
+            totalComplaints=customer["totalComplaints"],
+            openComplaints=customer["openComplaints"],
+            lastOrderDate=customer.get("lastOrderDate"),
+            lastComplaintDate=customer.get("lastComplaintDate"),
+            customerSince=customer["customerSince"],
+            notes=customer.get("notes", []),
+            tags=customer.get("tags", []),
+            preferences=customer.get("preferences", {}),
+            metadata=customer.get("metadata", {})
+        )
+
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -349,6 +471,53 @@ class CustomerDetailResponse(CustomerResponse):
     }
 
 
+class BatchCustomerLookupResponse(BaseModel):
+    """Customers found by a batch lookup, keyed by the requested ID"""
+    byCustomerId: Dict[str, CustomerDetailResponse] = Field(default_factory=dict, description="Customers keyed by customer ID")
+    byUserId: Dict[str, CustomerDetailResponse] = Field(default_factory=dict, description="Customers keyed by user ID")
+    notFound: List[str] = Field(default_factory=list, description="Requested IDs that matched no customer")
+
+
+class SectionStatus(str, Enum):
+    """
+    Outcome of one dependency in the customer 360 view
+    
+    - **ok**: Answered within its deadline
+    - **timeout**: No answer within its deadline
+    - **error**: Failed or unreachable
+    """
+    OK = "ok"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+class Customer360Section(BaseModel):
+    """
+    One dependency's section of the customer 360 view
+    
+    When the dependency times out or fails, data holds the counters stored
+    on the customer instead of the service's answer.
+    """
+    status: SectionStatus = Field(..., description="Outcome of the dependency call")
+    durationMs: float = Field(..., description="Time spent waiting for the dependency")
+    data: dict = Field(default_factory=dict, description="Service answer, or stored counters when not ok")
+    message: Optional[str] = Field(None, description="Why the section is not ok")
+
+
+class Customer360Response(BaseModel):
+    """
+    Customer 360 Response
+    
+    Profile, orders and complaints of a customer in one response
+    """
+    customer: CustomerDetailResponse = Field(..., description="Customer profile")
+    orders: Customer360Section = Field(..., description="Order summary and recent orders (Order Service)")
+    complaints: Customer360Section = Field(..., description="Complaint summary and recent complaints (Complaint Service)")
+    complete: bool = Field(..., description="Whether every section is ok")
+    cached: bool = Field(False, description="Whether the snapshot was served from the cache")
+    generatedAt: datetime = Field(..., description="When the snapshot was built")
+
+
 class CustomerStatisticsResponse(BaseModel):
     """
     Customer Statistics Response
@@ -416,3 +585,38 @@ class CustomerListItemResponse(BaseModel):
             }
         }
     }
+
+
+# Stored fields read for CustomerListItemResponse (customerId is the document _id)
+CUSTOMER_LIST_PROJECTION = model_projection(CustomerListItemResponse, renames={"customerId": "_id"})
+
+
+class CustomerSuggestionResponse(BaseModel):
+    """
+    Customer Suggestion Response
+    
+    Compact customer entry for admin typeahead suggestions
+    """
+    customerId: str = Field(description="Customer ID")
+    fullName: str = Field(description="Customer full name")
+    email: str = Field(description="Customer email")
+    contactNumber: str = Field(description="Contact number")
+    customerStatus: str = Field(description="Account status")
+    customerType: str = Field(description="Customer tier")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "customerId": "507f1f77bcf86cd799439011",
+                "fullName": "John Doe",
+                "email": "customer@example.com",
+                "contactNumber": "+1234567890",
+                "customerStatus": "Active",
+                "customerType": "Premium"
+            }
+        }
+    }
+
+
+# Stored fields read for CustomerSuggestionResponse (customerId is the document _id)
+CUSTOMER_SUGGESTION_PROJECTION = model_projection(CustomerSuggestionResponse, renames={"customerId": "_id"})
@@ -5,6 +5,7 @@ Communication with Authentication Service
 import httpx
 from typing import Optional, Dict, Any
 from app.config.settings import settings
+from app.config.http_client import HTTPClient, build_timeout
 from app.utils.logger import error, info, debug
 
 
@@ -14,7 +15,7 @@ class AuthServiceClient:
     def __init__(self):
         self.base_url = settings.AUTH_SERVICE_URL
         self.service_api_key = settings.SERVICE_API_KEY
-        self.timeout = settings.SERVICE_TIMEOUT
+        self.timeout = build_timeout(settings.AUTH_SERVICE_TIMEOUT or settings.SERVICE_TIMEOUT)
         
     async def validate_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
@@ -27,21 +28,22 @@ class AuthServiceClient:
             User data if token is valid, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/internal/validate-token",
-                    json={"token": token},
-                    headers={"x-api-key": self.service_api_key}
-                )
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/internal/validate-token",
+                json={"token": token},
+                headers={"x-api-key": self.service_api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        debug(f"Token validated successfully via Auth Service")
-                        return data.get("data", {}).get("user")
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("success"):
+                    debug(f"Token validated successfully via Auth Service")
+                    return data.get("data", {}).get("user")
                     
-                error(f"Token validation failed: {response.text}")
-                return None
+            error(f"Token validation failed: {response.text}")
+            return None
                 
         except httpx.TimeoutException:
             error("Auth Service timeout during token validation")
@@ -61,24 +63,25 @@ class AuthServiceClient:
             User data if found, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/internal/user/{user_id}",
-                    headers={"x-api-key": self.service_api_key}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/internal/user/{user_id}",
+                headers={"x-api-key": self.service_api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        debug(f"User {user_id} fetched from Auth Service")
-                        return data.get("data", {}).get("user")
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("success"):
+                    debug(f"User {user_id} fetched from Auth Service")
+                    return data.get("data", {}).get("user")
                 
-                if response.status_code == 404:
-                    debug(f"User {user_id} not found in Auth Service")
-                    return None
-                    
-                error(f"Failed to fetch user {user_id}: {response.text}")
+            if response.status_code == 404:
+                debug(f"User {user_id} not found in Auth Service")
                 return None
+                    
+            error(f"Failed to fetch user {user_id}: {response.text}")
+            return None
                 
         except httpx.TimeoutException:
             error("Auth Service timeout during user fetch")
@@ -98,24 +101,25 @@ class AuthServiceClient:
             User data if found, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/internal/user/email/{email}",
-                    headers={"x-api-key": self.service_api_key}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/internal/user/email/{email}",
+                headers={"x-api-key": self.service_api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        debug(f"User {email} fetched from Auth Service")
-                        return data.get("data", {}).get("user")
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("success"):
+                    debug(f"User {email} fetched from Auth Service")
+                    return data.get("data", {}).get("user")
                 
-                if response.status_code == 404:
-                    debug(f"User {email} not found in Auth Service")
-                    return None
-                    
-                error(f"Failed to fetch user {email}: {response.text}")
+            if response.status_code == 404:
+                debug(f"User {email} not found in Auth Service")
                 return None
+                    
+            error(f"Failed to fetch user {email}: {response.text}")
+            return None
                 
         except httpx.TimeoutException:
             error("Auth Service timeout during user fetch")
@@ -5,6 +5,8 @@ HTTP client for communicating with the Complaint Management Service (CMPS)
 import httpx
 from typing import Dict, Optional, List
 from app.config.settings import settings
+from app.config.http_client import HTTPClient, build_timeout
+from app.utils.batching import fetch_in_chunks
 from app.utils.logger import info, error, warning
 
 
@@ -13,7 +15,7 @@ class ComplaintServiceClient:
     
     def __init__(self):
         self.base_url = settings.COMPLAINT_SERVICE_URL
-        self.timeout = settings.SERVICE_TIMEOUT
+        self.timeout = build_timeout(settings.COMPLAINT_SERVICE_TIMEOUT or settings.SERVICE_TIMEOUT)
         self.api_key = settings.SERVICE_API_KEY
     
     async def get_customer_complaints(
@@ -39,43 +41,44 @@ class ComplaintServiceClient:
             Exception if service call fails
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Build query parameters
-                params = {
-                    "customerId": customer_id,
-                    "page": page,
-                    "limit": limit
-                }
+            client = HTTPClient.get_client()
+            # Build query parameters
+            params = {
+                "customerId": customer_id,
+                "page": page,
+                "limit": limit
+            }
                 
-                if status:
-                    params["status"] = status
+            if status:
+                params["status"] = status
                 
-                # Make request to CMPS
-                response = await client.get(
-                    f"{self.base_url}/api/internal/customers/{customer_id}/complaints",
-                    params={"limit": limit, "status": status} if status else {"limit": limit},
-                    headers={"x-api-key": self.api_key}
-                )
+            # Make request to CMPS
+            response = await client.get(
+                f"{self.base_url}/api/internal/customers/{customer_id}/complaints",
+                params={"limit": limit, "status": status} if status else {"limit": limit},
+                headers={"X-Service-API-Key": self.api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    info(f"Successfully fetched complaints for customer {customer_id}")
-                    return data.get("data", {})
-                elif response.status_code == 404:
-                    # No complaints found - not an error
-                    info(f"No complaints found for customer {customer_id}")
-                    return {
-                        "complaints": [],
-                        "pagination": {
-                            "currentPage": page,
-                            "totalPages": 0,
-                            "totalItems": 0,
-                            "itemsPerPage": limit
-                        }
+            if response.status_code == 200:
+                data = response.json()
+                info(f"Successfully fetched complaints for customer {customer_id}")
+                return data.get("data", {})
+            elif response.status_code == 404:
+                # No complaints found - not an error
+                info(f"No complaints found for customer {customer_id}")
+                return {
+                    "complaints": [],
+                    "pagination": {
+                        "currentPage": page,
+                        "totalPages": 0,
+                        "totalItems": 0,
+                        "itemsPerPage": limit
                     }
-                else:
-                    error(f"Complaint Service returned status {response.status_code}: {response.text}")
-                    raise Exception(f"Complaint Service error: {response.status_code}")
+                }
+            else:
+                error(f"Complaint Service returned status {response.status_code}: {response.text}")
+                raise Exception(f"Complaint Service error: {response.status_code}")
         
         except httpx.TimeoutException:
             error(f"Timeout calling Complaint Service for customer {customer_id}")
@@ -98,28 +101,29 @@ class ComplaintServiceClient:
             Dict containing complaint statistics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/complaints/internal/customer-stats/{customer_id}",
-                    headers={"X-Service-API-Key": self.api_key}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/complaints/internal/customer-stats/{customer_id}",
+                headers={"X-Service-API-Key": self.api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data", {})
-                elif response.status_code == 404:
-                    return {
-                        "totalComplaints": 0,
-                        "openComplaints": 0,
-                        "lastComplaintDate": None
-                    }
-                else:
-                    error(f"Complaint Service stats returned status {response.status_code}")
-                    return {
-                        "totalComplaints": 0,
-                        "openComplaints": 0,
-                        "lastComplaintDate": None
-                    }
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("data", {})
+            elif response.status_code == 404:
+                return {
+                    "totalComplaints": 0,
+                    "openComplaints": 0,
+                    "lastComplaintDate": None
+                }
+            else:
+                error(f"Complaint Service stats returned status {response.status_code}")
+                return {
+                    "totalComplaints": 0,
+                    "openComplaints": 0,
+                    "lastComplaintDate": None
+                }
         
         except Exception as e:
             error(f"Error fetching complaint statistics: {str(e)}")
@@ -129,6 +133,65 @@ class ComplaintServiceClient:
                 "lastComplaintDate": None
             }
     
+    async def _fetch_complaint_summaries(self, customer_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch one chunk of complaint summaries from the CMPS batch lookup
+        
+        Raises:
+            Exception if service call fails
+        """
+        client = HTTPClient.get_client()
+        response = await client.post(
+            f"{self.base_url}/api/internal/customers/complaints/summary",
+            json={"customerIds": customer_ids},
+            headers={"X-Service-API-Key": self.api_key},
+            timeout=self.timeout
+        )
+        
+        if response.status_code == 200:
+            return (response.json().get("data") or {}).get("summaries") or {}
+        raise Exception(f"Complaint Service error: {response.status_code}")
+    
+    async def get_complaint_summaries(self, customer_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get complaint summaries for many customers in as few calls as possible
+        
+        Args:
+            customer_ids: Customer IDs (any number; sent in parallel chunks)
+        
+        Returns:
+            Dict mapping customer ID to {"summary", "statusBreakdown"};
+            IDs of a chunk that failed are absent
+        """
+        return await fetch_in_chunks(customer_ids, self._fetch_complaint_summaries)
+    
+    async def invalidate_customer_cache(self, user_id: Optional[str], customer_id: Optional[str]) -> bool:
+        """
+        Drop a customer's cached profile in the Complaint Service
+        
+        Args:
+            user_id: User ID of the customer
+            customer_id: Customer ID
+        
+        Returns:
+            bool: True if CMPS acknowledged the invalidation
+        """
+        try:
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/internal/customer-cache/invalidate",
+                json={"userId": user_id, "customerId": customer_id},
+                headers={"X-Service-API-Key": self.api_key},
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                return True
+            warning(f"Complaint Service cache invalidation returned status {response.status_code}")
+            return False
+        except Exception as e:
+            warning(f"Failed to invalidate Complaint Service customer cache: {str(e)}")
+            return False
+    
     async def check_service_health(self) -> bool:
         """
         Check if Complaint Service is available
@@ -137,9 +200,9 @@ class ComplaintServiceClient:
             bool: True if service is healthy
         """
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            client = HTTPClient.get_client()
+            response = await client.get(f"{self.base_url}/health", timeout=build_timeout(5))
+            return response.status_code == 200
         except Exception:
             return False
 
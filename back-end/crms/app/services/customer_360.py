@@ -0,0 +1,247 @@
+"""
+Customer 360
+Profile, orders and complaints of a customer assembled in one call
+
+The admin views used to read the customer three times and call the Order
+and Complaint services one after the other. The 360 view reads the
+customer once and calls both services concurrently, each under its own
+deadline (CUSTOMER_360_*_DEADLINE_SECONDS). A service that misses its
+deadline or fails does not fail the view: its section reports "timeout"
+or "error" and carries the counters stored on the customer instead.
+
+Complete snapshots (every section ok) are cached for
+CUSTOMER_360_CACHE_TTL_SECONDS. Profile changes made through CRMS drop
+the cached snapshots; order and complaint changes show up when the TTL
+expires.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config.settings import settings
+from app.schemas.customer import (
+    Customer360Response,
+    Customer360Section,
+    CustomerDetailResponse,
+    SectionStatus
+)
+from app.services.complaint_client import complaint_service_client
+from app.services.order_client import order_service_client
+from app.utils.logger import warning
+
+SnapshotKey = Tuple[str, int]
+
+
+class SnapshotCache:
+    """LRU map of (customer ID, limit) to (snapshot, expires_at)"""
+    
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[SnapshotKey, Tuple[Customer360Response, float]]" = OrderedDict()
+        # Bumped by every invalidation, so a snapshot built while its
+        # customer changed is not cached
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: SnapshotKey) -> Optional[Customer360Response]:
+        """
+        Get a cached snapshot
+        
+        Returns:
+            Snapshot, or None if not cached or older than the TTL
+        """
+        entry = self._entries.get(key)
+        
+        if entry is not None:
+            snapshot, expires_at = entry
+            if self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return snapshot
+            del self._entries[key]
+        
+        self.misses += 1
+        return None
+    
+    def put(self, key: SnapshotKey, snapshot: Customer360Response, generation: int):
+        """Cache a snapshot for the TTL, unless an invalidation happened since `generation`"""
+        if self.max_size <= 0 or self.ttl <= 0 or generation != self.generation:
+            return
+        
+        self._entries[key] = (snapshot, self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, customer_id: str) -> int:
+        """
+        Drop every cached snapshot of a customer
+        
+        Returns:
+            Number of snapshots dropped
+        """
+        self.generation += 1
+        keys = [key for key in self._entries if key[0] == customer_id]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+    
+    def clear(self):
+        """Drop all cached snapshots"""
+        self.generation += 1
+        self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global snapshot cache instance
+customer_360_cache = SnapshotCache(
+    max_size=settings.CUSTOMER_360_CACHE_SIZE,
+    ttl=settings.CUSTOMER_360_CACHE_TTL_SECONDS
+)
+
+
+async def load_section(call: Awaitable[Dict], deadline: float, fallback: Dict) -> Customer360Section:
+    """
+    Await one dependency under a deadline
+    
+    Args:
+        call: Service client call
+        deadline: Seconds to wait before giving up on the call
+        fallback: Data returned when the call times out or fails
+    
+    Returns:
+        Section with the call's answer, or the fallback and the reason
+    """
+    started = time.perf_counter()
+    try:
+        data = await asyncio.wait_for(call, timeout=deadline)
+        status, message = SectionStatus.OK, None
+    except asyncio.TimeoutError:
+        data, status, message = fallback, SectionStatus.TIMEOUT, f"No answer within {deadline:g}s"
+    except Exception as e:
+        data, status, message = fallback, SectionStatus.ERROR, str(e)
+    
+    return Customer360Section(
+        status=status,
+        durationMs=round((time.perf_counter() - started) * 1000, 2),
+        data=data,
+        message=message
+    )
+
+
+def _stored_orders(customer: dict) -> Dict:
+    """Order counters stored on the customer"""
+    return {
+        "summary": {
+            "totalOrders": customer.get("totalOrders", 0),
+            "totalOrderValue": customer.get("totalOrderValue", 0.0),
+            "lastOrderDate": customer.get("lastOrderDate")
+        },
+        "recentOrders": []
+    }
+
+
+def _stored_complaints(customer: dict) -> Dict:
+    """Complaint counters stored on the customer"""
+    return {
+        "summary": {
+            "totalComplaints": customer.get("totalComplaints", 0),
+            "openComplaints": customer.get("openComplaints", 0),
+            "lastComplaintDate": customer.get("lastComplaintDate")
+        },
+        "recentComplaints": []
+    }
+
+
+async def build_customer_360(customer: dict, limit: int) -> Customer360Response:
+    """
+    Call the Order and Complaint services concurrently for a loaded customer
+    
+    Args:
+        customer: Customer document
+        limit: Recent orders and complaints to include
+    
+    Returns:
+        Snapshot with a status per section
+    """
+    customer_id = str(customer["_id"])
+    orders, complaints = await asyncio.gather(
+        load_section(
+            order_service_client.get_customer_orders(customer_id, limit=limit),
+            settings.CUSTOMER_360_ORDERS_DEADLINE_SECONDS,
+            _stored_orders(customer)
+        ),
+        load_section(
+            complaint_service_client.get_customer_complaints(customer_id, limit=limit),
+            settings.CUSTOMER_360_COMPLAINTS_DEADLINE_SECONDS,
+            _stored_complaints(customer)
+        )
+    )
+    
+    for name, section in (("Order Service", orders), ("Complaint Service", complaints)):
+        if section.status != SectionStatus.OK:
+            warning(f"Customer 360 for {customer_id}: {name} {section.status.value} ({section.message})")
+    
+    return Customer360Response(
+        customer=CustomerDetailResponse.from_document(customer),
+        orders=orders,
+        complaints=complaints,
+        complete=orders.status == SectionStatus.OK and complaints.status == SectionStatus.OK,
+        generatedAt=datetime.utcnow()
+    )
+
+
+async def get_customer_360(
+    db: AsyncIOMotorDatabase,
+    customer_id: str,
+    limit: int,
+    refresh: bool = False
+) -> Optional[Customer360Response]:
+    """
+    Customer 360 snapshot, from the cache or built now
+    
+    Args:
+        db: Database instance
+        customer_id: Customer ID (a valid ObjectId string)
+        limit: Recent orders and complaints to include
+        refresh: Skip the cache lookup
+    
+    Returns:
+        Snapshot, or None if the customer does not exist
+    """
+    key = (customer_id, limit)
+    if not refresh:
+        cached = customer_360_cache.get(key)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True})
+    
+    generation = customer_360_cache.generation
+    customer = await db.customers.find_one({"_id": ObjectId(customer_id)}, {"search": 0, "statisticsEvents": 0})
+    if not customer:
+        return None
+    
+    snapshot = await build_customer_360(customer, limit)
+    if snapshot.complete:
+        customer_360_cache.put(key, snapshot, generation)
+    return snapshot
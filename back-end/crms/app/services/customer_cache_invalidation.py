@@ -0,0 +1,56 @@
+"""
+Customer Cache Invalidation
+Tells the Order and Complaint services to drop their cached copy of a
+customer profile after it changes in CRMS, and drops the customer's
+cached 360 snapshots
+
+The 360 snapshots are dropped before the handler responds. The calls to
+the other services run in the background, so a slow or unavailable
+service never delays a customer write.
+"""
+import asyncio
+from typing import Optional, Set
+from app.services.order_client import order_service_client
+from app.services.complaint_client import complaint_service_client
+from app.services.customer_360 import customer_360_cache
+from app.utils.logger import error
+
+# Running remote invalidations (the event loop only keeps weak references)
+_pending: Set[asyncio.Task] = set()
+
+
+async def _invalidate_remote(user_id: Optional[str], customer_id: Optional[str]):
+    """Invalidate the customer in the Order and Complaint services"""
+    results = await asyncio.gather(
+        order_service_client.invalidate_customer_cache(user_id, customer_id),
+        complaint_service_client.invalidate_customer_cache(user_id, customer_id),
+        return_exceptions=True
+    )
+    for service, result in zip(("Order Service", "Complaint Service"), results):
+        if isinstance(result, Exception):
+            error(f"{service} customer cache invalidation failed: {str(result)}")
+
+
+def invalidate_customer_caches(user_id: Optional[str], customer_id: Optional[str]) -> asyncio.Task:
+    """
+    Invalidate a customer in every service that caches profiles
+    
+    Drops the local 360 snapshots now and starts the remote invalidations
+    without waiting for them. Failures are logged, never raised; the
+    caches' TTL bounds how long a missed invalidation can serve the old
+    profile.
+    
+    Args:
+        user_id: User ID of the customer
+        customer_id: Customer ID
+    
+    Returns:
+        Task running the remote invalidations
+    """
+    if customer_id:
+        customer_360_cache.invalidate(customer_id)
+
+    task = asyncio.create_task(_invalidate_remote(user_id, customer_id))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+    return task
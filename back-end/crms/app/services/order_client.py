@@ -5,6 +5,8 @@ HTTP client for communicating with the Order Management Service (ORMS)
 import httpx
 from typing import Dict, Optional, List
 from app.config.settings import settings
+from app.config.http_client import HTTPClient, build_timeout
+from app.utils.batching import fetch_in_chunks
 from app.utils.logger import info, error, warning
 
 
@@ -13,7 +15,7 @@ class OrderServiceClient:
     
     def __init__(self):
         self.base_url = settings.ORDER_SERVICE_URL
-        self.timeout = settings.SERVICE_TIMEOUT
+        self.timeout = build_timeout(settings.ORDER_SERVICE_TIMEOUT or settings.SERVICE_TIMEOUT)
         self.api_key = settings.SERVICE_API_KEY
     
     async def get_customer_orders(
@@ -39,43 +41,45 @@ class OrderServiceClient:
             Exception if service call fails
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Build query parameters
-                params = {
-                    "customerId": customer_id,
-                    "page": page,
-                    "limit": limit
-                }
+            client = HTTPClient.get_client()
+            # Build query parameters
+            params = {
+                "customerId": customer_id,
+                "page": page,
+                "limit": limit
+            }
                 
-                if status:
-                    params["status"] = status
+            if status:
+                params["status"] = status
                 
-                # Make request to ORMS
-                response = await client.get(
-                    f"{self.base_url}/api/internal/customers/{customer_id}/orders",
-                    params={"limit": limit, "status": status} if status else {"limit": limit},
-                    headers={"x-api-key": self.api_key}
-                )
+            # Make request to ORMS
+            response = await client.get(
+                f"{self.base_url}/api/internal/customers/{customer_id}/orders",
+                params={"limit": limit, "status": status} if status else {"limit": limit},
+                headers={"X-Service-API-Key": self.api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    info(f"Successfully fetched orders for customer {customer_id}")
-                    return data.get("data", {})
-                elif response.status_code == 404:
-                    # No orders found - not an error
-                    info(f"No orders found for customer {customer_id}")
-                    return {
-                        "orders": [],
-                        "pagination": {
-                            "currentPage": page,
-                            "totalPages": 0,
-                            "totalItems": 0,
-                            "itemsPerPage": limit
-                        }
+            if response.status_code == 200:
+                data = response.json()
+                info(f"Successfully fetched orders for customer {customer_id}")
+                # ORMS returns the order data unwrapped
+                return data.get("data") if "data" in data else data
+            elif response.status_code == 404:
+                # No orders found - not an error
+                info(f"No orders found for customer {customer_id}")
+                return {
+                    "orders": [],
+                    "pagination": {
+                        "currentPage": page,
+                        "totalPages": 0,
+                        "totalItems": 0,
+                        "itemsPerPage": limit
                     }
-                else:
-                    error(f"Order Service returned status {response.status_code}: {response.text}")
-                    raise Exception(f"Order Service error: {response.status_code}")
+                }
+            else:
+                error(f"Order Service returned status {response.status_code}: {response.text}")
+                raise Exception(f"Order Service error: {response.status_code}")
         
         except httpx.TimeoutException:
             error(f"Timeout calling Order Service for customer {customer_id}")
@@ -98,28 +102,29 @@ class OrderServiceClient:
             Dict containing order statistics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/orders/internal/customer-stats/{customer_id}",
-                    headers={"X-Service-API-Key": self.api_key}
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/orders/internal/customer-stats/{customer_id}",
+                headers={"X-Service-API-Key": self.api_key},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data", {})
-                elif response.status_code == 404:
-                    return {
-                        "totalOrders": 0,
-                        "totalOrderValue": 0.0,
-                        "lastOrderDate": None
-                    }
-                else:
-                    error(f"Order Service stats returned status {response.status_code}")
-                    return {
-                        "totalOrders": 0,
-                        "totalOrderValue": 0.0,
-                        "lastOrderDate": None
-                    }
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("data", {})
+            elif response.status_code == 404:
+                return {
+                    "totalOrders": 0,
+                    "totalOrderValue": 0.0,
+                    "lastOrderDate": None
+                }
+            else:
+                error(f"Order Service stats returned status {response.status_code}")
+                return {
+                    "totalOrders": 0,
+                    "totalOrderValue": 0.0,
+                    "lastOrderDate": None
+                }
         
         except Exception as e:
             error(f"Error fetching order statistics: {str(e)}")
@@ -129,6 +134,65 @@ class OrderServiceClient:
                 "lastOrderDate": None
             }
     
+    async def _fetch_orders_batch(self, order_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch one chunk of orders from the ORMS batch lookup
+        
+        Raises:
+            Exception if service call fails
+        """
+        client = HTTPClient.get_client()
+        response = await client.post(
+            f"{self.base_url}/api/internal/orders/batch",
+            json={"orderIds": order_ids},
+            headers={"X-Service-API-Key": self.api_key},
+            timeout=self.timeout
+        )
+        
+        if response.status_code == 200:
+            return response.json().get("orders") or {}
+        raise Exception(f"Order Service error: {response.status_code}")
+    
+    async def get_orders_by_ids(self, order_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many orders in as few calls as possible
+        
+        Args:
+            order_ids: Order IDs (any number; sent in parallel chunks)
+        
+        Returns:
+            Dict mapping order ID to order details; unknown IDs, and IDs
+            of a chunk that failed, are absent
+        """
+        return await fetch_in_chunks(order_ids, self._fetch_orders_batch)
+    
+    async def invalidate_customer_cache(self, user_id: Optional[str], customer_id: Optional[str]) -> bool:
+        """
+        Drop a customer's cached profile in the Order Service
+        
+        Args:
+            user_id: User ID of the customer
+            customer_id: Customer ID
+        
+        Returns:
+            bool: True if ORMS acknowledged the invalidation
+        """
+        try:
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/internal/customer-cache/invalidate",
+                json={"userId": user_id, "customerId": customer_id},
+                headers={"X-Service-API-Key": self.api_key},
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                return True
+            warning(f"Order Service cache invalidation returned status {response.status_code}")
+            return False
+        except Exception as e:
+            warning(f"Failed to invalidate Order Service customer cache: {str(e)}")
+            return False
+    
     async def check_service_health(self) -> bool:
         """
         Check if Order Service is available
@@ -137,9 +201,9 @@ class OrderServiceClient:
             bool: True if service is healthy
         """
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            client = HTTPClient.get_client()
+            response = await client.get(f"{self.base_url}/health", timeout=build_timeout(5))
+            return response.status_code == 200
         except Exception:
             return False
 
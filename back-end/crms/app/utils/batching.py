@@ -0,0 +1,71 @@
+"""
+Batch Lookups
+Chunked, parallel calls to the internal batch lookup endpoints
+
+The internal batch endpoints answer up to MAX_BATCH_IDS IDs with one $in
+query and return a map keyed by ID. Client lookups of any size are
+deduplicated, split into chunks of BATCH_LOOKUP_CHUNK_SIZE IDs and run
+BATCH_LOOKUP_CONCURRENCY chunks at a time over the shared connection
+pool; the chunk maps are merged. A failed chunk is logged and left out,
+so callers get every entry the other chunks found.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from app.config.settings import settings
+from app.utils.logger import warning
+
+# IDs accepted per call by the internal batch endpoints
+MAX_BATCH_IDS = 500
+
+ChunkFetcher = Callable[[List[str]], Awaitable[Dict[str, Any]]]
+
+
+def unique_ids(ids: Iterable[Optional[str]]) -> List[str]:
+    """IDs in first-seen order, without duplicates or empty values"""
+    return list(dict.fromkeys(id_ for id_ in ids if id_))
+
+
+def chunked(ids: List[str], size: int) -> List[List[str]]:
+    """Split IDs into chunks of at most `size` (capped at MAX_BATCH_IDS)"""
+    size = max(1, min(size, MAX_BATCH_IDS))
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+async def fetch_in_chunks(
+    ids: Iterable[Optional[str]],
+    fetch: ChunkFetcher,
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Look up many IDs through a batch endpoint
+    
+    Args:
+        ids: IDs to look up (duplicates and empty values are dropped)
+        fetch: Calls the batch endpoint for one chunk and returns its
+            keyed map; raises if the call failed
+        chunk_size: IDs per call (default: BATCH_LOOKUP_CHUNK_SIZE)
+        concurrency: Calls in flight at once (default: BATCH_LOOKUP_CONCURRENCY)
+    
+    Returns:
+        Merged map of every chunk that succeeded; IDs that were not found
+        or whose chunk failed are absent
+    """
+    chunks = chunked(unique_ids(ids), chunk_size or settings.BATCH_LOOKUP_CHUNK_SIZE)
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.BATCH_LOOKUP_CONCURRENCY))
+    
+    async def run(chunk: List[str]) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch(chunk)
+    
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=True)
+    
+    merged: Dict[str, Any] = {}
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            warning(f"Batch lookup of {len(chunk)} IDs failed: {str(result)}")
+            continue
+        merged.update(result)
+    return merged
@@ -0,0 +1,145 @@
+"""
+Customer Autocomplete
+Typeahead lookups over customer names, emails and contact numbers
+
+The admin search endpoint uses the text index, which only matches whole
+(stemmed) words, so typing "jo" finds nothing, and every keystroke pays a
+text-score sort and a full count. Customers now carry a `search`
+subdocument, rewritten whenever the name, email or contact number is
+written:
+
+- email: the lowercased email, for lookups of text containing "@"
+- words: lowercased words of the name and email local part, and the digit
+  groups of the contact number (plus all its digits joined)
+- grams: edge n-grams (prefixes) of those words
+
+A suggestion query is a single indexed find: every typed word must be a
+gram, the (search.grams, customerSince, _id) index returns matches newest
+customer first and the scan stops after `limit` matches. Within the page,
+customers with a whole-word match are listed before prefix-only matches.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.utils.projection import add_fields
+
+# Longest word prefix indexed (fits E.164 phone numbers)
+MAX_GRAM_LENGTH = 15
+
+# Words of a query that are matched (the rest are ignored)
+MAX_QUERY_WORDS = 4
+
+# Suggestions returned at most per query
+MAX_SUGGESTIONS = 20
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Upper bound for prefix ranges on ASCII and BMP strings
+_PREFIX_END = "\uffff"
+
+
+class AutocompleteQuery(NamedTuple):
+    """Index-backed match and order for one typeahead query"""
+    match: Dict[str, Any]
+    sort: List[tuple]
+    words: List[str]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words of a text (letters and digits, split on everything else)"""
+    return _WORD.findall((text or "").lower())
+
+
+def search_fields(
+    full_name: Optional[str],
+    email: Optional[str],
+    contact_number: Optional[str]
+) -> Dict[str, Any]:
+    """
+    The `search` subdocument stored on a customer
+    
+    Args:
+        full_name: Customer full name
+        email: Customer email
+        contact_number: Customer contact number
+    
+    Returns:
+        {"email": lowercased email, "words": searchable words, "grams": edge n-grams of those words}
+    """
+    email = (email or "").strip().lower()
+    phone_groups = re.findall(r"\d+", contact_number or "")
+    phone = ["".join(phone_groups)] if len(phone_groups) > 1 else []
+    words = list(dict.fromkeys(tokenize(full_name) + tokenize(email.split("@")[0]) + phone_groups + phone))
+    grams = dict.fromkeys(
+        word[:length]
+        for word in words
+        for length in range(1, min(len(word), MAX_GRAM_LENGTH) + 1)
+    )
+    return {
+        "email": email,
+        "words": words,
+        "grams": list(grams)
+    }
+
+
+def parse_autocomplete(text: Optional[str]) -> Optional[AutocompleteQuery]:
+    """
+    Map typed text onto an index-backed query
+    
+    Args:
+        text: Text typed so far
+    
+    Returns:
+        AutocompleteQuery, or None if the text contains nothing searchable
+    """
+    text = (text or "").strip().lower()
+    if "@" in text:
+        return AutocompleteQuery(
+            match={"search.email": {"$gte": text, "$lt": text + _PREFIX_END}},
+            sort=[("search.email", 1)],
+            words=[]
+        )
+    
+    words = list(dict.fromkeys(word[:MAX_GRAM_LENGTH] for word in tokenize(text)))
+    if not words:
+        return None
+    # The first $all value bounds the index scan, so lead with the most selective (longest) word
+    words = sorted(words, key=len, reverse=True)[:MAX_QUERY_WORDS]
+    return AutocompleteQuery(
+        match={"search.grams": words[0]} if len(words) == 1 else {"search.grams": {"$all": words}},
+        sort=[("customerSince", -1), ("_id", -1)],
+        words=words
+    )
+
+
+async def suggest_customers(
+    collection: AsyncIOMotorCollection,
+    text: str,
+    limit: int,
+    projection: Dict[str, int]
+) -> List[Dict[str, Any]]:
+    """
+    Top matches for typed text in one indexed query
+    
+    Args:
+        collection: Customers collection
+        text: Text typed so far
+        limit: Suggestions to return (at most MAX_SUGGESTIONS)
+        projection: Fields returned for each customer
+    
+    Returns:
+        Customer documents, whole-word matches first
+    """
+    query = parse_autocomplete(text)
+    if query is None:
+        return []
+    
+    limit = min(limit, MAX_SUGGESTIONS)
+    cursor = collection.find(query.match, add_fields(projection, ["search.words"]))
+    customers = await cursor.sort(query.sort).limit(limit).to_list(length=limit)
+    
+    # Stable: keeps newest first within each tier
+    customers.sort(key=lambda customer: -sum(
+        word in customer.get("search", {}).get("words", ()) for word in query.words
+    ))
+    return customers
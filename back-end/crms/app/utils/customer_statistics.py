@@ -0,0 +1,175 @@
+"""
+Customer Statistics
+Atomic delta updates of the denormalized order/complaint counters
+
+Order and Complaint services report changes (+1 order, -149.99 value, ...)
+instead of absolute totals. Each delta is one update pipeline on the stored
+document, so concurrent updates never overwrite each other, counters are
+clamped at zero and the last order/complaint dates only move forward.
+
+Outbox deliveries are at-least-once, so deltas from the ORMS/CMPS outbox
+carry the IDs of the events they were built from. The same update records
+those IDs on the customer (the last STATISTICS_EVENT_WINDOW of them) and
+leaves out the counters of any delta whose events are already recorded,
+so a redelivered delta is not counted twice.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from app.config.settings import settings
+from app.utils.validators import validate_object_id
+
+COUNTER_FIELDS = ("totalOrders", "totalOrderValue", "totalComplaints", "openComplaints")
+DATE_FIELDS = ("lastOrderDate", "lastComplaintDate")
+EVENTS_FIELD = "statisticsEvents"
+RECORDED_EVENTS = {"$ifNull": [f"${EVENTS_FIELD}", []]}
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a date to naive UTC, the form MongoDB returns
+    
+    ORMS sends naive ISO strings while other callers send "...Z" or offsets;
+    naive and offset-aware datetimes cannot be compared.
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _recorded_events(event_ids: List[str], recorded: bool) -> Dict:
+    """Expression keeping the event IDs that are (or are not) recorded on the customer"""
+    return {"$filter": {"input": event_ids, "cond": {"$eq": [{"$in": ["$$this", RECORDED_EVENTS]}, recorded]}}}
+
+
+def statistics_update(delta: Dict, now: datetime) -> List[Dict]:
+    """
+    Update pipeline applying a delta to a customer document
+    
+    Args:
+        delta: Counter changes and optional dates (CustomerStatisticsDelta
+            fields), plus "events": deltas that carry outbox event IDs
+        now: Modification timestamp for the metadata
+    
+    Returns:
+        Pipeline for update_one / find_one_and_update
+    """
+    events = delta.get("events") or []
+    
+    fields = {}
+    for field in COUNTER_FIELDS:
+        amounts = [delta.get(field) or 0]
+        for event in events:
+            if event.get(field):
+                # Counted only if none of the event IDs were applied before
+                already_applied = {"$gt": [{"$size": _recorded_events(event["eventIds"], True)}, 0]}
+                amounts.append({"$cond": [already_applied, 0, event[field]]})
+        if len(amounts) > 1 or amounts[0]:
+            fields[field] = {"$max": [0, {"$add": [{"$ifNull": [f"${field}", 0]}, *amounts]}]}
+    
+    for field in DATE_FIELDS:
+        if delta.get(field) is not None:
+            # $max ignores null, so a missing date takes the new one
+            fields[field] = {"$max": [f"${field}", delta[field]]}
+    
+    if events:
+        event_ids = [event_id for event in events for event_id in event["eventIds"]]
+        fields[EVENTS_FIELD] = {"$slice": [
+            {"$concatArrays": [RECORDED_EVENTS, _recorded_events(event_ids, False)]},
+            -settings.STATISTICS_EVENT_WINDOW
+        ]}
+    
+    fields["metadata.lastModifiedBy"] = "system"
+    fields["metadata.lastModifiedAt"] = now
+    return [{"$set": fields}]
+
+
+def merge_deltas(deltas: Iterable[Dict]) -> Dict[str, Dict]:
+    """
+    Sum deltas per customer
+    
+    Deltas with outbox event IDs are kept apart under "events", so each
+    one can be skipped on its own if it was already applied.
+    
+    Args:
+        deltas: Deltas with a customerId each
+    
+    Returns:
+        Map of customerId to one combined delta (valid ObjectIds are
+        normalized to their canonical string)
+    """
+    merged: Dict[str, Dict] = {}
+    for delta in deltas:
+        customer_id = delta["customerId"]
+        if validate_object_id(customer_id):
+            customer_id = str(ObjectId(customer_id))
+        
+        combined = merged.setdefault(customer_id, {**{field: 0 for field in COUNTER_FIELDS}, "events": []})
+        if delta.get("eventIds"):
+            combined["events"].append({
+                "eventIds": list(delta["eventIds"]),
+                **{field: delta.get(field) or 0 for field in COUNTER_FIELDS}
+            })
+        else:
+            for field in COUNTER_FIELDS:
+                combined[field] += delta.get(field) or 0
+        for field in DATE_FIELDS:
+            value = naive_utc(delta.get(field))
+            if value is not None and (combined.get(field) is None or value > combined[field]):
+                combined[field] = value
+    return merged
+
+
+async def apply_statistics_delta(collection, customer_id: str, delta: Dict) -> Optional[Dict]:
+    """
+    Apply a delta to one customer in a single round-trip
+    
+    Args:
+        collection: customers collection
+        customer_id: Customer ID (valid ObjectId string)
+        delta: Counter changes and optional dates
+    
+    Returns:
+        Updated customer document, or None if no customer matched
+    """
+    return await collection.find_one_and_update(
+        {"_id": ObjectId(customer_id)},
+        statistics_update(delta, datetime.utcnow()),
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def apply_statistics_deltas(collection, deltas: Iterable[Dict]) -> Tuple[int, List[str]]:
+    """
+    Apply deltas for many customers with one bulk write
+    
+    Args:
+        collection: customers collection
+        deltas: Deltas with a customerId each
+    
+    Returns:
+        Tuple of (customers updated, customer IDs that matched nothing)
+    """
+    merged = merge_deltas(deltas)
+    valid = [customer_id for customer_id in merged if validate_object_id(customer_id)]
+    not_found = [customer_id for customer_id in merged if not validate_object_id(customer_id)]
+    
+    if not valid:
+        return 0, not_found
+    
+    now = datetime.utcnow()
+    result = await collection.bulk_write(
+        [UpdateOne({"_id": ObjectId(customer_id)}, statistics_update(merged[customer_id], now)) for customer_id in valid],
+        ordered=False
+    )
+    
+    if result.matched_count < len(valid):
+        found = await collection.find(
+            {"_id": {"$in": [ObjectId(customer_id) for customer_id in valid]}},
+            {"_id": 1}
+        ).to_list(length=None)
+        found_ids = {str(doc["_id"]) for doc in found}
+        not_found += [customer_id for customer_id in valid if customer_id not in found_ids]
+    
+    return result.matched_count, not_found
@@ -0,0 +1,207 @@
+"""
+Index Advisor
+Replays the service's hot query shapes through explain() and reports any
+that would run a collection scan or an in-memory sort, or fetch documents
+for a query meant to be covered by its index
+
+Runs at startup (INDEX_ADVISOR_MODE = off | warn | fail) and from the CLI:
+    python -m app.utils.index_advisor
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.utils.logger import info, warning, error
+from app.schemas.customer import CUSTOMER_LIST_PROJECTION
+
+
+class QueryShape(NamedTuple):
+    """A query issued on a hot path, with representative values"""
+    name: str
+    collection: str
+    filter: Dict
+    sort: Optional[List[Tuple[str, int]]] = None
+    limit: int = 0
+    # Set for list queries whose index holds every returned field
+    covered_projection: Optional[Dict] = None
+
+
+# Hot query shapes for CRMS
+HOT_QUERIES = [
+    QueryShape("customer by userId", "customers", {"userId": "user-id"}),
+    QueryShape("customer by _id", "customers", {"_id": ObjectId()}),
+    QueryShape(
+        "customers by _id and userId batch",
+        "customers",
+        {"$or": [{"_id": {"$in": [ObjectId(), ObjectId()]}}, {"userId": {"$in": ["user-id", "other-user-id"]}}]}
+    ),
+    QueryShape(
+        "admin customers",
+        "customers",
+        {},
+        sort=[("customerSince", -1), ("_id", -1)],
+        limit=10,
+        covered_projection=CUSTOMER_LIST_PROJECTION
+    ),
+    QueryShape(
+        "admin autocomplete",
+        "customers",
+        {"search.grams": {"$all": ["john", "d"]}},
+        sort=[("customerSince", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin autocomplete by email",
+        "customers",
+        {"search.email": {"$gte": "john@ex", "$lt": "john@ex\uffff"}},
+        sort=[("search.email", 1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin customers by status",
+        "customers",
+        {"customerStatus": "Active"},
+        sort=[("customerSince", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "new customers this month",
+        "customers",
+        {"customerSince": {"$gte": datetime(2026, 1, 1)}}
+    )
+]
+
+def plan_stages(plan) -> List[str]:
+    """Collect every stage name in an explain() plan tree"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+async def explain_query(db: AsyncIOMotorDatabase, shape: QueryShape) -> Dict:
+    """
+    Explain one query shape
+    
+    Args:
+        db: Database instance
+        shape: Query shape to explain
+    
+    Returns:
+        Dictionary with the winning plan's stages and any problems found
+    """
+    cursor = db[shape.collection].find(shape.filter, shape.covered_projection)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    if shape.limit:
+        cursor = cursor.limit(shape.limit)
+    
+    explanation = await cursor.explain()
+    stages = plan_stages(explanation.get("queryPlanner", {}).get("winningPlan", {}))
+    
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("COLLSCAN")
+    if "SORT" in stages:
+        problems.append("in-memory SORT")
+    if shape.covered_projection is not None and "FETCH" in stages:
+        problems.append("FETCH (not covered)")
+    
+    return {
+        "name": shape.name,
+        "collection": shape.collection,
+        "stages": stages,
+        "problems": problems
+    }
+
+
+async def run_index_advisor(
+    db: AsyncIOMotorDatabase,
+    shapes: List[QueryShape] = HOT_QUERIES
+) -> List[Dict]:
+    """
+    Explain every hot query shape
+    
+    Args:
+        db: Database instance
+        shapes: Query shapes to check
+    
+    Returns:
+        One report entry per query shape
+    """
+    return [await explain_query(db, shape) for shape in shapes]
+
+
+async def check_indexes(db: AsyncIOMotorDatabase, mode: str = "warn") -> List[Dict]:
+    """
+    Run the advisor and log the outcome
+    
+    Args:
+        db: Database instance
+        mode: "off" to skip, "warn" to log problems, "fail" to also raise
+            when a hot query would scan a whole collection
+    
+    Returns:
+        Report entries with problems
+    
+    Raises:
+        RuntimeError: In fail mode, if any hot query runs a COLLSCAN
+    """
+    if mode == "off":
+        return []
+    
+    try:
+        report = await run_index_advisor(db)
+    except Exception as e:
+        if mode == "fail":
+            raise
+        error(f"Index advisor could not explain hot queries: {str(e)}")
+        return []
+    
+    flagged = [entry for entry in report if entry["problems"]]
+    
+    for entry in flagged:
+        warning(
+            f"⚠️  Index advisor: '{entry['name']}' on {entry['collection']} uses "
+            f"{', '.join(entry['problems'])} (plan: {' <- '.join(entry['stages'])})"
+        )
+    
+    collscans = [entry["name"] for entry in flagged if "COLLSCAN" in entry["problems"]]
+    if collscans and mode == "fail":
+        raise RuntimeError(f"Hot queries without a supporting index: {', '.join(collscans)}")
+    
+    if not flagged:
+        info(f"✅ Index advisor: all {len(report)} hot queries are index-backed")
+    return flagged
+
+
+async def main() -> int:
+    """Run the advisor against the configured database and print a report"""
+    from app.config.database import Database
+    
+    await Database.connect_db()
+    try:
+        report = await run_index_advisor(Database.db)
+    finally:
+        await Database.disconnect_db()
+    
+    for entry in report:
+        status = "❌" if "COLLSCAN" in entry["problems"] else "⚠️ " if entry["problems"] else "✅"
+        print(f"{status} {entry['collection']:<20} {entry['name']:<40} {' <- '.join(entry['stages'])}")
+    
+    collscans = [entry for entry in report if "COLLSCAN" in entry["problems"]]
+    if collscans:
+        error(f"{len(collscans)} hot queries would run a collection scan")
+    return 1 if collscans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,91 @@
+"""
+Fast JSON Responses
+orjson-backed response class for routers that opt in
+
+Routers opt in with APIRouter(default_response_class=FastJSONResponse):
+their responses are rendered by orjson, which handles datetime, date,
+UUID and enums natively, instead of the stdlib encoder. FastAPI still
+validates what an endpoint returns against its response_model first.
+List endpoints that build their items from database documents return
+trusted_response(...) instead, which skips that second validation pass
+(the response_model is still used for the OpenAPI schema).
+
+Falls back to the stdlib json module if orjson is not installed.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Convert values the encoder does not handle itself"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize response content to JSON bytes
+    
+    Args:
+        content: Dicts, lists, Pydantic models, datetimes, ObjectIds, ...
+    
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> FastJSONResponse:
+    """
+    Return content without FastAPI's response_model validation
+    
+    Only for content the endpoint built itself from database documents
+    in the shape of its response_model (e.g. a page of list items).
+    
+    Args:
+        content: Response body (Pydantic models are dumped by alias)
+        status_code: HTTP status code
+        headers: Extra response headers
+    
+    Returns:
+        Response rendered with orjson
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
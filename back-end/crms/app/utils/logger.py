@@ -1,12 +1,14 @@
 """
 Logger Utility
 Structured logging utility for the application with JSON formatting support
+
+Records are written by the background thread of app/utils/log_pipeline.py;
+INFO lines are rate capped per call site (LOG_INFO_* settings). Pass values
+as %-style arguments, info("Customer %s updated", customer_id), so they are
+only formatted for lines that are written; keyword arguments become
+structured fields of the record.
 """
-import logging
-import sys
-import json
-from datetime import datetime
-from typing import Any, Dict, Optional
+from app.utils.log_pipeline import configure_logging
 
 # Import settings with try/except to handle initialization issues
 try:
@@ -14,103 +16,45 @@ try:
     SERVICE_NAME = settings.SERVICE_NAME
     LOG_LEVEL = settings.LOG_LEVEL.upper()
     USE_JSON = settings.LOG_FORMAT.lower() == "json" or settings.ENVIRONMENT == "production"
+    PIPELINE_OPTIONS = {
+        "queue_size": settings.LOG_QUEUE_SIZE,
+        "info_rate_limit": settings.LOG_INFO_RATE_LIMIT,
+        "info_burst": settings.LOG_INFO_BURST,
+        "info_sample_rate": settings.LOG_INFO_SAMPLE_RATE
+    }
 except Exception:
     SERVICE_NAME = "customer-service"
     LOG_LEVEL = "INFO"
     USE_JSON = False
+    PIPELINE_OPTIONS = {}
 
-
-class JSONFormatter(logging.Formatter):
-    """
-    Custom JSON formatter for structured logging
-    """
-    
-    def format(self, record: logging.LogRecord) -> str:
-        """Format log record as JSON"""
-        
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "service": SERVICE_NAME,
-            "level": record.levelname,
-            "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno
-        }
-        
-        # Add extra fields if present
-        if hasattr(record, 'extra_data') and record.extra_data:
-            log_data.update(record.extra_data)
-        
-        # Add exception info if present
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
-        
-        return json.dumps(log_data)
-
-
-class SimpleFormatter(logging.Formatter):
-    """
-    Simple human-readable formatter
-    """
-    
-    def format(self, record: logging.LogRecord) -> str:
-        """Format log record as simple text"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        level = record.levelname
-        message = record.getMessage()
-        
-        # Add extra data if present
-        extra = ""
-        if hasattr(record, 'extra_data') and record.extra_data:
-            extra = f" | {json.dumps(record.extra_data)}"
-        
-        return f"{timestamp} - {SERVICE_NAME} - {level} - {message}{extra}"
-
-
-# Choose formatter based on environment
-formatter = JSONFormatter() if USE_JSON else SimpleFormatter()
-
-# Configure logging
-handler = logging.StreamHandler(sys.stdout)
-handler.setFormatter(formatter)
-
-logger = logging.getLogger(SERVICE_NAME)
-logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
-logger.addHandler(handler)
-
-# Prevent duplicate logs
-logger.propagate = False
+# Configure logging (JSON or text chosen by LOG_FORMAT / environment)
+logger, log_pipeline = configure_logging(SERVICE_NAME, LOG_LEVEL, USE_JSON, **PIPELINE_OPTIONS)
 
 
-def info(message: str, **kwargs):
+def info(message: str, *args, **kwargs):
     """Log info message with optional structured data"""
-    extra_data = kwargs if kwargs else {}
-    logger.info(message, extra={'extra_data': extra_data})
+    logger.info(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def error(message: str, **kwargs):
+def error(message: str, *args, **kwargs):
     """Log error message with optional structured data"""
-    extra_data = kwargs if kwargs else {}
-    logger.error(message, extra={'extra_data': extra_data})
+    logger.error(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def warning(message: str, **kwargs):
+def warning(message: str, *args, **kwargs):
     """Log warning message with optional structured data"""
-    extra_data = kwargs if kwargs else {}
-    logger.warning(message, extra={'extra_data': extra_data})
+    logger.warning(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def debug(message: str, **kwargs):
+def debug(message: str, *args, **kwargs):
     """Log debug message with optional structured data"""
-    extra_data = kwargs if kwargs else {}
-    logger.debug(message, extra={'extra_data': extra_data})
+    logger.debug(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def critical(message: str, **kwargs):
+def critical(message: str, *args, **kwargs):
     """Log critical message with optional structured data"""
-    extra_data = kwargs if kwargs else None
-    logger.critical(message, extra={'extra_data': extra_data})
+    logger.critical(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
 def log_performance(operation: str, duration_ms: float, **kwargs):
@@ -128,7 +72,7 @@ def log_performance(operation: str, duration_ms: float, **kwargs):
         "duration_ms": round(duration_ms, 2),
         **kwargs
     }
-    info(f"⚡ Performance: {operation} completed in {duration_ms}ms", **perf_data)
+    logger.info("⚡ Performance: %s completed in %sms", operation, duration_ms, extra={"extra_data": perf_data}, stacklevel=2)
 
 
 def log_database_operation(operation: str, collection: str, duration_ms: float, **kwargs):
@@ -148,7 +92,7 @@ def log_database_operation(operation: str, collection: str, duration_ms: float,
         "duration_ms": round(duration_ms, 2),
         **kwargs
     }
-    debug(f"📊 DB {operation} on {collection} ({duration_ms}ms)", **db_data)
+    logger.debug("📊 DB %s on %s (%sms)", operation, collection, duration_ms, extra={"extra_data": db_data}, stacklevel=2)
 
 
 def log_api_call(service: str, endpoint: str, status_code: int, duration_ms: float, **kwargs):
@@ -172,9 +116,9 @@ def log_api_call(service: str, endpoint: str, status_code: int, duration_ms: flo
     }
     
     if status_code >= 500:
-        error(f"🔴 {service} API call failed: {endpoint} - {status_code}", **api_data)
+        logger.error("🔴 %s API call failed: %s - %s", service, endpoint, status_code, extra={"extra_data": api_data}, stacklevel=2)
     elif status_code >= 400:
-        warning(f"🟡 {service} API call error: {endpoint} - {status_code}", **api_data)
+        logger.warning("🟡 %s API call error: %s - %s", service, endpoint, status_code, extra={"extra_data": api_data}, stacklevel=2)
     else:
-        debug(f"🟢 {service} API call: {endpoint} - {status_code} ({duration_ms}ms)", **api_data)
+        logger.debug("🟢 %s API call: %s - %s (%sms)", service, endpoint, status_code, duration_ms, extra={"extra_data": api_data}, stacklevel=2)
 
@@ -2,9 +2,10 @@
 Pagination Utility
 Helper functions for paginating database queries
 """
-from typing import List, TypeVar, Generic
+from typing import List, Optional, TypeVar, Generic
 from app.schemas.response import PaginationMeta, PaginatedResponse
 from app.config.settings import settings
+from app.utils.cursor import KeysetPage
 
 T = TypeVar('T')
 
@@ -12,7 +13,8 @@ T = TypeVar('T')
 def calculate_pagination(
     page: int,
     limit: int,
-    total_items: int
+    total_items: Optional[int],
+    total_exact: bool = True
 ) -> tuple[int, PaginationMeta]:
     """
     Calculate pagination metadata and skip value
@@ -20,7 +22,8 @@ def calculate_pagination(
     Args:
         page: Current page number (1-indexed)
         limit: Items per page
-        total_items: Total number of items
+        total_items: Total number of items, or None if not counted
+        total_exact: Whether total_items is an exact count
         
     Returns:
         Tuple of (skip, PaginationMeta)
@@ -31,7 +34,10 @@ def calculate_pagination(
     
     # Calculate pagination values
     skip = (page - 1) * limit
-    total_pages = (total_items + limit - 1) // limit if total_items > 0 else 1
+    if total_items is None:
+        total_pages = None
+    else:
+        total_pages = (total_items + limit - 1) // limit if total_items > 0 else 1
     
     # Create pagination metadata
     pagination = PaginationMeta(
@@ -39,13 +45,35 @@ def calculate_pagination(
         totalPages=total_pages,
         totalItems=total_items,
         itemsPerPage=limit,
-        hasNextPage=page < total_pages,
-        hasPreviousPage=page > 1
+        hasNextPage=total_pages is not None and page < total_pages,
+        hasPreviousPage=page > 1,
+        totalExact=total_items is not None and total_exact
     )
     
     return skip, pagination
 
 
+def attach_cursors(
+    pagination: PaginationMeta,
+    page: KeysetPage
+) -> PaginationMeta:
+    """
+    Add next/previous cursors to pagination metadata
+    
+    Args:
+        pagination: Metadata from calculate_pagination
+        page: Page fetched with fetch_page
+    
+    Returns:
+        PaginationMeta with cursors and has*Page taken from the fetch
+    """
+    pagination.nextCursor = page.next_cursor
+    pagination.prevCursor = page.prev_cursor
+    pagination.hasNextPage = page.has_next
+    pagination.hasPreviousPage = page.has_previous
+    return pagination
+
+
 def create_paginated_response(
     items: List[T],
     pagination: PaginationMeta
@@ -0,0 +1,336 @@
+"""
+Rate Limiter
+Pluggable rate limiting engine: token bucket and sliding window counter
+algorithms over an in-process or MongoDB-backed store
+
+Every key holds a constant-size state (two or three numbers) instead of a
+list of request timestamps. The memory store evicts idle keys periodically;
+the Mongo store shares limits across workers and replicas through atomic
+update pipelines and lets a TTL index evict idle keys.
+"""
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+RATE_LIMIT_COLLECTION = "rate_limits"
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of one request against one limit"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+
+
+def _expires_at(now: float, ttl: float) -> datetime:
+    """Wall-clock expiry for the Mongo TTL index"""
+    return datetime.fromtimestamp(now + ttl, tz=timezone.utc)
+
+
+class TokenBucket:
+    """
+    Token bucket: `limit` tokens refilled evenly over `period` seconds
+    
+    State: (tokens, updated_at). Allows bursts up to `limit`.
+    """
+    
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.rate = limit / period
+        # A bucket untouched for a full period is full again, same as no state
+        self.idle_ttl = period
+    
+    def consume(self, state: Optional[Tuple], now: float) -> Tuple[Tuple, RateLimitResult]:
+        """Take one token; returns the new state and the result"""
+        if state is None:
+            tokens = float(self.limit)
+        else:
+            tokens, updated_at = state
+            tokens = min(self.limit, tokens + (now - updated_at) * self.rate)
+        
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        
+        return (tokens, now), self.result(tokens, allowed)
+    
+    def result(self, tokens: float, allowed: bool) -> RateLimitResult:
+        """Build the result from the post-request token count"""
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=int(tokens),
+            retry_after=0.0 if allowed else (1 - tokens) / self.rate
+        )
+    
+    def mongo_update(self, now: float) -> List[Dict]:
+        """Update pipeline performing consume() atomically on the stored document"""
+        return [
+            {"$set": {
+                "tokens": {"$min": [
+                    self.limit,
+                    {"$add": [
+                        {"$ifNull": ["$tokens", self.limit]},
+                        {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updatedAt", now]}]}, self.rate]}
+                    ]}
+                ]}
+            }},
+            {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                "updatedAt": now,
+                "expiresAt": _expires_at(now, self.idle_ttl)
+            }}
+        ]
+    
+    def mongo_result(self, doc: Dict, now: float) -> RateLimitResult:
+        """Build the result from the updated document"""
+        return self.result(doc["tokens"], doc["allowed"])
+
+
+class SlidingWindowCounter:
+    """
+    Sliding window counter: at most `limit` requests in any `window` seconds
+    
+    State: (window_index, current_count, previous_count). The previous fixed
+    window's count is weighted by how much of it still overlaps the sliding
+    window, which approximates a true sliding log without storing timestamps.
+    """
+    
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        # After two windows both counters have rolled over to zero
+        self.idle_ttl = 2 * window
+    
+    def _position(self, now: float) -> Tuple[int, float]:
+        """Current window index and the weight of the previous window"""
+        index = int(now // self.window)
+        weight = 1 - (now - index * self.window) / self.window
+        return index, weight
+    
+    def consume(self, state: Optional[Tuple], now: float) -> Tuple[Tuple, RateLimitResult]:
+        """Count one request; returns the new state and the result"""
+        index, weight = self._position(now)
+        current, previous = 0, 0
+        if state is not None:
+            stored_index, stored_current, stored_previous = state
+            if stored_index == index:
+                current, previous = stored_current, stored_previous
+            elif stored_index == index - 1:
+                previous = stored_current
+        
+        allowed = previous * weight + current + 1 <= self.limit
+        if allowed:
+            current += 1
+        
+        return (index, current, previous), self.result(current, previous, allowed, now)
+    
+    def result(self, current: int, previous: int, allowed: bool, now: float) -> RateLimitResult:
+        """Build the result from the post-request counters"""
+        index, weight = self._position(now)
+        remaining = max(0, math.floor(self.limit - previous * weight - current))
+        
+        retry_after = 0.0
+        if not allowed:
+            window_end = (index + 1) * self.window
+            if current + 1 > self.limit or previous == 0:
+                retry_after = window_end - now
+            else:
+                # When the previous window's weight has decayed enough
+                retry_after = window_end - self.window * (self.limit - current - 1) / previous - now
+        
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=remaining,
+            retry_after=max(0.0, retry_after)
+        )
+    
+    def mongo_update(self, now: float) -> List[Dict]:
+        """Update pipeline performing consume() atomically on the stored document"""
+        index, weight = self._position(now)
+        same_window = {"$eq": ["$window", index]}
+        previous_window = {"$eq": ["$window", index - 1]}
+        
+        return [
+            {"$set": {
+                "previous": {"$cond": [same_window, "$previous", {"$cond": [previous_window, "$current", 0]}]},
+                "current": {"$cond": [same_window, "$current", 0]},
+                "window": index
+            }},
+            {"$set": {
+                "allowed": {"$lte": [
+                    {"$add": [{"$multiply": ["$previous", weight]}, "$current", 1]},
+                    self.limit
+                ]}
+            }},
+            {"$set": {
+                "current": {"$cond": ["$allowed", {"$add": ["$current", 1]}, "$current"]},
+                "expiresAt": _expires_at(now, self.idle_ttl)
+            }}
+        ]
+    
+    def mongo_result(self, doc: Dict, now: float) -> RateLimitResult:
+        """Build the result from the updated document"""
+        return self.result(doc["current"], doc["previous"], doc["allowed"], now)
+
+
+ALGORITHMS = {
+    "token_bucket": TokenBucket,
+    "sliding_window": SlidingWindowCounter
+}
+
+
+class MemoryStore:
+    """Per-process store (limits are per worker)"""
+    
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self._entries: Dict[str, Tuple[Tuple, float]] = {}
+        self._next_sweep = 0.0
+        self.evictions = 0
+    
+    def _sweep(self, now: float):
+        """Drop keys idle long enough that their state no longer matters"""
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self.evictions += len(expired)
+        self._next_sweep = now + self.sweep_interval
+    
+    async def hit(self, algorithm, key: str, now: float) -> RateLimitResult:
+        """Apply one request for `key`"""
+        if now >= self._next_sweep:
+            self._sweep(now)
+        
+        entry = self._entries.get(key)
+        state = entry[0] if entry is not None and entry[1] > now else None
+        
+        state, result = algorithm.consume(state, now)
+        self._entries[key] = (state, now + algorithm.idle_ttl)
+        return result
+    
+    def stats(self) -> Dict:
+        """Get key count and evictions"""
+        return {"backend": "memory", "keys": len(self._entries), "evictions": self.evictions}
+
+
+class MongoStore:
+    """
+    Shared store in the rate_limits collection (limits hold across workers)
+    
+    Each key is one document updated by a single find_one_and_update
+    pipeline, so concurrent requests from different processes never race.
+    """
+    
+    def __init__(self, get_collection: Callable):
+        self.get_collection = get_collection
+    
+    async def hit(self, algorithm, key: str, now: float) -> RateLimitResult:
+        """Apply one request for `key`"""
+        collection = self.get_collection()
+        update = algorithm.mongo_update(now)
+        
+        try:
+            doc = await collection.find_one_and_update(
+                {"_id": key},
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another worker created the document first; it exists now
+            doc = await collection.find_one_and_update(
+                {"_id": key},
+                update,
+                return_document=ReturnDocument.AFTER
+            )
+        
+        return algorithm.mongo_result(doc, now)
+    
+    def stats(self) -> Dict:
+        """Get backend name (key count lives in the collection)"""
+        return {"backend": "mongo", "collection": RATE_LIMIT_COLLECTION}
+
+
+class RateLimitRule(NamedTuple):
+    """A named limit, e.g. ("minute", SlidingWindowCounter(100, 60))"""
+    name: str
+    algorithm: object
+
+
+class RateLimiter:
+    """Applies a set of rules to a client key over one store"""
+    
+    def __init__(self, rules: List[RateLimitRule], store, clock: Callable[[], float] = time.time):
+        self.rules = rules
+        self.store = store
+        self.clock = clock
+    
+    async def check(self, key: str) -> Optional[Tuple[str, RateLimitResult]]:
+        """
+        Count one request for a client key against every rule
+        
+        Rules are applied in order and stop at the first rejection, so a
+        request refused by the minute limit is not charged to the hour limit.
+        
+        Args:
+            key: Client key (e.g. "ip:10.0.0.1", "user:<userId>")
+        
+        Returns:
+            (rule name, result) of the rejecting rule, or None if allowed
+        """
+        now = self.clock()
+        for rule in self.rules:
+            result = await self.store.hit(rule.algorithm, f"{rule.name}:{key}", now)
+            if not result.allowed:
+                return rule.name, result
+        return None
+    
+    def stats(self) -> Dict:
+        """Get limiter configuration and store statistics"""
+        return {
+            "rules": {rule.name: rule.algorithm.limit for rule in self.rules},
+            "algorithm": type(self.rules[0].algorithm).__name__ if self.rules else None,
+            **self.store.stats()
+        }
+
+
+def create_rate_limiter(
+    algorithm: str,
+    backend: str,
+    requests_per_minute: int,
+    requests_per_hour: int,
+    get_collection: Optional[Callable] = None
+) -> RateLimiter:
+    """
+    Build a limiter with minute and hour rules
+    
+    Args:
+        algorithm: "sliding_window" or "token_bucket"
+        backend: "memory" (per process) or "mongo" (shared)
+        requests_per_minute: Minute limit
+        requests_per_hour: Hour limit
+        get_collection: Returns the rate_limits collection (mongo backend)
+    
+    Returns:
+        Configured RateLimiter
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+    if backend not in ("memory", "mongo"):
+        raise ValueError(f"Unknown rate limit backend: {backend}")
+    
+    algorithm_class = ALGORITHMS[algorithm]
+    rules = [
+        RateLimitRule("minute", algorithm_class(requests_per_minute, 60)),
+        RateLimitRule("hour", algorithm_class(requests_per_hour, 3600))
+    ]
+    store = MongoStore(get_collection) if backend == "mongo" else MemoryStore()
+    return RateLimiter(rules, store)
@@ -0,0 +1,110 @@
+"""
+Token Cache
+Bounded LRU cache of verified JWT payloads
+
+Clients reuse the same bearer token for many requests, so the HMAC
+verification result is kept per token (keyed by its SHA-256 digest) until
+the token's own exp claim. Tokens without an exp are never cached.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from jose import jwt
+from app.config.settings import settings
+
+
+class TokenCache:
+    """LRU map of token digest to (payload, expires_at)"""
+    
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[Dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Digest used as the cache key (raw tokens are not kept in memory)"""
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Get the cached payload for a token
+        
+        Returns:
+            Verified payload, or None if not cached or expired
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        
+        if entry is not None:
+            payload, expires_at = entry
+            if self.clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            del self._entries[key]
+        
+        self.misses += 1
+        return None
+    
+    def put(self, token: str, payload: Dict):
+        """Cache a verified payload until its exp claim"""
+        expires_at = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        
+        key = self._key(token)
+        self._entries[key] = (payload, float(expires_at))
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """Drop all cached tokens"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global token cache instance
+token_cache = TokenCache(max_size=settings.JWT_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> Dict:
+    """
+    Verify a JWT access token, using the cache for tokens seen before
+    
+    Args:
+        token: JWT access token
+    
+    Returns:
+        Decoded token payload (a copy, safe to modify)
+    
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM]
+        )
+        token_cache.put(token, payload)
+    return dict(payload)
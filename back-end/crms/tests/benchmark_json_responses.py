@@ -0,0 +1,129 @@
+"""
+JSON Response Benchmark
+Serializes a 100-item customer list page three ways: FastAPI's default path
+(response_model validation, then the stdlib JSON encoder), an opted-in
+router (validation, then orjson) and trusted_response (orjson only), and
+checks that all three produce the same JSON.
+No MongoDB required.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas.customer import CustomerListItemResponse
+from app.schemas.response import PaginatedResponse
+from app.utils.cursor import encode_cursor
+from app.utils.json_response import FastJSONResponse, orjson, trusted_response
+from app.utils.pagination import calculate_pagination, create_paginated_response
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+
+def customer(n, now):
+    """Projected customer document as read by the list endpoints"""
+    return {
+        "_id": f"65b2a1f0c3d4e5f6a7b8{n:04x}",
+        "userId": f"user-{n:04d}",
+        "email": f"customer{n}@example.com",
+        "fullName": f"Customer {n}",
+        "contactNumber": f"+91-98765{n:05d}",
+        "customerStatus": "Active" if n % 9 else "Inactive",
+        "customerType": ("Regular", "Premium", "VIP")[n % 3],
+        "totalOrders": n % 40,
+        "totalOrderValue": 2500.75 * (n % 40),
+        "totalComplaints": n % 5,
+        "openComplaints": n % 2,
+        "lastOrderDate": now - timedelta(days=n % 30, microseconds=n * 1000) if n % 40 else None,
+        "customerSince": now - timedelta(days=365 + n)
+    }
+
+
+def build_page():
+    """Content the customer list endpoints return for one page"""
+    now = datetime.utcnow().replace(microsecond=0)
+    customers = [customer(n, now) for n in range(PAGE_SIZE)]
+    _, pagination = calculate_pagination(1, PAGE_SIZE, 5000)
+    pagination.nextCursor = encode_cursor([("customerSince", -1), ("_id", -1)], customers[-1])
+    items = [
+        CustomerListItemResponse(customerId=str(doc.pop("_id")), **doc)
+        for doc in customers
+    ]
+    return create_paginated_response(items=items, pagination=pagination)
+
+
+def print_result(passed, message):
+    """Print check result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {message}")
+    return passed
+
+
+async def run_benchmark():
+    """Time each serialization path over the same page"""
+    content = build_page()
+    field = create_response_field("Response", PaginatedResponse[CustomerListItemResponse])
+    
+    async def default_path():
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+    
+    async def opted_in_router():
+        return FastJSONResponse(await serialize_response(field=field, response_content=content)).body
+    
+    async def trusted():
+        return trusted_response(content).body
+    
+    print(f"Customer list page of {PAGE_SIZE} items, {ROUNDS} rounds (orjson {'installed' if orjson else 'NOT installed'})\n")
+    print(f"{'':<36} {'ms/page':>10} {'bytes':>10}")
+    
+    results = {}
+    for label, path in (
+        ("Default (validate + stdlib json)", default_path),
+        ("Opted-in router (validate + orjson)", opted_in_router),
+        ("trusted_response (orjson)", trusted)
+    ):
+        body = await path()
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            await path()
+        elapsed = (time.perf_counter() - started) / ROUNDS
+        results[label] = (elapsed, body)
+        print(f"{label:<36} {elapsed * 1000:>10.3f} {len(body):>10,}")
+    
+    print()
+    default, router, fast = results.values()
+    passed = print_result(
+        json.loads(default[1]) == json.loads(router[1]) == json.loads(fast[1]),
+        "All paths produce the same JSON"
+    )
+    passed &= print_result(
+        fast[0] < default[0],
+        f"trusted_response is {default[0] / fast[0]:.1f}x faster, "
+        f"opted-in router {default[0] / router[0]:.1f}x faster than the default path"
+    )
+    return passed
+
+
+def main():
+    """Run the JSON response benchmark"""
+    print("\n" + "=" * 80)
+    print("CRMS - JSON Response Benchmark".center(80))
+    print("=" * 80 + "\n")
+    
+    passed = asyncio.run(run_benchmark())
+    
+    print("\n" + "=" * 80)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
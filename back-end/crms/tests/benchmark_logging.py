@@ -0,0 +1,186 @@
+"""
+Logging Overhead Benchmark
+Logs the lines of a typical request (request line, three handler lines,
+one of them dumping a customer document, and the response line) the
+previous way (eager f-strings, json.dumps formatter and a synchronous
+stream write on the calling thread) and through the log pipeline
+(lazy %-arguments, queue handoff to the writer thread, orjson records),
+with and without the INFO rate cap. Reports the time the event loop
+thread spends per request, for a fast sink and for a slow one (a stdout
+pipe that is not drained fast enough, where a burst overflows the queue
+and the excess lines are dropped rather than blocking the caller).
+No MongoDB required.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import json
+import logging
+import time
+from datetime import datetime
+
+from app.utils.log_pipeline import configure_logging
+
+REQUESTS = 5000
+SLOW_WRITE_SECONDS = 0.00005
+
+CUSTOMER = {
+    "customerId": "65b2a1f0c3d4e5f6a7b80001",
+    "userId": "user-0001",
+    "email": "customer1@example.com",
+    "fullName": "Customer One",
+    "contactNumber": "+91-9876500001",
+    "customerStatus": "Active",
+    "customerType": "Premium",
+    "totalOrders": 42,
+    "totalOrderValue": 105031.5,
+    "address": {"street": "1 MG Road", "city": "Bangalore", "state": "Karnataka", "zipCode": "560001"},
+    "tags": ["b2b", "priority", "north"],
+    "notes": "Prefers delivery before noon. " * 10
+}
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """Previous CRMS formatter"""
+    
+    def format(self, record):
+        log_data = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "service": "customer-service",
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno
+        }
+        if hasattr(record, 'extra_data') and record.extra_data:
+            log_data.update(record.extra_data)
+        return json.dumps(log_data)
+
+
+class Sink(io.TextIOBase):
+    """Counts written lines; optionally slow, like a stdout pipe under backpressure"""
+    
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lines = 0
+    
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        self.lines += text.count("\n")
+        return len(text)
+    
+    def flush(self):
+        pass
+
+
+def legacy_request(log, n):
+    """Log lines of one request as the services did before"""
+    log.info(f"→ GET /api/customers/{n} from 10.0.0.1", extra={'extra_data': {"type": "REQUEST", "path": f"/api/customers/{n}"}})
+    log.info(f"Fetching customer {n}", extra={'extra_data': {}})
+    log.info(f"Customer data from CRMS: {CUSTOMER}", extra={'extra_data': {}})
+    log.debug(f"Token validated for user: {CUSTOMER['email']} (role: Customer)", extra={'extra_data': {}})
+    log.info(f"✓ GET /api/customers/{n} - 200 (1.2ms)", extra={'extra_data': {"type": "RESPONSE", "status_code": 200}})
+
+
+def pipeline_request(log, n):
+    """Log lines of one request through the pipeline helpers' calling convention"""
+    log.info("→ GET /api/customers/%s from %s", n, "10.0.0.1", extra={"extra_data": {"type": "REQUEST", "path": f"/api/customers/{n}"}})
+    log.info("Fetching customer %s", n)
+    log.info("Customer data from CRMS: %s", CUSTOMER)
+    log.debug("Token validated for user: %s (role: %s)", CUSTOMER["email"], "Customer")
+    log.info("✓ GET /api/customers/%s - %s (%sms)", n, 200, 1.2, extra={"extra_data": {"type": "RESPONSE", "status_code": 200}})
+
+
+def legacy_logger(name, sink):
+    """Synchronous stream handler with the previous formatter"""
+    log = logging.getLogger(name)
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(LegacyJSONFormatter())
+    log.handlers = [handler]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log, None
+
+
+def pipeline_logger(name, sink, rate_limit):
+    """Logger routed through a LogPipeline"""
+    return configure_logging(name, "INFO", json_format=True, info_rate_limit=rate_limit, stream=sink)
+
+
+def measure(label, make_logger, request, delay):
+    """Calling-thread time per request, total time until every line is written, lines written and dropped"""
+    sink = Sink(delay)
+    log, pipeline = make_logger(sink)
+    
+    started = time.perf_counter()
+    for n in range(REQUESTS):
+        request(log, n)
+    calling = (time.perf_counter() - started) / REQUESTS
+    dropped = 0
+    if pipeline:
+        pipeline.flush(timeout=120)
+        pipeline.stop()
+        dropped = pipeline.stats()["dropped"]
+    drained = time.perf_counter() - started
+    
+    print(f"{label:<34} {calling * 1e6:>12.1f} {drained * 1000:>12.0f} {sink.lines:>10,} {dropped:>10,}")
+    return calling, sink.lines, dropped
+
+
+def print_result(passed, message):
+    """Print check result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {message}")
+    return passed
+
+
+def run_benchmark():
+    """Compare the previous logging path and the pipeline"""
+    passed = True
+    for sink_label, delay in (("Fast sink", 0.0), (f"Slow sink ({SLOW_WRITE_SECONDS * 1e6:.0f}µs per write)", SLOW_WRITE_SECONDS)):
+        print(f"{sink_label}, {REQUESTS} requests x 4 INFO lines\n")
+        print(f"{'':<34} {'µs/request':>12} {'total ms':>12} {'lines':>10} {'dropped':>10}")
+        
+        legacy, legacy_lines, _ = measure(
+            "Synchronous (previous)", lambda sink: legacy_logger(f"legacy-{delay}", sink), legacy_request, delay
+        )
+        queued, queued_lines, queued_dropped = measure(
+            "Pipeline, no rate cap", lambda sink: pipeline_logger(f"pipeline-{delay}", sink, 0.0), pipeline_request, delay
+        )
+        capped, capped_lines, _ = measure(
+            "Pipeline, 50 lines/s per site", lambda sink: pipeline_logger(f"capped-{delay}", sink, 50.0), pipeline_request, delay
+        )
+        
+        print()
+        passed &= print_result(
+            queued_lines + queued_dropped == legacy_lines,
+            f"Pipeline without a cap wrote {queued_lines:,} of {legacy_lines:,} lines "
+            f"({queued_dropped:,} dropped when the queue was full instead of blocking)"
+        )
+        passed &= print_result(
+            queued < legacy,
+            f"Calling thread: {legacy / queued:.1f}x less time per request, "
+            f"{legacy / capped:.1f}x with the rate cap ({capped_lines:,} lines kept)"
+        )
+        print()
+    return passed
+
+
+def main():
+    """Run the logging overhead benchmark"""
+    print("\n" + "=" * 80)
+    print("CRMS - Logging Overhead Benchmark".center(80))
+    print("=" * 80 + "\n")
+    
+    passed = run_benchmark()
+    
+    print("=" * 80)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
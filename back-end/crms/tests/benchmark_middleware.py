@@ -0,0 +1,177 @@
+"""
+Middleware Benchmark
+Compares request throughput on a trivial endpoint with no middleware, the
+previous BaseHTTPMiddleware stack and the pure ASGI stack
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.request_logging import RequestLoggingMiddleware
+from app.middleware.security import SecurityHeadersMiddleware, SECURITY_HEADERS
+from app.utils.logger import logger, info
+
+REQUESTS = 5000
+ROUNDS = 3
+
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    """Previous security headers middleware"""
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            response.headers[name.decode()] = value.decode()
+        return response
+
+
+class LegacyRateLimit(BaseHTTPMiddleware):
+    """Previous rate limit middleware (timestamp lists per IP)"""
+    def __init__(self, app):
+        super().__init__(app)
+        self.minute_requests = defaultdict(list)
+        self.hour_requests = defaultdict(list)
+    
+    async def dispatch(self, request, call_next):
+        now = time.time()
+        ip = request.client.host
+        for storage, window in ((self.minute_requests, 60), (self.hour_requests, 3600)):
+            storage[ip] = [t for t in storage[ip] if t > now - window]
+            storage[ip].append(now)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit-Minute"] = str(10**9)
+        response.headers["X-RateLimit-Limit-Hour"] = str(10**9)
+        return response
+
+
+class LegacyRequestLogging(BaseHTTPMiddleware):
+    """Previous request logging middleware"""
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        info(f"→ {request.method} {request.url.path}")
+        response = await call_next(request)
+        process_time_ms = round((time.time() - start_time) * 1000, 2)
+        info(f"✓ {request.method} {request.url.path} - {response.status_code} ({process_time_ms}ms)")
+        response.headers["X-Process-Time"] = str(process_time_ms)
+        response.headers["X-Service-Name"] = "CRMS"
+        return response
+
+
+def build_app(stack):
+    """Trivial app with the given middleware stack (outermost first)"""
+    app = FastAPI()
+    
+    @app.get("/ping")
+    async def ping():
+        return {"success": True}
+    
+    for middleware, options in reversed(stack):
+        app.add_middleware(middleware, **options)
+    return app
+
+
+STACKS = {
+    "No middleware": [],
+    "BaseHTTPMiddleware stack": [
+        (LegacySecurityHeaders, {}),
+        (LegacyRateLimit, {}),
+        (LegacyRequestLogging, {})
+    ],
+    "Pure ASGI stack": [
+        (SecurityHeadersMiddleware, {}),
+        (RateLimitMiddleware, {"requests_per_minute": 10**9, "requests_per_hour": 10**9}),
+        (RequestLoggingMiddleware, {})
+    ]
+}
+
+
+async def call(app):
+    """Send one GET /ping straight through the ASGI interface"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"user-agent", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80)
+    }
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+    disconnected = asyncio.Event()
+    
+    async def receive():
+        if requests:
+            return requests.pop()
+        await disconnected.wait()  # client stays connected
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        messages.append(message)
+    
+    await app(scope, receive, send)
+    return messages
+
+
+async def bench(name, app):
+    """Best-of-ROUNDS throughput for one stack"""
+    await call(app)  # build the middleware stack
+    best = 0.0
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await call(app)
+        best = max(best, REQUESTS / (time.perf_counter() - started))
+    print(f"   {name:<30} {best:10,.0f} req/s  {1e6 / best:8.1f} µs/request")
+    return best
+
+
+def print_separator(title=""):
+    """Print a section separator"""
+    print("\n" + "=" * 80)
+    if title:
+        print(title.center(80))
+        print("=" * 80)
+    print()
+
+
+async def main():
+    """Run middleware benchmark"""
+    print_separator(f"CRMS MIDDLEWARE BENCHMARK ({REQUESTS} requests x {ROUNDS} rounds)")
+    
+    # Both stacks log the same lines; keep them out of the measurement
+    logger.setLevel(logging.WARNING)
+    
+    apps = {name: build_app(stack) for name, stack in STACKS.items()}
+    results = {name: await bench(name, app) for name, app in apps.items()}
+    
+    legacy = dict((await call(apps["BaseHTTPMiddleware stack"]))[0]["headers"])
+    pure = dict((await call(apps["Pure ASGI stack"]))[0]["headers"])
+    legacy.pop(b"x-process-time")
+    pure.pop(b"x-process-time")
+    same_headers = legacy == pure
+    
+    speedup = results["Pure ASGI stack"] / results["BaseHTTPMiddleware stack"]
+    print(f"\n   Pure ASGI speedup vs BaseHTTPMiddleware: {speedup:9.2f}x")
+    print(f"   Same response headers:                   {same_headers}")
+    
+    print_separator()
+    return same_headers
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
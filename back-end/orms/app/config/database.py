@@ -2,9 +2,12 @@
 Database Configuration
 MongoDB connection and index management
 """
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config.settings import settings
 from app.utils.logger import info, error
+from app.utils.projection import covering_index
+from app.schemas.order import ORDER_LIST_PROJECTION
 
 
 class Database:
@@ -46,6 +49,15 @@ class Database:
             cls.client.close()
             info("MongoDB connection closed")
     
+    @staticmethod
+    async def drop_other_text_indexes(collection, keep: Optional[str] = None):
+        """Drop text indexes other than `keep` (all of them when `keep` is None)"""
+        indexes = await collection.index_information()
+        for name, spec in indexes.items():
+            if name != keep and any(kind == "text" for _, kind in spec["key"]):
+                await collection.drop_index(name)
+                info(f"Dropped text index {name}")
+    
     @classmethod
     async def create_indexes(cls):
         """Create all database indexes"""
@@ -55,17 +67,32 @@ class Database:
         await cls.db.orders.create_index("userId")
         await cls.db.orders.create_index("customerId")
         await cls.db.orders.create_index("status")
-        await cls.db.orders.create_index([("orderDate", -1)])
-        await cls.db.orders.create_index([("userId", 1), ("status", 1)])
-        await cls.db.orders.create_index([("orderDate", -1), ("status", 1)])
-        await cls.db.orders.create_index([
-            ("orderId", "text"),
-            ("customerEmail", "text"),
-            ("customerName", "text")
-        ])
+        # List sorts end with the _id tiebreaker used by cursor pagination.
+        # The customer and admin order list indexes also carry every list
+        # field, so those lists are answered from the index (covered query)
+        await cls.db.orders.create_index(
+            covering_index([("orderDate", -1), ("_id", -1)], ORDER_LIST_PROJECTION)
+        )
+        await cls.db.orders.create_index(
+            covering_index([("userId", 1), ("orderDate", -1), ("_id", -1)], ORDER_LIST_PROJECTION)
+        )
+        await cls.db.orders.create_index([("userId", 1), ("status", 1), ("orderDate", -1), ("_id", -1)])
+        await cls.db.orders.create_index([("customerId", 1), ("orderDate", -1), ("_id", -1)])
+        await cls.db.orders.create_index([("status", 1), ("orderDate", -1), ("_id", -1)])
+        # Admin search (app/utils/order_search.py): order ID prefixes use the
+        # orderId index; emails and name word prefixes use these. They replace
+        # the orderId/customerEmail/customerName text index of earlier releases
+        await cls.drop_other_text_indexes(cls.db.orders)
+        await cls.db.orders.create_index([("search.email", 1), ("orderDate", -1), ("_id", -1)])
+        await cls.db.orders.create_index([("search.grams", 1), ("orderDate", -1), ("_id", -1)])
+        await cls.db.orders.create_index(
+            [("returnInfo.requestedAt", -1), ("_id", -1)],
+            partialFilterExpression={"returnInfo": {"$exists": True}}
+        )
         
         # Order items collection indexes
         await cls.db.order_items.create_index("orderId")
+        await cls.db.order_items.create_index("orderIdString")
         await cls.db.order_items.create_index("productId")
         await cls.db.order_items.create_index("returnRequested")
         
@@ -73,6 +100,7 @@ class Database:
         await cls.db.order_history.create_index("orderId")
         await cls.db.order_history.create_index([("timestamp", -1)])
         await cls.db.order_history.create_index([("orderId", 1), ("timestamp", -1)])
+        await cls.db.order_history.create_index([("orderIdString", 1), ("timestamp", 1)])
         
         # Return requests collection indexes
         await cls.db.return_requests.create_index("orderId")
@@ -80,6 +108,19 @@ class Database:
         await cls.db.return_requests.create_index("status")
         await cls.db.return_requests.create_index([("requestedAt", -1)])
 
+        # Analytics rollup collection indexes
+        await cls.db.order_daily_stats.create_index([("day", 1), ("status", 1)], unique=True)
+        await cls.db.order_daily_customer_stats.create_index([("day", 1), ("customerId", 1)], unique=True)
+
+        # Statistics outbox indexes (due-event claims, queue depth, delivered TTL)
+        await cls.db.outbox.create_index([("topic", 1), ("status", 1), ("nextAttemptAt", 1)])
+        await cls.db.outbox.create_index([("topic", 1), ("status", 1), ("createdAt", 1)])
+        await cls.db.outbox.create_index("claimId")
+        await cls.db.outbox.create_index(
+            "deliveredAt",
+            expireAfterSeconds=settings.OUTBOX_RETENTION_DAYS * 24 * 3600
+        )
+
 
 async def get_database() -> AsyncIOMotorDatabase:
     """Dependency to get database instance"""
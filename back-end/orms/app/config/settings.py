@@ -25,6 +25,7 @@ class Settings(BaseSettings):
     # JWT Configuration
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
+    JWT_CACHE_SIZE: int = 10000
     
     @property
     def SECRET_KEY(self) -> str:
@@ -41,6 +42,25 @@ class Settings(BaseSettings):
     CUSTOMER_SERVICE_URL: str
     SERVICE_API_KEY: str
     SERVICE_TIMEOUT: int = 30
+    AUTH_SERVICE_TIMEOUT: float = 10.0
+    CUSTOMER_SERVICE_TIMEOUT: float = 10.0
+    
+    # Customer profile cache (CRMS lookups by user ID). Per process: CRMS
+    # invalidations reach one worker, the TTL bounds staleness in the others
+    CUSTOMER_CACHE_SIZE: int = 10000
+    CUSTOMER_CACHE_TTL_SECONDS: float = 60.0
+    CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS: float = 30.0
+    
+    # Batch lookups (internal batch endpoints take at most 500 IDs per call)
+    BATCH_LOOKUP_CHUNK_SIZE: int = 200
+    BATCH_LOOKUP_CONCURRENCY: int = 4
+    
+    # HTTP Client Pool (shared by all outbound service clients)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP2_ENABLED: bool = False
     
     # CORS Configuration
     CORS_ORIGINS: str = '["http://localhost:3000","http://localhost:19006"]'
@@ -49,16 +69,42 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    # Filtered counts are cached this long for includeTotal=estimated
+    COUNT_CACHE_TTL_SECONDS: float = 10.0
+    COUNT_CACHE_SIZE: int = 1000
+    
+    # Statistics Outbox (CRMS statistics deltas delivered in the background)
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_MAX_ATTEMPTS: int = 20
+    OUTBOX_RETRY_BASE_DELAY: float = 5.0
+    OUTBOX_RETRY_MAX_DELAY: float = 600.0
+    OUTBOX_POLL_INTERVAL: float = 5.0
+    OUTBOX_FLUSH_DELAY: float = 0.2
+    OUTBOX_LEASE: float = 60.0
+    OUTBOX_RETENTION_DAYS: int = 7
     
     # Order Configuration
     ORDER_ID_PREFIX: str = "ORD"
     RETURN_ID_PREFIX: str = "RET"
+    ID_SEQUENCE_BLOCK_SIZE: int = 1
     ORDER_CANCELLATION_ALLOWED_STATUSES: str = '["Placed","Processing"]'
     ORDER_RETURN_ALLOWED_STATUSES: str = '["Delivered"]'
     
+    # Analytics (serve dashboards from pre-aggregated daily rollups)
+    ANALYTICS_USE_ROLLUPS: bool = False
+    
+    # Index advisor at startup: off, warn or fail
+    INDEX_ADVISOR_MODE: str = "warn"
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    # Background log writer: queued records beyond LOG_QUEUE_SIZE are dropped;
+    # INFO lines are capped per call site (0 = no cap) and can be sampled
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_INFO_RATE_LIMIT: float = 50.0
+    LOG_INFO_BURST: int = 100
+    LOG_INFO_SAMPLE_RATE: float = 1.0
     
     @property
     def cors_origins_list(self) -> List[str]:
@@ -2,60 +2,62 @@
 Authentication Middleware for Order Management Service
 Handles JWT token validation and user context extraction
 """
-from fastapi import Request, HTTPException, status
+from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from jose import jwt, JWTError
-from app.config.settings import settings
-from app.utils.logger import info, error
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from jose import JWTError
+from app.utils.logger import debug, error
+from app.utils.token_cache import decode_access_token
 from typing import Optional
 
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
+class AuthenticationMiddleware:
     """
-    Middleware to validate JWT tokens and extract user information
-    Adds user context to request.state for use in route handlers
+    Pure ASGI middleware to validate JWT tokens and extract user information
+    Adds user context to request.state (scope["state"]) for use in route handlers
     """
 
     # Paths that don't require authentication
-    PUBLIC_PATHS = [
+    PUBLIC_PATHS = frozenset([
         "/",
         "/health",
         "/docs",
         "/redoc",
         "/openapi.json",
-    ]
+    ])
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Process each request to validate authentication
         """
-        # Allow public paths without authentication
-        if request.url.path in self.PUBLIC_PATHS:
-            return await call_next(request)
-
-        # Allow OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        # Allow non-HTTP scopes, public paths and OPTIONS requests (CORS preflight)
+        if (
+            scope["type"] != "http"
+            or scope["path"] in self.PUBLIC_PATHS
+            or scope["method"] == "OPTIONS"
+        ):
+            await self.app(scope, receive, send)
+            return
 
         # Initialize user context
-        request.state.user = None
-        request.state.user_id = None
-        request.state.role = None
+        state = scope.setdefault("state", {})
+        state["user"] = None
+        state["user_id"] = None
+        state["role"] = None
 
         # Extract token from Authorization header
-        auth_header = request.headers.get("Authorization")
+        auth_header = Headers(scope=scope).get("Authorization")
         
         if auth_header and auth_header.startswith("Bearer "):
             token = auth_header.split(" ")[1]
             
             try:
-                # Decode and validate JWT token
-                payload = jwt.decode(
-                    token,
-                    settings.SECRET_KEY,
-                    algorithms=[settings.ALGORITHM]
-                )
+                # Decode and validate JWT token (cached per token until exp)
+                payload = decode_access_token(token)
                 
                 # Extract user information from token
                 # ATHS uses 'userId' not 'sub'
@@ -65,7 +67,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 
                 if user_id is None:
                     error(f"Invalid token payload: missing 'userId' or 'sub' field")
-                    return JSONResponse(
+                    response = JSONResponse(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         content={
                             "success": False,
@@ -73,24 +75,26 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                             "data": None
                         }
                     )
+                    await response(scope, receive, send)
+                    return
                 
                 # Normalize role to lowercase for consistency
                 normalized_role = role.lower() if role else None
                 
                 # Store user context in request state
-                request.state.user = {
+                state["user"] = {
                     "userId": user_id,
                     "role": normalized_role,
                     "email": email
                 }
-                request.state.user_id = user_id
-                request.state.role = normalized_role
+                state["user_id"] = user_id
+                state["role"] = normalized_role
                 
-                info(f"Authenticated user: {user_id} with role: {role}")
+                debug("Authenticated user: %s with role: %s", user_id, role)
                 
             except JWTError as e:
                 error(f"JWT validation error: {str(e)}")
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     content={
                         "success": False,
@@ -98,9 +102,11 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                         "data": None
                     }
                 )
+                await response(scope, receive, send)
+                return
             except Exception as e:
                 error(f"Authentication error: {str(e)}")
-                return JSONResponse(
+                response = JSONResponse(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     content={
                         "success": False,
@@ -108,10 +114,11 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                         "data": None
                     }
                 )
+                await response(scope, receive, send)
+                return
 
         # Continue to route handler
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
 def get_current_user_from_request(request: Request) -> Optional[dict]:
@@ -0,0 +1,67 @@
+"""
+Backfill Item Counts Migration
+Populate the denormalized itemCount field on orders created before it existed
+
+Run from the service root:
+    python -m app.migrations.backfill_item_counts
+"""
+import asyncio
+from pymongo import UpdateOne
+from app.config.database import Database
+from app.utils.item_summary import get_item_summaries
+from app.utils.logger import info
+
+BATCH_SIZE = 500
+
+
+async def backfill_item_counts(db, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Set itemCount on every order that is missing it
+    
+    Args:
+        db: Database instance
+        batch_size: Number of orders resolved per aggregation
+    
+    Returns:
+        Number of orders updated
+    """
+    updated = 0
+    
+    while True:
+        cursor = db.orders.find(
+            {"itemCount": {"$exists": False}},
+            {"orderId": 1}
+        ).limit(batch_size)
+        orders = await cursor.to_list(length=batch_size)
+        
+        if not orders:
+            break
+        
+        summaries = await get_item_summaries(db, [order["orderId"] for order in orders])
+        operations = [
+            UpdateOne(
+                {"_id": order["_id"]},
+                {"$set": {"itemCount": summaries[order["orderId"]]["itemCount"]}}
+            )
+            for order in orders
+        ]
+        
+        result = await db.orders.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+        info(f"Backfilled itemCount for {updated} orders so far")
+    
+    return updated
+
+
+async def main():
+    """Run the migration against the configured database"""
+    await Database.connect_db()
+    try:
+        updated = await backfill_item_counts(Database.db)
+        info(f"✅ itemCount backfill complete: {updated} orders updated")
+    finally:
+        await Database.disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Backfill Search Fields Migration
+Populate the `search` subdocument used by admin order search on orders
+created before it existed
+
+Run from the service root:
+    python -m app.migrations.backfill_search_fields
+"""
+import asyncio
+from pymongo import UpdateOne
+from app.config.database import Database
+from app.utils.order_search import search_fields
+from app.utils.logger import info
+
+BATCH_SIZE = 1000
+
+
+async def backfill_search_fields(db, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Set `search` on every order that is missing it
+    
+    Args:
+        db: Database instance
+        batch_size: Number of orders updated per bulk write
+    
+    Returns:
+        Number of orders updated
+    """
+    updated = 0
+    
+    while True:
+        cursor = db.orders.find(
+            {"search": {"$exists": False}},
+            {"customerName": 1, "customerEmail": 1}
+        ).limit(batch_size)
+        orders = await cursor.to_list(length=batch_size)
+        
+        if not orders:
+            break
+        
+        operations = [
+            UpdateOne(
+                {"_id": order["_id"]},
+                {"$set": {"search": search_fields(order.get("customerName"), order.get("customerEmail"))}}
+            )
+            for order in orders
+        ]
+        
+        result = await db.orders.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+        info("Backfilled search fields for %s orders so far", updated)
+    
+    return updated
+
+
+async def main():
+    """Run the migration against the configured database"""
+    await Database.connect_db()
+    try:
+        updated = await backfill_search_fields(Database.db)
+        info("✅ Search field backfill complete: %s orders updated", updated)
+    finally:
+        await Database.disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+"""
+Rebuild Order Rollups Migration
+Recompute the daily analytics rollups from the orders collection
+
+Run from the service root (once after deploying, or to repair drift):
+    python -m app.migrations.rebuild_order_rollups [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--compact]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from app.config.database import Database
+from app.utils.order_rollups import rebuild_rollups, compact_rollups
+from app.utils.logger import info
+
+
+def parse_day(value: str) -> datetime:
+    """Parse a YYYY-MM-DD argument"""
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+async def main(args: argparse.Namespace):
+    """Run the migration against the configured database"""
+    await Database.connect_db()
+    try:
+        result = await rebuild_rollups(Database.db, from_day=args.from_day, to_day=args.to_day)
+        info(f"✅ Rollup rebuild complete: {result}")
+        
+        if args.compact:
+            await compact_rollups(Database.db)
+    finally:
+        await Database.disconnect_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild daily order analytics rollups")
+    parser.add_argument("--from", dest="from_day", type=parse_day, help="First day to rebuild (inclusive)")
+    parser.add_argument("--to", dest="to_day", type=parse_day, help="Last day to rebuild (inclusive)")
+    parser.add_argument("--compact", action="store_true", help="Also remove empty buckets")
+    asyncio.run(main(parser.parse_args()))
@@ -4,6 +4,7 @@ Database model for orders collection
 """
 from datetime import datetime
 from typing import Optional
+from app.utils.order_search import search_fields
 
 
 class Order:
@@ -27,7 +28,8 @@ class Order:
         tax: float,
         total_amount: float,
         status: str = "Placed",
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        item_count: int = 0
     ) -> dict:
         """
         Create order document for MongoDB insertion
@@ -46,6 +48,7 @@ class Order:
             total_amount: Total order amount (subtotal - discount + tax)
             status: Order status (default: Placed)
             notes: Optional order notes
+            item_count: Number of order items (denormalized for list views)
             
         Returns:
             Order document dictionary
@@ -65,12 +68,14 @@ class Order:
             "tax": tax,
             "totalAmount": total_amount,
             "status": status,
+            "itemCount": item_count,
             "orderDate": now,
             "estimatedDeliveryDate": None,
             "actualDeliveryDate": None,
             "cancellationInfo": None,
             "returnInfo": None,
             "notes": notes,
+            "search": search_fields(customer_name, customer_email),
             "createdAt": now,
             "updatedAt": now
         }
@@ -3,6 +3,7 @@ Admin Order Management Routes
 Handles administrative order operations (list all, update status, analytics)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 from bson import ObjectId
@@ -12,16 +13,25 @@ from app.dependencies.auth import require_admin
 from app.schemas.order import (
     UpdateOrderStatusRequest,
     OrderDetailResponse,
-    OrderListItemResponse
+    OrderListItemResponse,
+    ORDER_LIST_PROJECTION
 )
 from app.schemas.response import APIResponse, PaginatedResponse
 from app.models.order import Order
 from app.models.order_history import OrderHistory
 from app.utils.logger import info, error
-from app.utils.pagination import calculate_pagination, create_paginated_response
-from app.utils.validators import sanitize_search_query
+from app.utils.pagination import calculate_pagination, attach_cursors, create_paginated_response
+from app.utils.cursor import decode_cursor, fetch_page
+from app.utils.json_response import FastJSONResponse, trusted_response
+from app.utils.counting import TotalMode, count_total
+from app.utils.order_search import SearchSort, parse_search, search_filter, fetch_relevance_page, relevance_total, SEARCH_WINDOW
+from app.utils.item_summary import get_item_counts
+from app.utils.analytics import build_order_analytics_pipeline, format_order_analytics
+from app.utils.order_rollups import get_rollup_analytics
+from app.utils.order_writes import apply_status_change
+from app.config.settings import settings
 
-router = APIRouter(prefix="/api/admin/orders", tags=["Admin - Orders"])
+router = APIRouter(prefix="/api/admin/orders", tags=["Admin - Orders"], default_response_class=FastJSONResponse)
 
 
 @router.get(
@@ -34,9 +44,12 @@ async def get_all_orders(
     current_user: Dict = Depends(require_admin),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    include_total: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     order_status: Optional[str] = Query(None, description="Filter by order status"),
     customer_id: Optional[str] = Query(None, description="Filter by customer ID"),
-    search: Optional[str] = Query(None, description="Search in order ID, customer name, email"),
+    search: Optional[str] = Query(None, description="Search by order ID or ID prefix, customer email or email prefix, or words / word prefixes of the customer name"),
+    search_sort: SearchSort = Query(SearchSort.RELEVANCE, description="Order of search results: relevance (exact matches first, newest first within a tier; page numbers) or date (newest first; supports cursors)"),
     from_date: Optional[str] = Query(None, description="Filter orders from this date (YYYY-MM-DD)"),
     to_date: Optional[str] = Query(None, description="Filter orders to this date (YYYY-MM-DD)"),
     db = Depends(get_database)
@@ -44,15 +57,19 @@ async def get_all_orders(
     """
     Get a paginated list of all orders (Admin only).
     
-    - Supports pagination
+    - Supports pagination (page numbers or cursors)
+    - Total count exact, estimated or skipped (include_total)
     - Filter by order status
     - Filter by customer ID
     - Filter by date range
-    - Search by order ID, customer name, or email
-    - Sorted by order date (newest first)
+    - Search by order ID, customer email or customer name words (index-backed
+      exact and prefix matching), ordered by relevance or date
+    - Sorted by order date (newest first) when not searching
     
     Returns paginated order list with summary information.
     """
+    keyset_cursor = decode_cursor(cursor)
+    
     try:
         user_id = current_user.get("userId")
         
@@ -94,24 +111,46 @@ async def get_all_orders(
                     )
             query["orderDate"] = date_query
         
-        # Add search filter
-        if search:
-            sanitized_search = sanitize_search_query(search)
-            query["$or"] = [
-                {"orderId": {"$regex": sanitized_search, "$options": "i"}},
-                {"customerName": {"$regex": sanitized_search, "$options": "i"}},
-                {"customerEmail": {"$regex": sanitized_search, "$options": "i"}}
-            ]
+        # Add search (index-backed match on order ID, email or name words)
+        search_query = parse_search(search)
+        sort = [("orderDate", -1)]
+        if search_query:
+            list_query = search_filter(query, search_query)
+            sort = search_query.date_sort
+        elif search and search.strip():
+            # Nothing searchable in the text (e.g. only punctuation)
+            list_query = {"_id": {"$in": []}}
+        else:
+            list_query = query
         
-        # Get total count
-        total = await db.orders.count_documents(query)
+        # Get total count (exact, estimated or skipped); relevance pages
+        # never reach past SEARCH_WINDOW, so that count stops just beyond it
+        by_relevance = search_query and search_sort == SearchSort.RELEVANCE and keyset_cursor is None
+        total = await count_total(
+            db.orders, list_query, include_total, limit=SEARCH_WINDOW + 1 if by_relevance else None
+        )
         
-        # Calculate pagination
-        skip, pagination_meta = calculate_pagination(page, page_size, total)
+        if by_relevance:
+            # Relevance order: pages are addressed by number
+            total_items, total_exact = relevance_total(total.total, total.exact)
+            skip, pagination_meta = calculate_pagination(page, page_size, total_items, total_exact)
+            result = await fetch_relevance_page(
+                db.orders, query, search_query, skip, page_size, projection=ORDER_LIST_PROJECTION
+            )
+        else:
+            # Calculate pagination
+            skip, pagination_meta = calculate_pagination(page, page_size, total.total, total.exact)
+        
+            # Fetch orders (by cursor when given, otherwise by page)
+            result = await fetch_page(
+                db.orders, list_query, sort, page_size, skip=skip, cursor=keyset_cursor,
+                projection=ORDER_LIST_PROJECTION
+            )
+        orders = result.docs
+        attach_cursors(pagination_meta, result)
         
-        # Fetch orders
-        cursor = db.orders.find(query).sort("orderDate", -1).skip(skip).limit(page_size)
-        orders = await cursor.to_list(length=page_size)
+        # Resolve item counts for the whole page in one round-trip
+        item_counts = await get_item_counts(db, orders)
         
         # Build response items
         items = [
@@ -126,17 +165,18 @@ async def get_all_orders(
                 orderDate=order["orderDate"],
                 estimatedDeliveryDate=order.get("estimatedDeliveryDate"),
                 actualDeliveryDate=order.get("actualDeliveryDate"),
-                itemCount=await db.order_items.count_documents({"orderIdString": order["orderId"]})
+                itemCount=item_counts.get(order["orderId"], 0)
             )
             for order in orders
         ]
         
-        info(f"Found {total} orders (admin query)")
+        info(f"Found {total.total} orders (admin query)")
         
-        return create_paginated_response(
+        # Items were validated as they were built; skip the response_model pass
+        return trusted_response(create_paginated_response(
             items=items,
             pagination=pagination_meta
-        )
+        ))
         
     except HTTPException:
         raise
@@ -208,18 +248,6 @@ async def update_order_status(
         elif new_status == "Delivered":
             update_doc["actualDeliveryDate"] = datetime.utcnow()
         
-        # Update order
-        result = await db.orders.update_one(
-            {"orderId": order_id},
-            {"$set": update_doc}
-        )
-        
-        if result.modified_count == 0:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update order status"
-            )
-        
         # Create order history entry
         history_doc = OrderHistory.create_history_entry(
             order_id=order["_id"],
@@ -231,14 +259,20 @@ async def update_order_status(
             changed_by_name=admin_name,
             notes=status_update.notes or f"Status updated to {new_status} by admin"
         )
-        await db.order_history.insert_one(history_doc)
         
-        info(f"Order status updated: {order_id} from {previous_status} to {new_status}")
+        # Update order (history and rollups follow in one wave) while reading its items
+        updated_order, items = await asyncio.gather(
+            apply_status_change(db, order, new_status, update_doc, history_doc),
+            db.order_items.find({"orderIdString": order_id}).to_list(length=None)
+        )
+        
+        if updated_order is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Order was updated by another request. Please refresh and try again."
+            )
         
-        # Fetch updated order with items
-        updated_order = await db.orders.find_one({"orderId": order_id})
-        items_cursor = db.order_items.find({"orderIdString": order_id})
-        items = await items_cursor.to_list(length=None)
+        info(f"Order status updated: {order_id} from {previous_status} to {new_status}")
         
         # Build response
         response_data = OrderDetailResponse(
@@ -307,6 +341,8 @@ async def get_order_analytics(
     current_user: Dict = Depends(require_admin),
     from_date: Optional[str] = Query(None, description="Analytics from this date (YYYY-MM-DD)"),
     to_date: Optional[str] = Query(None, description="Analytics to this date (YYYY-MM-DD)"),
+    allow_disk_use: bool = Query(False, description="Let MongoDB spill to disk for very large (multi-year) ranges"),
+    use_rollups: Optional[bool] = Query(None, description="Read from daily rollups instead of orders (default: ANALYTICS_USE_ROLLUPS)"),
     db = Depends(get_database)
 ):
     """
@@ -318,6 +354,11 @@ async def get_order_analytics(
     - Average order value
     - Orders by date range
     
+    All sections are computed by one server-side $facet aggregation, so
+    worker memory does not grow with the number of orders in range. With
+    rollups enabled they are read from the pre-aggregated daily stats
+    instead (one small document per day and status).
+    
     Returns comprehensive analytics data.
     """
     try:
@@ -350,79 +391,28 @@ async def get_order_analytics(
                     )
             date_filter["orderDate"] = date_query
         
-        # Get all orders for analytics (excluding cancelled for revenue)
-        all_orders_cursor = db.orders.find(date_filter)
-        all_orders = await all_orders_cursor.to_list(length=None)
-        
-        # Calculate metrics
-        total_orders = len(all_orders)
-        
-        # Revenue metrics (exclude cancelled orders)
-        active_orders = [o for o in all_orders if o["status"] != "Cancelled"]
-        total_revenue = sum(o["totalAmount"] for o in active_orders)
-        average_order_value = total_revenue / len(active_orders) if active_orders else 0
-        
-        # Status breakdown
-        status_breakdown = {}
-        for order in all_orders:
-            order_status = order["status"]
-            status_breakdown[order_status] = status_breakdown.get(order_status, 0) + 1
-        
-        # Top customers (by order count)
-        customer_orders = {}
-        for order in all_orders:
-            customer_id = order["customerId"]
-            if customer_id not in customer_orders:
-                customer_orders[customer_id] = {
-                    "customerId": customer_id,
-                    "customerName": order["customerName"],
-                    "orderCount": 0,
-                    "totalSpent": 0
-                }
-            customer_orders[customer_id]["orderCount"] += 1
-            if order["status"] != "Cancelled":
-                customer_orders[customer_id]["totalSpent"] += order["totalAmount"]
-        
-        top_customers = sorted(
-            customer_orders.values(),
-            key=lambda x: x["orderCount"],
-            reverse=True
-        )[:10]
-        
         # Daily order trend (last 30 days if no date filter)
-        if not from_date and not to_date:
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_orders = [o for o in all_orders if o["orderDate"] >= thirty_days_ago]
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        trend_since = thirty_days_ago if not from_date and not to_date else None
+        
+        if use_rollups if use_rollups is not None else settings.ANALYTICS_USE_ROLLUPS:
+            # Read pre-aggregated daily buckets
+            analytics_data = await get_rollup_analytics(db, date_filter, trend_since=trend_since)
         else:
-            recent_orders = all_orders
-        
-        daily_orders = {}
-        for order in recent_orders:
-            date_key = order["orderDate"].strftime("%Y-%m-%d")
-            if date_key not in daily_orders:
-                daily_orders[date_key] = {"date": date_key, "count": 0, "revenue": 0}
-            daily_orders[date_key]["count"] += 1
-            if order["status"] != "Cancelled":
-                daily_orders[date_key]["revenue"] += order["totalAmount"]
-        
-        daily_trend = sorted(daily_orders.values(), key=lambda x: x["date"])
-        
-        analytics_data = {
-            "summary": {
-                "totalOrders": total_orders,
-                "totalRevenue": round(total_revenue, 2),
-                "averageOrderValue": round(average_order_value, 2),
-                "activeOrders": len(active_orders)
-            },
-            "statusBreakdown": status_breakdown,
-            "topCustomers": top_customers,
-            "dailyTrend": daily_trend,
-            "dateRange": {
-                "from": from_date or (thirty_days_ago.strftime("%Y-%m-%d") if not from_date and not to_date else None),
-                "to": to_date or datetime.utcnow().strftime("%Y-%m-%d")
-            }
+            # Compute every section server-side in a single aggregation
+            pipeline = build_order_analytics_pipeline(date_filter, trend_since=trend_since)
+            cursor = db.orders.aggregate(pipeline, allowDiskUse=allow_disk_use)
+            results = await cursor.to_list(length=1)
+            analytics_data = format_order_analytics(results[0] if results else {})
+        
+        analytics_data["dateRange"] = {
+            "from": from_date or (thirty_days_ago.strftime("%Y-%m-%d") if not from_date and not to_date else None),
+            "to": to_date or datetime.utcnow().strftime("%Y-%m-%d")
         }
         
+        total_orders = analytics_data["summary"]["totalOrders"]
+        total_revenue = analytics_data["summary"]["totalRevenue"]
+        
         info(f"Analytics generated: {total_orders} orders, ${total_revenue:.2f} revenue")
         
         return APIResponse(
@@ -16,13 +16,20 @@ from app.models.order_history import OrderHistory
 from app.schemas.order import (
     ReturnReviewRequest,
     ReturnListItemResponse,
-    ReturnDetailResponse
+    ReturnDetailResponse,
+    RETURN_LIST_PROJECTION
 )
-from app.services.customer_service import get_customer_service_client
+from app.utils.item_summary import get_item_counts
+from app.utils.cursor import decode_cursor, fetch_page
+from app.utils.json_response import FastJSONResponse, trusted_response
+from app.utils.counting import TotalMode, count_total
+from app.utils.order_writes import apply_status_change
+from app.utils.outbox import statistics_outbox
 
 router = APIRouter(
     prefix="/api/admin/returns",
-    tags=["Admin Returns"]
+    tags=["Admin Returns"],
+    default_response_class=FastJSONResponse
 )
 
 
@@ -30,6 +37,8 @@ router = APIRouter(
 async def get_all_returns(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    include_total: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     status: Optional[str] = Query(None, description="Filter by return status (Pending, Approved, Rejected)"),
     customer_id: Optional[str] = Query(None, description="Filter by customer ID"),
     order_id: Optional[str] = Query(None, description="Filter by order ID"),
@@ -40,9 +49,12 @@ async def get_all_returns(
     _: None = Depends(require_admin)
 ):
     """
-    Get all return requests with filtering and pagination
+    Get all return requests with filtering and pagination (page numbers or cursors)
+    Total count can be exact, estimated or skipped (include_total)
     Admin only access
     """
+    keyset_cursor = decode_cursor(cursor)
+    
     try:
         # Build filter query
         filter_query = {"returnInfo": {"$exists": True}}
@@ -78,23 +90,34 @@ async def get_all_returns(
             if date_filter:
                 filter_query["returnInfo.requestedAt"] = date_filter
         
-        # Count total matching returns
-        total_returns = await db.orders.count_documents(filter_query)
+        # Count total matching returns (exact, estimated or skipped)
+        total = await count_total(db.orders, filter_query, include_total)
+        total_returns = total.total
         
         # Calculate pagination
         skip = (page - 1) * page_size
-        total_pages = (total_returns + page_size - 1) // page_size
+        total_pages = (total_returns + page_size - 1) // page_size if total_returns is not None else None
+        
+        # Fetch returns (by cursor when given, otherwise by page)
+        result = await fetch_page(
+            db.orders,
+            filter_query,
+            [("returnInfo.requestedAt", -1)],
+            page_size,
+            skip=skip,
+            cursor=keyset_cursor,
+            projection=RETURN_LIST_PROJECTION
+        )
+        orders = result.docs
         
-        # Fetch returns with pagination
-        orders_cursor = db.orders.find(filter_query).sort("returnInfo.requestedAt", -1).skip(skip).limit(page_size)
-        orders = await orders_cursor.to_list(length=page_size)
+        # Resolve item counts for the whole page in one round-trip
+        item_counts = await get_item_counts(db, orders)
         
         # Build response items
         return_items = []
         for order in orders:
             try:
-                # Get item count for this order
-                item_count = await db.order_items.count_documents({"orderId": order["_id"]})
+                item_count = item_counts.get(order.get("orderId"), 0)
                 
                 return_info = order.get("returnInfo") or {}
                 
@@ -104,7 +127,7 @@ async def get_all_returns(
                     customerName=order.get("customerName") or "Unknown",
                     customerEmail=order.get("customerEmail") or "",
                     orderDate=order.get("orderDate") or datetime.utcnow(),
-                    orderStatus=order.get("orderStatus") or "Unknown",
+                    orderStatus=order.get("status") or "Unknown",
                     totalAmount=order.get("totalAmount") or 0.0,
                     returnStatus=return_info.get("status") or "Pending",
                     returnRequestedAt=return_info.get("requestedAt") or datetime.utcnow(),
@@ -115,15 +138,23 @@ async def get_all_returns(
                 print(f"ERROR processing order {order.get('_id')}: {str(item_error)}")
                 continue  # Skip malformed orders
         
-        return {
+        # Items were validated as they were built; skip the response_model pass
+        return trusted_response({
             "returns": return_items,
             "pagination": {
                 "currentPage": page,
                 "pageSize": page_size,
                 "totalReturns": total_returns,
-                "totalPages": total_pages
+                "totalPages": total_pages,
+                "totalExact": total.exact,
+                "hasNextPage": result.has_next,
+                "hasPreviousPage": result.has_previous,
+                "nextCursor": result.next_cursor,
+                "prevCursor": result.prev_cursor
             }
-        }
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ERROR in get_all_returns: {str(e)}")
         import traceback
@@ -215,7 +246,7 @@ async def review_return_request(
     
     When approved:
     - Updates order status to "Returned"
-    - Updates CRMS statistics (decrements order count and value)
+    - Queues the CRMS statistics update (decrements order count and value)
     - Creates order history entry
     
     When rejected:
@@ -243,7 +274,8 @@ async def review_return_request(
         # Update return info
         current_time = datetime.utcnow()
         new_return_status = "Approved" if review_request.approve else "Rejected"
-        new_order_status = "Returned" if review_request.approve else order.get("orderStatus", "Unknown")
+        previous_status = order.get("status", "Unknown")
+        new_order_status = "Returned" if review_request.approve else previous_status
         
         update_data = {
             "returnInfo.status": new_return_status,
@@ -255,26 +287,15 @@ async def review_return_request(
         
         # If approved, update order status
         if review_request.approve:
-            update_data["orderStatus"] = "Returned"
+            update_data["status"] = "Returned"
             update_data["updatedAt"] = current_time
         
-        # Update order
-        result = await db.orders.update_one(
-            {"_id": order["_id"]},
-            {"$set": update_data}
-        )
-        
-        if result.modified_count == 0:
-            raise HTTPException(status_code=500, detail="Failed to update return request")
-        
         # Create order history entry
-        previous_status = order.get("orderStatus", "Unknown")
         history_notes = f"Return request {new_return_status.lower()}"
         if review_request.notes:
             history_notes += f": {review_request.notes}"
         
-        await OrderHistory.create_history_entry(
-            db=db,
+        history_doc = OrderHistory.create_history_entry(
             order_id=order["_id"],
             order_id_string=order.get("orderId", ""),
             previous_status=previous_status,
@@ -285,29 +306,30 @@ async def review_return_request(
             notes=history_notes
         )
         
-        # If approved, update CRMS statistics (decrement like cancellation)
+        # If approved, queue the CRMS statistics update (decrement like cancellation)
+        follow_ups = []
         if review_request.approve:
-            try:
-                # Get customer service client
-                customer_service = get_customer_service_client()
-                
-                # Get customer profile
-                customer = await customer_service.get_customer_by_user_id(order.get("customerId"))
-                
-                if customer:
-                    # Update statistics with negative value to decrement
-                    await customer_service.update_order_statistics(
-                        customer=customer,
-                        order_value=-order.get("totalAmount", 0.0),  # Negative to decrement
-                        increment_order_count=False,
-                        decrement_order_count=True  # Decrement the order count
-                    )
-            except Exception as e:
-                # Log error but don't fail the return approval
-                print(f"Warning: Failed to update CRMS statistics for return approval: {str(e)}")
+            follow_ups.append(lambda: statistics_outbox.publish(
+                order.get("customerId"),
+                {"totalOrders": -1, "totalOrderValue": -order.get("totalAmount", 0.0)},
+                db=db
+            ))
+        
+        # Update order unless another admin reviewed it meanwhile; history,
+        # rollups (only moved on approval) and the statistics update follow
+        # in one wave
+        updated_order = await apply_status_change(
+            db,
+            order,
+            new_order_status,
+            update_data,
+            history_doc,
+            expected={"returnInfo.status": "Pending"},
+            follow_ups=follow_ups
+        )
         
-        # Fetch updated order
-        updated_order = await db.orders.find_one({"_id": order["_id"]})
+        if updated_order is None:
+            raise HTTPException(status_code=409, detail="Return request was reviewed by another request")
         
         return {
             "message": f"Return request {new_return_status.lower()} successfully",
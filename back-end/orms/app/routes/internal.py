@@ -4,12 +4,15 @@ Service-to-service API endpoints for CRMS and other internal services
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from bson import ObjectId
 
 from app.config.database import get_database
 from app.dependencies.service_auth import verify_service_api_key
+from app.utils.item_summary import get_item_counts
+from app.utils.customer_cache import customer_cache
 
 
 router = APIRouter(
@@ -18,6 +21,46 @@ router = APIRouter(
 )
 
 
+class CustomerCacheInvalidation(BaseModel):
+    """Customer whose cached profile changed in CRMS"""
+    userId: Optional[str] = Field(None, description="User ID of the customer")
+    customerId: Optional[str] = Field(None, description="Customer ID")
+
+
+class OrderBatchLookup(BaseModel):
+    """Orders to look up in one call"""
+    orderIds: List[str] = Field(..., min_length=1, max_length=500, description="Order IDs (at most 500)")
+
+
+def order_details(order: dict, items: List[dict]) -> Dict:
+    """Order details returned to internal services"""
+    return {
+        "orderId": order.get("orderId", ""),
+        "customerId": order.get("customerId", ""),
+        "customerName": order.get("customerName", ""),
+        "customerEmail": order.get("customerEmail", ""),
+        "orderDate": order.get("orderDate"),
+        "status": order.get("status", "Unknown"),
+        "totalAmount": order.get("totalAmount", 0.0),
+        "items": [
+            {
+                "productId": item.get("productId", ""),
+                "productName": item.get("productName", ""),
+                "sku": item.get("sku", ""),
+                "quantity": item.get("quantity", 0),
+                "unitPrice": item.get("unitPrice", 0.0),
+                "totalPrice": item.get("totalPrice", 0.0)
+            }
+            for item in items
+        ],
+        "deliveryAddress": order.get("deliveryAddress"),
+        "estimatedDeliveryDate": order.get("estimatedDeliveryDate"),
+        "actualDeliveryDate": order.get("actualDeliveryDate"),
+        "createdAt": order.get("createdAt"),
+        "updatedAt": order.get("updatedAt")
+    }
+
+
 @router.get("/customers/{customer_id}/orders", response_model=Dict)
 async def get_customer_orders(
     customer_id: str,
@@ -108,10 +151,12 @@ async def get_customer_orders(
         recent_orders_cursor = db.orders.find(filter_query).sort("orderDate", -1).limit(limit)
         recent_orders_docs = await recent_orders_cursor.to_list(length=limit)
         
+        # Resolve item counts for all recent orders in one round-trip
+        item_counts = await get_item_counts(db, recent_orders_docs)
+        
         recent_orders = []
         for order in recent_orders_docs:
-            # Get item count for this order
-            item_count = await db.order_items.count_documents({"orderId": order["_id"]})
+            item_count = item_counts.get(order.get("orderId"), 0)
             
             recent_orders.append({
                 "orderId": order.get("orderId", ""),
@@ -169,32 +214,7 @@ async def get_order_by_id(
         items_cursor = db.order_items.find({"orderId": order["_id"]})
         items = await items_cursor.to_list(length=None)
         
-        order_items = []
-        for item in items:
-            order_items.append({
-                "productId": item.get("productId", ""),
-                "productName": item.get("productName", ""),
-                "sku": item.get("sku", ""),
-                "quantity": item.get("quantity", 0),
-                "unitPrice": item.get("unitPrice", 0.0),
-                "totalPrice": item.get("totalPrice", 0.0)
-            })
-        
-        return {
-            "orderId": order.get("orderId", ""),
-            "customerId": order.get("customerId", ""),
-            "customerName": order.get("customerName", ""),
-            "customerEmail": order.get("customerEmail", ""),
-            "orderDate": order.get("orderDate"),
-            "status": order.get("status", "Unknown"),
-            "totalAmount": order.get("totalAmount", 0.0),
-            "items": order_items,
-            "deliveryAddress": order.get("deliveryAddress"),
-            "estimatedDeliveryDate": order.get("estimatedDeliveryDate"),
-            "actualDeliveryDate": order.get("actualDeliveryDate"),
-            "createdAt": order.get("createdAt"),
-            "updatedAt": order.get("updatedAt")
-        }
+        return order_details(order, items)
         
     except HTTPException:
         raise
@@ -205,6 +225,77 @@ async def get_order_by_id(
         raise HTTPException(status_code=500, detail=f"Error retrieving order: {str(e)}")
 
 
+@router.post("/orders/batch", response_model=Dict)
+async def get_orders_by_ids(
+    request: OrderBatchLookup,
+    db=Depends(get_database),
+    _: bool = Depends(verify_service_api_key)
+):
+    """
+    Get details of many orders in one call
+    
+    **Authentication**: Requires valid service API key (X-Service-API-Key header)
+    
+    **Purpose**: Replaces one GET /orders/{order_id} call per order when a
+    service shows a page of orders
+    
+    Returns:
+    - orders: Order details keyed by order ID (same shape as GET /orders/{order_id})
+    - notFound: Requested order IDs that matched no order
+    """
+    order_ids = list(dict.fromkeys(request.orderIds))
+    try:
+        orders = await db.orders.find({"orderId": {"$in": order_ids}}).to_list(length=None)
+        
+        # Items of every order in one query
+        items_by_order: Dict[ObjectId, List[dict]] = {order["_id"]: [] for order in orders}
+        if orders:
+            items_cursor = db.order_items.find({"orderId": {"$in": list(items_by_order)}})
+            async for item in items_cursor:
+                items_by_order[item["orderId"]].append(item)
+        
+        found = {
+            order["orderId"]: order_details(order, items_by_order[order["_id"]])
+            for order in orders
+        }
+        return {
+            "orders": found,
+            "notFound": [order_id for order_id in order_ids if order_id not in found]
+        }
+    
+    except Exception as e:
+        print(f"ERROR in get_orders_by_ids: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error retrieving orders: {str(e)}")
+
+
+@router.post("/customer-cache/invalidate", response_model=Dict)
+async def invalidate_customer_cache(
+    request: CustomerCacheInvalidation,
+    _: bool = Depends(verify_service_api_key)
+):
+    """
+    Drop a customer's cached profile
+    
+    **Authentication**: Requires valid service API key (X-Service-API-Key header)
+    
+    **Purpose**: Called by CRMS when a customer is created or their status,
+    type or profile changes, so the next lookup reads the new profile
+    
+    **Scope**: Clears the cache of the worker process that receives the
+    call only; other workers and replicas pick up the change when their
+    entry expires (CUSTOMER_CACHE_TTL_SECONDS)
+    """
+    if not request.userId and not request.customerId:
+        raise HTTPException(status_code=400, detail="userId or customerId is required")
+    
+    invalidated = customer_cache.invalidate(user_id=request.userId, customer_id=request.customerId)
+    return {
+        "invalidated": invalidated,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @router.get("/health", response_model=Dict)
 async def internal_health_check(
     db=Depends(get_database),
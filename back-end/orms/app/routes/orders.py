@@ -3,9 +3,9 @@ Order Management Routes
 Handles customer order operations (create, list, view)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
 from typing import Dict, Optional, List
 from datetime import datetime
-from bson import ObjectId
 
 from app.config.database import get_database
 from app.dependencies.auth import get_current_user, require_customer, require_customer_or_admin
@@ -14,19 +14,27 @@ from app.schemas.order import (
     CancelOrderRequest,
     RequestReturnRequest,
     OrderDetailResponse,
-    OrderListItemResponse
+    OrderListItemResponse,
+    ORDER_LIST_PROJECTION
 )
 from app.schemas.response import APIResponse, PaginatedResponse
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.order_history import OrderHistory
 from app.utils.logger import info, error
-from app.utils.pagination import calculate_pagination, create_paginated_response
+from app.utils.pagination import calculate_pagination, attach_cursors, create_paginated_response
+from app.utils.cursor import decode_cursor, fetch_page
+from app.utils.json_response import FastJSONResponse, trusted_response
+from app.utils.counting import TotalMode, count_total
 from app.utils.validators import validate_object_id, sanitize_search_query
 from app.utils.order_id_generator import generate_order_id
+from app.utils.item_summary import get_item_counts
+from app.utils.order_rollups import record_order_created
+from app.utils.outbox import statistics_outbox
+from app.utils.order_writes import apply_status_change, item_updates
 from app.services.customer_service import get_customer_service_client
 
-router = APIRouter(prefix="/api/orders", tags=["Orders"])
+router = APIRouter(prefix="/api/orders", tags=["Orders"], default_response_class=FastJSONResponse)
 
 
 @router.post(
@@ -48,7 +56,7 @@ async def create_order(
     - Generates unique order ID
     - Creates order with all items
     - Records order history
-    - Updates customer statistics in CRMS
+    - Queues the customer statistics update for CRMS
     
     Returns the created order details.
     """
@@ -108,7 +116,8 @@ async def create_order(
             tax=total_tax,
             total_amount=total_amount,
             status="Placed",
-            notes=order_request.notes
+            notes=order_request.notes,
+            item_count=len(order_request.items)
         )
         
         # Insert order
@@ -134,11 +143,6 @@ async def create_order(
             )
             order_items.append(item_doc)
         
-        # Insert all items
-        if order_items:
-            await db.order_items.insert_many(order_items)
-            info(f"Created {len(order_items)} order items for order: {order_id}")
-        
         # Create initial order history entry
         history_doc = OrderHistory.create_history_entry(
             order_id=order_object_id,
@@ -150,24 +154,26 @@ async def create_order(
             changed_by_name=customer.get("fullName"),
             notes="Order placed by customer"
         )
-        await db.order_history.insert_one(history_doc)
-        
-        # Update customer statistics in CRMS
-        stats_updated = await customer_service.update_order_statistics(
-            customer=customer,
-            order_value=total_amount,
-            increment_order_count=True
-        )
         
-        if stats_updated:
-            info(f"Updated customer statistics for: {customer_id}")
-        else:
-            error(f"Failed to update customer statistics for: {customer_id}")
+        # Items, history, analytics rollups and the queued CRMS statistics
+        # update touch different collections, so they are written together
+        writes = [
+            db.order_history.insert_one(history_doc),
+            record_order_created(db, order_doc),
+            statistics_outbox.publish(
+                customer_id,
+                {"totalOrders": 1, "totalOrderValue": total_amount, "lastOrderDate": order_doc["orderDate"]},
+                db=db
+            )
+        ]
+        if order_items:
+            writes.append(db.order_items.insert_many(order_items, ordered=False))
+        await asyncio.gather(*writes)
+        info(f"Created {len(order_items)} order items for order: {order_id}")
         
-        # Fetch created order with items
-        created_order = await db.orders.find_one({"_id": order_object_id})
-        items_cursor = db.order_items.find({"orderIdString": order_id})
-        items = await items_cursor.to_list(length=None)
+        # The inserted documents (with their _id) are the response
+        created_order = order_doc
+        items = order_items
         
         # Build response
         response_data = OrderDetailResponse(
@@ -236,6 +242,8 @@ async def get_my_orders(
     current_user: Dict = Depends(require_customer),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.nextCursor / prevCursor (takes precedence over page)"),
+    include_total: TotalMode = Query(TotalMode.EXACT, description="Total count: exact, estimated (metadata or briefly cached count) or none"),
     order_status: Optional[str] = Query(None, description="Filter by order status"),
     search: Optional[str] = Query(None, description="Search in order ID, customer name, email"),
     db = Depends(get_database)
@@ -243,13 +251,16 @@ async def get_my_orders(
     """
     Get a paginated list of orders for the authenticated customer.
     
-    - Supports pagination
+    - Supports pagination (page numbers or cursors)
+    - Total count exact, estimated or skipped (include_total)
     - Filter by order status
     - Search by order ID, customer name, or email
     - Sorted by order date (newest first)
     
     Returns paginated order list with summary information.
     """
+    keyset_cursor = decode_cursor(cursor)
+    
     try:
         user_id = current_user.get("userId")
         
@@ -271,15 +282,22 @@ async def get_my_orders(
                 {"customerEmail": {"$regex": sanitized_search, "$options": "i"}}
             ]
         
-        # Get total count
-        total = await db.orders.count_documents(query)
+        # Get total count (exact, estimated or skipped)
+        total = await count_total(db.orders, query, include_total)
         
         # Calculate pagination
-        skip, pagination_meta = calculate_pagination(page, page_size, total)
+        skip, pagination_meta = calculate_pagination(page, page_size, total.total, total.exact)
+        
+        # Fetch orders (by cursor when given, otherwise by page)
+        result = await fetch_page(
+            db.orders, query, [("orderDate", -1)], page_size, skip=skip, cursor=keyset_cursor,
+            projection=ORDER_LIST_PROJECTION
+        )
+        orders = result.docs
+        attach_cursors(pagination_meta, result)
         
-        # Fetch orders
-        cursor = db.orders.find(query).sort("orderDate", -1).skip(skip).limit(page_size)
-        orders = await cursor.to_list(length=page_size)
+        # Resolve item counts for the whole page in one round-trip
+        item_counts = await get_item_counts(db, orders)
         
         # Build response items
         items = [
@@ -294,18 +312,21 @@ async def get_my_orders(
                 orderDate=order["orderDate"],
                 estimatedDeliveryDate=order.get("estimatedDeliveryDate"),
                 actualDeliveryDate=order.get("actualDeliveryDate"),
-                itemCount=await db.order_items.count_documents({"orderIdString": order["orderId"]})
+                itemCount=item_counts.get(order["orderId"], 0)
             )
             for order in orders
         ]
         
-        info(f"Found {total} orders for user: {user_id}")
+        info(f"Found {total.total} orders for user: {user_id}")
         
-        return create_paginated_response(
+        # Items were validated as they were built; skip the response_model pass
+        return trusted_response(create_paginated_response(
             items=items,
             pagination=pagination_meta
-        )
+        ))
         
+    except HTTPException:
+        raise
     except Exception as e:
         error(f"Error fetching orders: {str(e)}")
         raise HTTPException(
@@ -440,7 +461,7 @@ async def cancel_order(
     - Customers can only cancel their own orders
     - Admins can cancel any order
     - Only orders in 'Placed' or 'Processing' status can be cancelled
-    - Updates CRMS statistics (decrements order count and value)
+    - Queues the CRMS statistics update (decrements order count and value)
     - Creates order history entry
     
     Returns updated order details.
@@ -485,23 +506,6 @@ async def cancel_order(
             "cancelledAt": datetime.utcnow()
         }
         
-        result = await db.orders.update_one(
-            {"orderId": order_id},
-            {
-                "$set": {
-                    "status": "Cancelled",
-                    "cancellationInfo": cancellation_info,
-                    "updatedAt": datetime.utcnow()
-                }
-            }
-        )
-        
-        if result.modified_count == 0:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to cancel order"
-            )
-        
         # Create order history entry
         history_doc = OrderHistory.create_history_entry(
             order_id=order["_id"],
@@ -513,32 +517,38 @@ async def cancel_order(
             changed_by_name=current_user.get("fullName", "Unknown"),
             notes=f"Order cancelled. Reason: {cancel_request.reason}"
         )
-        await db.order_history.insert_one(history_doc)
         
-        # Update CRMS statistics (decrement order count and value)
-        customer_service = get_customer_service_client()
-        customer = await customer_service.get_customer_by_user_id(order["userId"])
-        
-        if customer:
-            stats_updated = await customer_service.update_order_statistics(
-                customer=customer,
-                order_value=-order["totalAmount"],
-                increment_order_count=False,
-                decrement_order_count=True
+        # Update the order; history, rollups and the queued CRMS statistics
+        # update (decrement order count and value) go out together after it,
+        # while the items are read
+        updated_order, items = await asyncio.gather(
+            apply_status_change(
+                db,
+                order,
+                "Cancelled",
+                {
+                    "status": "Cancelled",
+                    "cancellationInfo": cancellation_info,
+                    "updatedAt": datetime.utcnow()
+                },
+                history_doc,
+                follow_ups=[lambda: statistics_outbox.publish(
+                    order["customerId"],
+                    {"totalOrders": -1, "totalOrderValue": -order["totalAmount"]},
+                    db=db
+                )]
+            ),
+            db.order_items.find({"orderIdString": order_id}).to_list(length=None)
+        )
+        
+        if updated_order is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Order was updated by another request. Please refresh and try again."
             )
-            
-            if stats_updated:
-                info(f"Updated customer statistics for cancellation: {order['customerId']}")
-            else:
-                error(f"Failed to update customer statistics for cancellation: {order['customerId']}")
         
         info(f"Order cancelled: {order_id}")
         
-        # Fetch updated order with items
-        updated_order = await db.orders.find_one({"orderId": order_id})
-        items_cursor = db.order_items.find({"orderIdString": order_id})
-        items = await items_cursor.to_list(length=None)
-        
         # Build response
         response_data = OrderDetailResponse(
             orderId=updated_order["orderId"],
@@ -685,35 +695,16 @@ async def request_return(
             ]
         }
         
-        result = await db.orders.update_one(
-            {"orderId": order_id},
-            {
-                "$set": {
-                    "status": "Return Requested",
-                    "returnInfo": return_info,
-                    "updatedAt": datetime.utcnow()
-                }
+        # Line item flags, written as one unordered bulk_write
+        # (a repeated item keeps its last entry, as the sequential updates did)
+        item_changes = {
+            return_item.orderItemId: {
+                "returnRequested": True,
+                "returnQuantity": return_item.quantity,
+                "returnReason": return_item.returnReason
             }
-        )
-        
-        if result.modified_count == 0:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to request return"
-            )
-        
-        # Update order items
-        for return_item in return_request.items:
-            await db.order_items.update_one(
-                {"_id": ObjectId(return_item.orderItemId)},
-                {
-                    "$set": {
-                        "returnRequested": True,
-                        "returnQuantity": return_item.quantity,
-                        "returnReason": return_item.returnReason
-                    }
-                }
-            )
+            for return_item in return_request.items
+        }
         
         # Create order history entry
         history_doc = OrderHistory.create_history_entry(
@@ -726,14 +717,40 @@ async def request_return(
             changed_by_name=current_user.get("fullName", order["customerName"]),
             notes=f"Return requested. Reason: {return_request.reason}"
         )
-        await db.order_history.insert_one(history_doc)
         
-        info(f"Return requested for order: {order_id}")
+        # Update the order, then its items, history and rollups in one wave
+        updated_order = await apply_status_change(
+            db,
+            order,
+            "Return Requested",
+            {
+                "status": "Return Requested",
+                "returnInfo": return_info,
+                "itemCount": len(order_items),
+                "updatedAt": datetime.utcnow()
+            },
+            history_doc,
+            items=item_updates(
+                (order_items_map[item_id]["_id"], fields) for item_id, fields in item_changes.items()
+            )
+        )
         
-        # Fetch updated order with items
-        updated_order = await db.orders.find_one({"orderId": order_id})
-        items_cursor = db.order_items.find({"orderIdString": order_id})
-        items = await items_cursor.to_list(length=None)
+        if updated_order is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Order was updated by another request. Please refresh and try again."
+            )
+        
+        for item_id, fields in item_changes.items():
+            order_items_map[item_id].update(fields)
+        items = order_items
+        
+        # Previously: order update, one update per item, history, two rollup
+        # upserts and two re-reads, each awaited in turn
+        info(
+            f"Return requested for order: {order_id} ({len(item_changes)} items, "
+            f"2 round-trips instead of {len(item_changes) + 6})"
+        )
         
         # Build response
         response_data = OrderDetailResponse(
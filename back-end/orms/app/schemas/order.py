@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, field_validator
 from enum import Enum
+from app.utils.projection import model_projection
 
 
 # Enums
@@ -242,6 +243,10 @@ class OrderListItemResponse(BaseModel):
     }
 
 
+# Stored fields read for OrderListItemResponse
+ORDER_LIST_PROJECTION = model_projection(OrderListItemResponse)
+
+
 class OrderDetailResponse(BaseModel):
     """Detailed order response"""
     orderId: str
@@ -348,6 +353,17 @@ class ReturnListItemResponse(BaseModel):
     itemCount: int
 
 
+# Stored fields read for ReturnListItemResponse (some are stored under another name)
+RETURN_LIST_PROJECTION = model_projection(
+    ReturnListItemResponse,
+    renames={
+        "orderStatus": "status",
+        "returnStatus": "returnInfo.status",
+        "returnRequestedAt": "returnInfo.requestedAt"
+    }
+)
+
+
 class ReturnDetailResponse(BaseModel):
     """Detailed return information for admin review"""
     orderId: str
@@ -25,11 +25,14 @@ class APIResponse(BaseModel, Generic[T]):
 class PaginationMeta(BaseModel):
     """Pagination metadata"""
     currentPage: int = Field(..., description="Current page number")
-    totalPages: int = Field(..., description="Total number of pages")
-    totalItems: int = Field(..., description="Total number of items")
+    totalPages: Optional[int] = Field(..., description="Total number of pages (null when the total was not requested)")
+    totalItems: Optional[int] = Field(..., description="Total number of items (null when the total was not requested)")
     itemsPerPage: int = Field(..., description="Items per page")
     hasNextPage: bool = Field(..., description="Has next page")
     hasPreviousPage: bool = Field(..., description="Has previous page")
+    totalExact: bool = Field(True, description="Whether totalItems is an exact count taken for this request")
+    nextCursor: Optional[str] = Field(None, description="Cursor for the next page (pass as `cursor`)")
+    prevCursor: Optional[str] = Field(None, description="Cursor for the previous page (pass as `cursor`)")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -5,6 +5,7 @@ Handles communication with the Authentication Service (ATHS)
 import httpx
 from typing import Optional, Dict
 from app.config.settings import settings
+from app.config.http_client import HTTPClient, build_timeout
 from app.utils.logger import info, error
 
 
@@ -16,7 +17,7 @@ class AuthServiceClient:
     def __init__(self):
         self.base_url = settings.AUTH_SERVICE_URL
         self.service_api_key = settings.SERVICE_API_KEY
-        self.timeout = 10.0  # 10 seconds timeout
+        self.timeout = build_timeout(settings.AUTH_SERVICE_TIMEOUT)
     
     async def verify_token(self, token: str) -> Optional[Dict]:
         """
@@ -29,26 +30,27 @@ class AuthServiceClient:
             User information if token is valid, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/auth/verify-token",
-                    headers={
-                        "X-Service-API-Key": self.service_api_key
-                    },
-                    json={"token": token}
-                )
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/auth/verify-token",
+                headers={
+                    "X-Service-API-Key": self.service_api_key
+                },
+                json={"token": token},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        info(f"Token verified successfully for user: {data.get('data', {}).get('userId')}")
-                        return data.get("data")
-                    else:
-                        error(f"Token verification failed: {data.get('message')}")
-                        return None
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("success"):
+                    info("Token verified successfully for user: %s", data.get('data', {}).get('userId'))
+                    return data.get("data")
                 else:
-                    error(f"Auth service returned status {response.status_code}")
+                    error(f"Token verification failed: {data.get('message')}")
                     return None
+            else:
+                error(f"Auth service returned status {response.status_code}")
+                return None
                     
         except httpx.TimeoutException:
             error(f"Timeout while verifying token with auth service")
@@ -72,29 +74,30 @@ class AuthServiceClient:
             User information if found, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/users/{user_id}",
-                    headers={
-                        "Authorization": f"Bearer {requesting_user_token}",
-                        "X-Service-API-Key": self.service_api_key
-                    }
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/users/{user_id}",
+                headers={
+                    "Authorization": f"Bearer {requesting_user_token}",
+                    "X-Service-API-Key": self.service_api_key
+                },
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        info(f"Retrieved user information for: {user_id}")
-                        return data.get("data")
-                    else:
-                        error(f"Failed to get user: {data.get('message')}")
-                        return None
-                elif response.status_code == 404:
-                    error(f"User not found: {user_id}")
-                    return None
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("success"):
+                    info("Retrieved user information for: %s", user_id)
+                    return data.get("data")
                 else:
-                    error(f"Auth service returned status {response.status_code}")
+                    error(f"Failed to get user: {data.get('message')}")
                     return None
+            elif response.status_code == 404:
+                error(f"User not found: {user_id}")
+                return None
+            else:
+                error(f"Auth service returned status {response.status_code}")
+                return None
                     
         except httpx.TimeoutException:
             error(f"Timeout while getting user from auth service")
@@ -3,9 +3,12 @@ Customer Service Client
 Handles communication with the Customer Relationship Management Service (CRMS)
 """
 import httpx
-from typing import Optional, Dict
-from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from typing import Optional, Dict, List
 from app.config.settings import settings
+from app.config.http_client import HTTPClient, build_timeout
+from app.utils.batching import fetch_in_chunks
+from app.utils.customer_cache import customer_cache
 from app.utils.logger import info, error
 
 
@@ -17,43 +20,54 @@ class CustomerServiceClient:
     def __init__(self):
         self.base_url = settings.CUSTOMER_SERVICE_URL
         self.service_api_key = settings.SERVICE_API_KEY
-        self.timeout = 10.0  # 10 seconds timeout
+        self.timeout = build_timeout(settings.CUSTOMER_SERVICE_TIMEOUT)
     
+    async def _fetch_customer_by_user_id(self, user_id: str) -> Optional[Dict]:
+        """
+        Fetch customer information by user ID from CRMS
+            
+        Returns:
+            Customer information, or None if the user has no customer profile
+        
+        Raises:
+            Exception if CRMS could not answer
+        """
+        client = HTTPClient.get_client()
+        response = await client.get(
+            f"{self.base_url}/api/customers/internal/user/{user_id}",
+            headers={
+                "x-api-key": self.service_api_key
+            },
+            timeout=self.timeout
+        )
+                
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("success"):
+                customer = data.get("data")
+                info(f"Retrieved customer information for user: {user_id}, customer ID: {customer.get('customerId')}")
+                return customer
+            raise Exception(f"Failed to get customer: {data.get('message')}")
+        elif response.status_code == 404:
+            error(f"Customer not found for user: {user_id}")
+            return None
+        raise Exception(f"Customer service returned status {response.status_code}")
+                    
     async def get_customer_by_user_id(self, user_id: str) -> Optional[Dict]:
         """
-        Get customer information by user ID from CRMS
+        Get customer information by user ID, from the profile cache or CRMS
         
         Args:
             user_id: User ID to retrieve customer for
-            
+        
         Returns:
             Customer information if found, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/customers/internal/user/{user_id}",
-                    headers={
-                        "x-api-key": self.service_api_key
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        customer = data.get("data")
-                        info(f"Retrieved customer information for user: {user_id}, customer ID: {customer.get('customerId')}")
-                        return customer
-                    else:
-                        error(f"Failed to get customer: {data.get('message')}")
-                        return None
-                elif response.status_code == 404:
-                    error(f"Customer not found for user: {user_id}")
-                    return None
-                else:
-                    error(f"Customer service returned status {response.status_code}")
-                    return None
-                    
+            return await customer_cache.get_or_load(
+                user_id,
+                lambda: self._fetch_customer_by_user_id(user_id)
+            )
         except httpx.TimeoutException:
             error(f"Timeout while getting customer from CRMS")
             return None
@@ -75,29 +89,30 @@ class CustomerServiceClient:
             Customer information if found, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/api/customers/internal/{customer_id}",
-                    headers={
-                        "x-api-key": self.service_api_key
-                    }
-                )
+            client = HTTPClient.get_client()
+            response = await client.get(
+                f"{self.base_url}/api/customers/internal/{customer_id}",
+                headers={
+                    "x-api-key": self.service_api_key
+                },
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        customer = data.get("data")
-                        info(f"Retrieved customer information for customer ID: {customer_id}")
-                        return customer
-                    else:
-                        error(f"Failed to get customer: {data.get('message')}")
-                        return None
-                elif response.status_code == 404:
-                    error(f"Customer not found: {customer_id}")
-                    return None
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("success"):
+                    customer = data.get("data")
+                    info(f"Retrieved customer information for customer ID: {customer_id}")
+                    return customer
                 else:
-                    error(f"Customer service returned status {response.status_code}")
+                    error(f"Failed to get customer: {data.get('message')}")
                     return None
+            elif response.status_code == 404:
+                error(f"Customer not found: {customer_id}")
+                return None
+            else:
+                error(f"Customer service returned status {response.status_code}")
+                return None
                     
         except httpx.TimeoutException:
             error(f"Timeout while getting customer from CRMS")
@@ -109,62 +124,103 @@ class CustomerServiceClient:
             error(f"Unexpected error getting customer: {str(e)}")
             return None
     
-    async def update_order_statistics(
-        self, 
-        customer: Dict,
-        order_value: float,
-        increment_order_count: bool = True,
-        decrement_order_count: bool = False
-    ) -> bool:
+    async def _fetch_customers_batch(self, id_field: str, ids: List[str]) -> Dict[str, Dict]:
         """
-        Update customer order statistics in CRMS
+        Fetch one chunk of customers from the CRMS batch lookup
         
         Args:
-            customer: Customer object with customerId and current statistics
-            order_value: Order value to add to total spending (can be negative for cancellations)
-            increment_order_count: Whether to increment order count (default: True)
-            decrement_order_count: Whether to decrement order count (for cancellations)
+            id_field: "customerIds" or "userIds"
+            ids: IDs of the chunk
+        
+        Returns:
+            Customers keyed by the requested ID
+        
+        Raises:
+            Exception if CRMS could not answer
+        """
+        client = HTTPClient.get_client()
+        response = await client.post(
+            f"{self.base_url}/api/customers/internal/batch",
+            headers={
+                "x-api-key": self.service_api_key
+            },
+            json={id_field: ids},
+            timeout=self.timeout
+        )
+        
+        if response.status_code == 200:
+            data = response.json().get("data") or {}
+            return data.get("byCustomerId" if id_field == "customerIds" else "byUserId") or {}
+        raise Exception(f"Customer service returned status {response.status_code}")
+    
+    async def get_customers_by_ids(self, customer_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many customers by customer ID from CRMS
+        
+        Large lookups are split into chunks that are fetched in parallel.
+        
+        Args:
+            customer_ids: Customer IDs to retrieve
+        
+        Returns:
+            Customers keyed by customer ID; unknown IDs (and IDs of a chunk
+            that failed) are absent
+        """
+        return await fetch_in_chunks(
+            customer_ids,
+            lambda chunk: self._fetch_customers_batch("customerIds", chunk)
+        )
+    
+    async def get_customers_by_user_ids(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many customers by user ID from CRMS
+        
+        Args:
+            user_ids: User IDs to retrieve customers for
+        
+        Returns:
+            Customers keyed by user ID; users without a profile (and IDs of
+            a chunk that failed) are absent
+        """
+        return await fetch_in_chunks(
+            user_ids,
+            lambda chunk: self._fetch_customers_batch("userIds", chunk)
+        )
+    
+    async def apply_statistics_delta(self, customer_id: str, delta: Dict) -> bool:
+        """
+        Add changes to a customer's statistics in CRMS
+        
+        CRMS applies the delta atomically on its stored values, so
+        concurrent orders for the same customer are all counted.
+        
+        Args:
+            customer_id: Customer ID to update
+            delta: Counter changes, e.g. {"totalOrders": 1, "totalOrderValue": 99.5}
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            customer_id = customer.get("customerId")
-            
-            # Calculate new values
-            count_change = 0
-            if increment_order_count:
-                count_change = 1
-            elif decrement_order_count:
-                count_change = -1
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/customers/internal/{customer_id}/statistics/delta",
+                headers={
+                    "x-api-key": self.service_api_key
+                },
+                json=jsonable_encoder(delta),
+                timeout=self.timeout
+            )
                 
-            new_total_orders = max(0, customer["totalOrders"] + count_change)
-            new_total_value = max(0.0, customer["totalOrderValue"] + order_value)
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.patch(
-                    f"{self.base_url}/api/customers/internal/{customer_id}/statistics",
-                    headers={
-                        "x-api-key": self.service_api_key
-                    },
-                    json={
-                        "totalOrders": new_total_orders,
-                        "totalOrderValue": new_total_value,
-                        "lastOrderDate": datetime.utcnow().isoformat()
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        info(f"Updated order statistics for customer: {customer_id}, order value: {order_value}")
-                        return True
-                    else:
-                        error(f"Failed to update order statistics: {data.get('message')}")
-                        return False
-                else:
-                    error(f"Customer service returned status {response.status_code}")
-                    return False
+            if response.status_code == 200:
+                info(f"Applied statistics delta for customer: {customer_id}, delta: {delta}")
+                return True
+            elif response.status_code == 404:
+                error(f"Customer not found for statistics delta: {customer_id}")
+                return False
+            else:
+                error(f"Customer service returned status {response.status_code}")
+                return False
                     
         except httpx.TimeoutException:
             error(f"Timeout while updating order statistics in CRMS")
@@ -176,55 +232,47 @@ class CustomerServiceClient:
             error(f"Unexpected error updating order statistics: {str(e)}")
             return False
     
-    async def decrement_order_statistics(
-        self, 
-        customer_id: str, 
-        order_value: float
-    ) -> bool:
+    async def apply_statistics_deltas(self, deltas: List[Dict]) -> bool:
         """
-        Decrement customer order statistics in CRMS (for cancelled orders)
+        Add changes to many customers' statistics in one CRMS call
         
         Args:
-            customer_id: Customer ID to update
-            order_value: Order value to subtract from total spending
+            deltas: Deltas with a customerId each (at most 500 per call)
             
         Returns:
-            True if successful, False otherwise
+            True if CRMS accepted the batch, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/internal/customers/{customer_id}/order-statistics/decrement",
-                    headers={
-                        "x-api-key": self.service_api_key
-                    },
-                    json={
-                        "orderValue": order_value
-                    }
-                )
+            client = HTTPClient.get_client()
+            response = await client.post(
+                f"{self.base_url}/api/customers/internal/statistics/deltas",
+                headers={
+                    "x-api-key": self.service_api_key
+                },
+                json={"deltas": jsonable_encoder(deltas)},
+                timeout=self.timeout
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        info(f"Decremented order statistics for customer: {customer_id}, order value: {order_value}")
-                        return True
-                    else:
-                        error(f"Failed to decrement order statistics: {data.get('message')}")
-                        return False
-                else:
-                    error(f"Customer service returned status {response.status_code}")
-                    return False
+            if response.status_code == 200:
+                result = response.json().get("data") or {}
+                if result.get("notFound"):
+                    error(f"Statistics deltas for unknown customers: {result['notFound']}")
+                info(f"Applied statistics deltas for {result.get('applied', 0)} customers")
+                return True
+            else:
+                error(f"Customer service returned status {response.status_code}")
+                return False
                     
         except httpx.TimeoutException:
-            error(f"Timeout while decrementing order statistics in CRMS")
+            error(f"Timeout while updating order statistics in CRMS")
             return False
         except httpx.RequestError as e:
             error(f"Error connecting to customer service: {str(e)}")
             return False
         except Exception as e:
-            error(f"Unexpected error decrementing order statistics: {str(e)}")
+            error(f"Unexpected error updating order statistics: {str(e)}")
             return False
-
+    
 
 # Singleton instance
 _customer_service_client = None
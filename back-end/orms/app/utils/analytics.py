@@ -0,0 +1,129 @@
+"""
+Order Analytics Utility
+Server-side aggregation pipelines for the admin analytics dashboard
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Revenue excludes cancelled orders
+_NOT_CANCELLED = {"$ne": ["$status", "Cancelled"]}
+_REVENUE = {"$cond": [_NOT_CANCELLED, "$totalAmount", 0]}
+
+
+def build_order_analytics_pipeline(
+    date_filter: Dict,
+    trend_since: Optional[datetime] = None,
+    top_customers: int = 10
+) -> List[Dict]:
+    """
+    Build a single $facet pipeline returning every analytics section
+    
+    Args:
+        date_filter: Match stage filter on orderDate (may be empty)
+        trend_since: Only include orders from this date in the daily trend
+        top_customers: Number of top customers to return
+    
+    Returns:
+        Aggregation pipeline producing one document with summary,
+        statusBreakdown, topCustomers and dailyTrend arrays
+    """
+    daily_trend = []
+    if trend_since is not None:
+        daily_trend.append({"$match": {"orderDate": {"$gte": trend_since}}})
+    daily_trend.extend([
+        {
+            "$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$orderDate"}},
+                "count": {"$sum": 1},
+                "revenue": {"$sum": _REVENUE}
+            }
+        },
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "date": "$_id", "count": 1, "revenue": 1}}
+    ])
+    
+    return [
+        {"$match": date_filter},
+        # Only carry the fields the facets need
+        {
+            "$project": {
+                "_id": 0,
+                "status": 1,
+                "totalAmount": 1,
+                "customerId": 1,
+                "customerName": 1,
+                "orderDate": 1
+            }
+        },
+        {
+            "$facet": {
+                "summary": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "totalOrders": {"$sum": 1},
+                            "activeOrders": {"$sum": {"$cond": [_NOT_CANCELLED, 1, 0]}},
+                            "totalRevenue": {"$sum": _REVENUE}
+                        }
+                    }
+                ],
+                "statusBreakdown": [
+                    {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+                ],
+                "topCustomers": [
+                    {
+                        "$group": {
+                            "_id": "$customerId",
+                            "customerName": {"$first": "$customerName"},
+                            "orderCount": {"$sum": 1},
+                            "totalSpent": {"$sum": _REVENUE}
+                        }
+                    },
+                    {"$sort": {"orderCount": -1, "_id": 1}},
+                    {"$limit": top_customers},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "customerId": "$_id",
+                            "customerName": 1,
+                            "orderCount": 1,
+                            "totalSpent": 1
+                        }
+                    }
+                ],
+                "dailyTrend": daily_trend
+            }
+        }
+    ]
+
+
+def format_order_analytics(facets: Dict) -> Dict:
+    """
+    Shape the $facet result into the analytics response sections
+    
+    Args:
+        facets: Single document returned by the analytics pipeline
+    
+    Returns:
+        Dictionary with summary, statusBreakdown, topCustomers and dailyTrend
+    """
+    summary = (facets.get("summary") or [{}])[0]
+    total_orders = summary.get("totalOrders", 0)
+    active_orders = summary.get("activeOrders", 0)
+    total_revenue = summary.get("totalRevenue", 0) or 0
+    average_order_value = total_revenue / active_orders if active_orders else 0
+    
+    return {
+        "summary": {
+            "totalOrders": total_orders,
+            "totalRevenue": round(total_revenue, 2),
+            "averageOrderValue": round(average_order_value, 2),
+            "activeOrders": active_orders
+        },
+        "statusBreakdown": {
+            entry["_id"]: entry["count"]
+            for entry in facets.get("statusBreakdown", [])
+        },
+        "topCustomers": facets.get("topCustomers", []),
+        "dailyTrend": facets.get("dailyTrend", [])
+    }
@@ -0,0 +1,199 @@
+"""
+Customer Cache
+Bounded LRU cache of CRMS customer profiles keyed by user ID
+
+Order and complaint handlers look up the caller's customer profile on
+every request, and the identity fields they need rarely change. Profiles
+are kept for CUSTOMER_CACHE_TTL_SECONDS, unknown users (404) for the
+shorter CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS, and concurrent misses for the
+same user share one CRMS call. That call runs in a task owned by the
+cache, so a request cancelled while waiting (client disconnect, timeout)
+does not cancel the lookup for the others. CRMS invalidates entries through the
+internal API when a customer is created or their status, type or profile
+changes.
+
+The cache lives in one process. An invalidation reaches only the worker
+(or replica) that received the call; every other process keeps serving
+its copy until the TTL expires. CUSTOMER_CACHE_TTL_SECONDS is therefore
+the bound on how stale a status or type change can be, and is kept short.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from app.config.settings import settings
+
+CustomerLoader = Callable[[], Awaitable[Optional[Dict]]]
+
+
+def _retrieve_exception(task: asyncio.Task):
+    """Mark a failed load retrieved when no request was left waiting for it"""
+    if not task.cancelled():
+        task.exception()
+
+
+class CustomerCache:
+    """LRU map of user ID to (customer or None, expires_at), with single-flight loads"""
+    
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[Optional[Dict], float]]" = OrderedDict()
+        self._user_ids: Dict[str, str] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def _lookup(self, user_id: str) -> Tuple[bool, Optional[Dict]]:
+        """Return (found, customer) for a live entry"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False, None
+        
+        customer, expires_at = entry
+        if self.clock() >= expires_at:
+            self._remove(user_id)
+            return False, None
+        
+        self._entries.move_to_end(user_id)
+        return True, customer
+    
+    def _remove(self, user_id: str):
+        """Drop an entry and its customer ID mapping"""
+        customer, _ = self._entries.pop(user_id)
+        if customer and self._user_ids.get(customer.get("customerId")) == user_id:
+            del self._user_ids[customer["customerId"]]
+    
+    def put(self, user_id: str, customer: Optional[Dict]):
+        """Cache a customer profile, or None for a user without one"""
+        ttl = self.ttl if customer else self.negative_ttl
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        
+        if user_id in self._entries:
+            self._remove(user_id)
+        self._entries[user_id] = (customer, self.clock() + ttl)
+        if customer and customer.get("customerId"):
+            self._user_ids[customer["customerId"]] = user_id
+        
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    async def get_or_load(self, user_id: str, loader: CustomerLoader) -> Optional[Dict]:
+        """
+        Get a customer profile, calling the loader at most once per miss
+        
+        Args:
+            user_id: User ID the profile belongs to
+            loader: Fetches the profile from CRMS; returns None if the user
+                has no profile and raises on any other failure (not cached)
+        
+        Returns:
+            Copy of the customer profile, or None if the user has none
+        """
+        found, customer = self._lookup(user_id)
+        if found:
+            if customer is None:
+                self.negative_hits += 1
+                return None
+            self.hits += 1
+            return dict(customer)
+        
+        task = self._inflight.get(user_id)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._load(user_id, loader))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[user_id] = task
+        
+        # Cancelling a waiter (even the one that started the load) leaves
+        # the load running for the others
+        customer = await asyncio.shield(task)
+        return dict(customer) if customer else None
+        
+    async def _load(self, user_id: str, loader: CustomerLoader) -> Optional[Dict]:
+        """Run the loader for an in-flight entry and cache its result"""
+        task = asyncio.current_task()
+        try:
+            customer = await loader()
+        finally:
+            owner = self._inflight.get(user_id) is task
+            if owner:
+                del self._inflight[user_id]
+        
+        # An invalidation during the load removes the in-flight marker, so
+        # a profile read before the change is not cached
+        if owner:
+            self.put(user_id, customer)
+        return customer
+    
+    def invalidate(self, user_id: Optional[str] = None, customer_id: Optional[str] = None) -> int:
+        """
+        Drop the cached profile for a user and/or customer
+        
+        Args:
+            user_id: User ID to drop
+            customer_id: Customer ID to drop (looked up by cached profile)
+        
+        Returns:
+            Number of entries removed
+        """
+        user_ids = {user_id} if user_id else set()
+        if customer_id and customer_id in self._user_ids:
+            user_ids.add(self._user_ids[customer_id])
+        
+        removed = 0
+        for key in user_ids:
+            self._inflight.pop(key, None)
+            if key in self._entries:
+                self._remove(key)
+                removed += 1
+        self.invalidations += removed
+        return removed
+    
+    def clear(self):
+        """Drop all cached profiles"""
+        self._entries.clear()
+        self._user_ids.clear()
+        self._inflight.clear()
+    
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl,
+            "negativeTtlSeconds": self.negative_ttl,
+            "hits": self.hits,
+            "negativeHits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "inflight": len(self._inflight),
+            "hitRate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global customer profile cache instance
+customer_cache = CustomerCache(
+    max_size=settings.CUSTOMER_CACHE_SIZE,
+    ttl=settings.CUSTOMER_CACHE_TTL_SECONDS,
+    negative_ttl=settings.CUSTOMER_CACHE_NEGATIVE_TTL_SECONDS
+)
@@ -0,0 +1,253 @@
+"""
+Index Advisor
+Replays the service's hot query shapes through explain() and reports any
+that would run a collection scan or an in-memory sort, or fetch documents
+for a query meant to be covered by its index
+
+Runs at startup (INDEX_ADVISOR_MODE = off | warn | fail) and from the CLI:
+    python -m app.utils.index_advisor
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.utils.logger import info, warning, error
+from app.schemas.order import ORDER_LIST_PROJECTION
+
+
+class QueryShape(NamedTuple):
+    """A query issued on a hot path, with representative values"""
+    name: str
+    collection: str
+    filter: Dict
+    sort: Optional[List[Tuple[str, int]]] = None
+    limit: int = 0
+    # Set for list queries whose index holds every returned field
+    covered_projection: Optional[Dict] = None
+
+
+# Hot query shapes for ORMS
+HOT_QUERIES = [
+    QueryShape("order by orderId", "orders", {"orderId": "ORD-2026-000001"}),
+    QueryShape("orders by orderId batch", "orders", {"orderId": {"$in": ["ORD-2026-000001", "ORD-2026-000002"]}}),
+    QueryShape(
+        "my orders",
+        "orders",
+        {"userId": "user-id"},
+        sort=[("orderDate", -1), ("_id", -1)],
+        limit=10,
+        covered_projection=ORDER_LIST_PROJECTION
+    ),
+    QueryShape(
+        "my orders by status",
+        "orders",
+        {"userId": "user-id", "status": "Placed"},
+        sort=[("orderDate", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin orders",
+        "orders",
+        {},
+        sort=[("orderDate", -1), ("_id", -1)],
+        limit=10,
+        covered_projection=ORDER_LIST_PROJECTION
+    ),
+    QueryShape(
+        "admin orders by status",
+        "orders",
+        {"status": "Placed"},
+        sort=[("orderDate", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin search by order ID prefix",
+        "orders",
+        {"orderId": {"$gte": "ORD-2026-0001", "$lt": "ORD-2026-0001\uffff"}},
+        sort=[("orderId", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin search by email",
+        "orders",
+        {"search.email": "customer@example.com"},
+        sort=[("orderDate", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin search by name words",
+        "orders",
+        {"search.grams": {"$all": ["jo", "do"]}},
+        sort=[("orderDate", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "customer recent orders",
+        "orders",
+        {"customerId": "customer-id"},
+        sort=[("orderDate", -1)],
+        limit=10
+    ),
+    QueryShape(
+        "admin returns",
+        "orders",
+        {"returnInfo": {"$exists": True}},
+        sort=[("returnInfo.requestedAt", -1), ("_id", -1)],
+        limit=10
+    ),
+    QueryShape("order items by orderIdString", "order_items", {"orderIdString": "ORD-2026-000001"}),
+    QueryShape(
+        "order items by orderIdString batch",
+        "order_items",
+        {"orderIdString": {"$in": ["ORD-2026-000001", "ORD-2026-000002"]}}
+    ),
+    QueryShape("order items by order _id", "order_items", {"orderId": ObjectId()}),
+    QueryShape("order items by order _id batch", "order_items", {"orderId": {"$in": [ObjectId(), ObjectId()]}}),
+    QueryShape(
+        "order history",
+        "order_history",
+        {"orderIdString": "ORD-2026-000001"},
+        sort=[("timestamp", 1)]
+    ),
+    QueryShape(
+        "daily rollups",
+        "order_daily_stats",
+        {"day": {"$gte": datetime(2026, 1, 1)}}
+    )
+]
+
+
+def plan_stages(plan) -> List[str]:
+    """Collect every stage name in an explain() plan tree"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+async def explain_query(db: AsyncIOMotorDatabase, shape: QueryShape) -> Dict:
+    """
+    Explain one query shape
+    
+    Args:
+        db: Database instance
+        shape: Query shape to explain
+    
+    Returns:
+        Dictionary with the winning plan's stages and any problems found
+    """
+    cursor = db[shape.collection].find(shape.filter, shape.covered_projection)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    if shape.limit:
+        cursor = cursor.limit(shape.limit)
+    
+    explanation = await cursor.explain()
+    stages = plan_stages(explanation.get("queryPlanner", {}).get("winningPlan", {}))
+    
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("COLLSCAN")
+    if "SORT" in stages:
+        problems.append("in-memory SORT")
+    if shape.covered_projection is not None and "FETCH" in stages:
+        problems.append("FETCH (not covered)")
+    
+    return {
+        "name": shape.name,
+        "collection": shape.collection,
+        "stages": stages,
+        "problems": problems
+    }
+
+
+async def run_index_advisor(
+    db: AsyncIOMotorDatabase,
+    shapes: List[QueryShape] = HOT_QUERIES
+) -> List[Dict]:
+    """
+    Explain every hot query shape
+    
+    Args:
+        db: Database instance
+        shapes: Query shapes to check
+    
+    Returns:
+        One report entry per query shape
+    """
+    return [await explain_query(db, shape) for shape in shapes]
+
+
+async def check_indexes(db: AsyncIOMotorDatabase, mode: str = "warn") -> List[Dict]:
+    """
+    Run the advisor and log the outcome
+    
+    Args:
+        db: Database instance
+        mode: "off" to skip, "warn" to log problems, "fail" to also raise
+            when a hot query would scan a whole collection
+    
+    Returns:
+        Report entries with problems
+    
+    Raises:
+        RuntimeError: In fail mode, if any hot query runs a COLLSCAN
+    """
+    if mode == "off":
+        return []
+    
+    try:
+        report = await run_index_advisor(db)
+    except Exception as e:
+        if mode == "fail":
+            raise
+        error(f"Index advisor could not explain hot queries: {str(e)}")
+        return []
+    
+    flagged = [entry for entry in report if entry["problems"]]
+    
+    for entry in flagged:
+        warning(
+            f"⚠️  Index advisor: '{entry['name']}' on {entry['collection']} uses "
+            f"{', '.join(entry['problems'])} (plan: {' <- '.join(entry['stages'])})"
+        )
+    
+    collscans = [entry["name"] for entry in flagged if "COLLSCAN" in entry["problems"]]
+    if collscans and mode == "fail":
+        raise RuntimeError(f"Hot queries without a supporting index: {', '.join(collscans)}")
+    
+    if not flagged:
+        info(f"✅ Index advisor: all {len(report)} hot queries are index-backed")
+    return flagged
+
+
+async def main() -> int:
+    """Run the advisor against the configured database and print a report"""
+    from app.config.database import Database
+    
+    await Database.connect_db()
+    try:
+        report = await run_index_advisor(Database.db)
+    finally:
+        await Database.disconnect_db()
+    
+    for entry in report:
+        status = "❌" if "COLLSCAN" in entry["problems"] else "⚠️ " if entry["problems"] else "✅"
+        print(f"{status} {entry['collection']:<20} {entry['name']:<40} {' <- '.join(entry['stages'])}")
+    
+    collscans = [entry for entry in report if "COLLSCAN" in entry["problems"]]
+    if collscans:
+        error(f"{len(collscans)} hot queries would run a collection scan")
+    return 1 if collscans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
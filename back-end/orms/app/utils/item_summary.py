@@ -0,0 +1,86 @@
+"""
+Item Summary Utility
+Batched order item counts and totals for list endpoints
+"""
+from typing import Dict, List, Iterable
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+async def get_item_summaries(
+    db: AsyncIOMotorDatabase,
+    order_ids: Iterable[str]
+) -> Dict[str, Dict]:
+    """
+    Resolve item count and item total for many orders in one aggregation
+    
+    Args:
+        db: Database instance
+        order_ids: Order ID strings (e.g., ORD-2026-000001)
+    
+    Returns:
+        Dictionary mapping order ID to {"itemCount": int, "itemTotal": float}.
+        Orders without items are mapped to a zero summary.
+    """
+    order_ids = list(dict.fromkeys(order_ids))
+    summaries = {
+        order_id: {"itemCount": 0, "itemTotal": 0.0}
+        for order_id in order_ids
+    }
+    
+    if not order_ids:
+        return summaries
+    
+    pipeline = [
+        {"$match": {"orderIdString": {"$in": order_ids}}},
+        {
+            "$group": {
+                "_id": "$orderIdString",
+                "itemCount": {"$sum": 1},
+                "itemTotal": {"$sum": "$finalPrice"}
+            }
+        }
+    ]
+    
+    results = await db.order_items.aggregate(pipeline).to_list(length=None)
+    for result in results:
+        summaries[result["_id"]] = {
+            "itemCount": result["itemCount"],
+            "itemTotal": result["itemTotal"] or 0.0
+        }
+    
+    return summaries
+
+
+async def get_item_counts(
+    db: AsyncIOMotorDatabase,
+    orders: List[dict]
+) -> Dict[str, int]:
+    """
+    Resolve item counts for a page of order documents
+    
+    Uses the denormalized itemCount field when present and falls back to a
+    single batched aggregation for orders written before it existed.
+    
+    Args:
+        db: Database instance
+        orders: Order documents (must include orderId, may include itemCount)
+    
+    Returns:
+        Dictionary mapping order ID to item count
+    """
+    counts = {}
+    missing = []
+    
+    for order in orders:
+        item_count = order.get("itemCount")
+        if item_count is None:
+            missing.append(order["orderId"])
+        else:
+            counts[order["orderId"]] = item_count
+    
+    if missing:
+        summaries = await get_item_summaries(db, missing)
+        for order_id, summary in summaries.items():
+            counts[order_id] = summary["itemCount"]
+    
+    return counts
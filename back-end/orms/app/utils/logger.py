@@ -1,58 +1,54 @@
 """
 Logging Utility
 Centralized logging configuration
+
+Records are written by the background thread of app/utils/log_pipeline.py;
+INFO lines are rate capped per call site (LOG_INFO_* settings). Pass values
+as %-style arguments, info("Order %s created", order_id), so they are only
+formatted for lines that are written; keyword arguments become structured
+fields of the record.
 """
-import logging
-import sys
+from app.utils.log_pipeline import configure_logging
 
 # Import settings with try/except to handle initialization issues
 try:
     from app.config.settings import settings
     SERVICE_NAME = settings.SERVICE_NAME
     LOG_LEVEL = settings.LOG_LEVEL
+    USE_JSON = settings.LOG_FORMAT.lower() == "json"
+    PIPELINE_OPTIONS = {
+        "queue_size": settings.LOG_QUEUE_SIZE,
+        "info_rate_limit": settings.LOG_INFO_RATE_LIMIT,
+        "info_burst": settings.LOG_INFO_BURST,
+        "info_sample_rate": settings.LOG_INFO_SAMPLE_RATE
+    }
 except Exception:
     SERVICE_NAME = "order-service"
     LOG_LEVEL = "INFO"
+    USE_JSON = False
+    PIPELINE_OPTIONS = {}
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL, logging.INFO),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
+# Configure logging (library loggers go through the same pipeline)
+logger, log_pipeline = configure_logging(
+    SERVICE_NAME, LOG_LEVEL, USE_JSON, capture_root=True, **PIPELINE_OPTIONS
 )
 
-logger = logging.getLogger(SERVICE_NAME)
-
 
-def info(message: str, **kwargs):
+def info(message: str, *args, **kwargs):
     """Log info message"""
-    if kwargs:
-        logger.info(message, extra=kwargs)
-    else:
-        logger.info(message)
+    logger.info(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def error(message: str, **kwargs):
+def error(message: str, *args, **kwargs):
     """Log error message"""
-    if kwargs:
-        logger.error(message, extra=kwargs)
-    else:
-        logger.error(message)
+    logger.error(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def warning(message: str, **kwargs):
+def warning(message: str, *args, **kwargs):
     """Log warning message"""
-    if kwargs:
-        logger.warning(message, extra=kwargs)
-    else:
-        logger.warning(message)
+    logger.warning(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
 
 
-def debug(message: str, **kwargs):
+def debug(message: str, *args, **kwargs):
     """Log debug message"""
-    if kwargs:
-        logger.debug(message, extra=kwargs)
-    else:
-        logger.debug(message)
+    logger.debug(message, *args, extra={"extra_data": kwargs} if kwargs else None, stacklevel=2)
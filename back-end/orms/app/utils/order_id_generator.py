@@ -5,6 +5,10 @@ Generate unique order IDs in format: ORD-YYYY-XXXXXX
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.config.settings import settings
+from app.utils.sequence import SequenceGenerator, last_issued_number
+
+# Shared per-process generator; block size > 1 reserves IDs in memory
+_sequence = SequenceGenerator(block_size=settings.ID_SEQUENCE_BLOCK_SIZE)
 
 
 async def generate_order_id(db: AsyncIOMotorDatabase) -> str:
@@ -22,24 +26,15 @@ async def generate_order_id(db: AsyncIOMotorDatabase) -> str:
     # Get current year
     current_year = datetime.utcnow().year
     
-    # Find the highest order number for current year
     prefix = f"{settings.ORDER_ID_PREFIX}-{current_year}-"
     
-    # Get last order ID for this year
-    last_order = await db.orders.find_one(
-        {"orderId": {"$regex": f"^{prefix}"}},
-        sort=[("orderId", -1)]
+    # Atomically take the next number for this prefix and year
+    next_number = await _sequence.next_value(
+        db,
+        f"{settings.ORDER_ID_PREFIX}-{current_year}",
+        seed=lambda: last_issued_number(db.orders, "orderId", prefix)
     )
     
-    if last_order:
-        # Extract number from last order ID
-        last_id = last_order["orderId"]
-        last_number = int(last_id.split('-')[-1])
-        next_number = last_number + 1
-    else:
-        # First order of the year
-        next_number = 1
-    
     # Format: ORD-YYYY-XXXXXX (6 digits)
     order_id = f"{prefix}{next_number:06d}"
     
@@ -61,24 +56,15 @@ async def generate_return_id(db: AsyncIOMotorDatabase) -> str:
     # Get current year
     current_year = datetime.utcnow().year
     
-    # Find the highest return number for current year
     prefix = f"{settings.RETURN_ID_PREFIX}-{current_year}-"
     
-    # Get last return ID for this year
-    last_return = await db.return_requests.find_one(
-        {"returnId": {"$regex": f"^{prefix}"}},
-        sort=[("returnId", -1)]
+    # Atomically take the next number for this prefix and year
+    next_number = await _sequence.next_value(
+        db,
+        f"{settings.RETURN_ID_PREFIX}-{current_year}",
+        seed=lambda: last_issued_number(db.return_requests, "returnId", prefix)
     )
     
-    if last_return:
-        # Extract number from last return ID
-        last_id = last_return["returnId"]
-        last_number = int(last_id.split('-')[-1])
-        next_number = last_number + 1
-    else:
-        # First return of the year
-        next_number = 1
-    
     # Format: RET-YYYY-XXXXXX (6 digits)
     return_id = f"{prefix}{next_number:06d}"
     
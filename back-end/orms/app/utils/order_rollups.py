@@ -0,0 +1,320 @@
+"""
+Order Rollups Utility
+Incrementally maintained daily order statistics for analytics dashboards
+
+Two small collections are kept in step with order writes:
+
+- order_daily_stats: one document per (day, status) with orderCount and revenue
+- order_daily_customer_stats: one document per (day, customerId) with
+  orderCount, totalAmount and cancelledAmount
+
+Days are the UTC calendar day of the order's orderDate, so an order never
+moves between days; status changes only move it between status buckets.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.utils.logger import info, error
+
+DAILY_STATS = "order_daily_stats"
+DAILY_CUSTOMER_STATS = "order_daily_customer_stats"
+
+
+def day_of(value: datetime) -> datetime:
+    """Truncate a datetime to its UTC day"""
+    return datetime(value.year, value.month, value.day)
+
+
+def _bucket(key: Dict, inc: Dict, set_on_insert: Optional[Dict] = None) -> UpdateOne:
+    """Upsert of a rollup bucket with $inc"""
+    update = {"$inc": inc}
+    if set_on_insert:
+        update["$setOnInsert"] = set_on_insert
+    return UpdateOne(key, update, upsert=True)
+
+
+async def _increment(collection, buckets: List[UpdateOne]):
+    """
+    Apply bucket upserts in one unordered bulk_write
+    
+    Two requests upserting the same new bucket can race; only the
+    operations that failed with a duplicate key are retried, once.
+    """
+    try:
+        await collection.bulk_write(buckets, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if not write_errors or any(err.get("code") != 11000 for err in write_errors):
+            raise
+        await collection.bulk_write([buckets[err["index"]] for err in write_errors], ordered=False)
+
+
+async def record_order_created(db: AsyncIOMotorDatabase, order: Dict):
+    """
+    Add a newly created order to the rollups
+    
+    Args:
+        db: Database instance
+        order: Order document as inserted
+    """
+    try:
+        day = day_of(order["orderDate"])
+        amount = order["totalAmount"]
+        
+        await asyncio.gather(
+            _increment(db[DAILY_STATS], [
+                _bucket({"day": day, "status": order["status"]}, {"orderCount": 1, "revenue": amount})
+            ]),
+            _increment(db[DAILY_CUSTOMER_STATS], [
+                _bucket(
+                    {"day": day, "customerId": order["customerId"]},
+                    {"orderCount": 1, "totalAmount": amount, "cancelledAmount": 0.0},
+                    {"customerName": order.get("customerName")}
+                )
+            ])
+        )
+    except Exception as e:
+        # Rollups can be rebuilt; never fail the order write because of them
+        error(f"Failed to update order rollups for {order.get('orderId')}: {str(e)}")
+
+
+async def record_status_change(
+    db: AsyncIOMotorDatabase,
+    order: Dict,
+    previous_status: str,
+    new_status: str
+):
+    """
+    Move an order between status buckets in the rollups
+    
+    Args:
+        db: Database instance
+        order: Order document (orderDate, totalAmount, customerId are used)
+        previous_status: Status before the change
+        new_status: Status after the change
+    """
+    if previous_status == new_status:
+        return
+    
+    try:
+        day = day_of(order["orderDate"])
+        amount = order["totalAmount"]
+        
+        # Both status buckets move in one bulk_write; the customer bucket
+        # (only touched by cancellations) is written alongside it
+        writes = [_increment(db[DAILY_STATS], [
+            _bucket({"day": day, "status": previous_status}, {"orderCount": -1, "revenue": -amount}),
+            _bucket({"day": day, "status": new_status}, {"orderCount": 1, "revenue": amount})
+        ])]
+        
+        if "Cancelled" in (previous_status, new_status):
+            cancelled_delta = amount if new_status == "Cancelled" else -amount
+            writes.append(_increment(db[DAILY_CUSTOMER_STATS], [
+                _bucket({"day": day, "customerId": order["customerId"]}, {"cancelledAmount": cancelled_delta})
+            ]))
+        
+        await asyncio.gather(*writes)
+    except Exception as e:
+        error(f"Failed to update order rollups for {order.get('orderId')}: {str(e)}")
+
+
+async def get_rollup_analytics(
+    db: AsyncIOMotorDatabase,
+    date_filter: Dict,
+    trend_since: Optional[datetime] = None,
+    top_customers: int = 10
+) -> Dict:
+    """
+    Build the analytics sections from the rollup collections
+    
+    Args:
+        db: Database instance
+        date_filter: Filter on orderDate as used against orders
+            (e.g. {"orderDate": {"$gte": ..., "$lt": ...}}), may be empty
+        trend_since: Only include days from this date in the daily trend
+        top_customers: Number of top customers to return
+    
+    Returns:
+        Dictionary with summary, statusBreakdown, topCustomers and dailyTrend
+    """
+    day_filter = {}
+    if date_filter.get("orderDate"):
+        day_filter["day"] = date_filter["orderDate"]
+    
+    buckets = await db[DAILY_STATS].find(
+        {**day_filter, "orderCount": {"$gt": 0}},
+        {"_id": 0, "day": 1, "status": 1, "orderCount": 1, "revenue": 1}
+    ).to_list(length=None)
+    
+    total_orders = 0
+    active_orders = 0
+    total_revenue = 0.0
+    status_breakdown = {}
+    daily = {}
+    trend_start = day_of(trend_since) if trend_since else None
+    
+    for bucket in buckets:
+        count = bucket["orderCount"]
+        revenue = bucket["revenue"] if bucket["status"] != "Cancelled" else 0.0
+        
+        total_orders += count
+        status_breakdown[bucket["status"]] = status_breakdown.get(bucket["status"], 0) + count
+        if bucket["status"] != "Cancelled":
+            active_orders += count
+            total_revenue += revenue
+        
+        if trend_start is None or bucket["day"] >= trend_start:
+            date_key = bucket["day"].strftime("%Y-%m-%d")
+            entry = daily.setdefault(date_key, {"date": date_key, "count": 0, "revenue": 0})
+            entry["count"] += count
+            entry["revenue"] += revenue
+    
+    customer_pipeline = [
+        {"$match": {**day_filter, "orderCount": {"$gt": 0}}},
+        {
+            "$group": {
+                "_id": "$customerId",
+                "customerName": {"$first": "$customerName"},
+                "orderCount": {"$sum": "$orderCount"},
+                "totalSpent": {"$sum": {"$subtract": ["$totalAmount", "$cancelledAmount"]}}
+            }
+        },
+        {"$sort": {"orderCount": -1, "_id": 1}},
+        {"$limit": top_customers},
+        {
+            "$project": {
+                "_id": 0,
+                "customerId": "$_id",
+                "customerName": 1,
+                "orderCount": 1,
+                "totalSpent": 1
+            }
+        }
+    ]
+    top = await db[DAILY_CUSTOMER_STATS].aggregate(customer_pipeline).to_list(length=top_customers)
+    
+    average_order_value = total_revenue / active_orders if active_orders else 0
+    
+    return {
+        "summary": {
+            "totalOrders": total_orders,
+            "totalRevenue": round(total_revenue, 2),
+            "averageOrderValue": round(average_order_value, 2),
+            "activeOrders": active_orders
+        },
+        "statusBreakdown": status_breakdown,
+        "topCustomers": top,
+        "dailyTrend": sorted(daily.values(), key=lambda x: x["date"])
+    }
+
+
+async def rebuild_rollups(
+    db: AsyncIOMotorDatabase,
+    from_day: Optional[datetime] = None,
+    to_day: Optional[datetime] = None
+) -> Dict:
+    """
+    Recompute rollups from the orders collection (backfill or drift repair)
+    
+    Existing buckets in the range are replaced. Runs entirely server-side
+    with $merge, so it can cover years of orders.
+    
+    Args:
+        db: Database instance
+        from_day: First day to rebuild (inclusive), None for the beginning
+        to_day: Last day to rebuild (inclusive), None for today
+    
+    Returns:
+        Number of (day, status) and (day, customer) buckets written
+    """
+    order_filter = {}
+    day_filter = {}
+    if from_day or to_day:
+        range_query = {}
+        if from_day:
+            range_query["$gte"] = day_of(from_day)
+        if to_day:
+            range_query["$lt"] = day_of(to_day) + timedelta(days=1)
+        order_filter["orderDate"] = range_query
+        day_filter["day"] = range_query
+    
+    await db[DAILY_STATS].delete_many(day_filter)
+    await db[DAILY_CUSTOMER_STATS].delete_many(day_filter)
+    
+    day_expr = {"$dateTrunc": {"date": "$orderDate", "unit": "day"}}
+    
+    await db.orders.aggregate([
+        {"$match": order_filter},
+        {
+            "$group": {
+                "_id": {"day": day_expr, "status": "$status"},
+                "orderCount": {"$sum": 1},
+                "revenue": {"$sum": "$totalAmount"}
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "day": "$_id.day",
+                "status": "$_id.status",
+                "orderCount": 1,
+                "revenue": 1
+            }
+        },
+        {"$merge": {"into": DAILY_STATS, "on": ["day", "status"], "whenMatched": "replace"}}
+    ], allowDiskUse=True).to_list(length=None)
+    
+    await db.orders.aggregate([
+        {"$match": order_filter},
+        {
+            "$group": {
+                "_id": {"day": day_expr, "customerId": "$customerId"},
+                "customerName": {"$first": "$customerName"},
+                "orderCount": {"$sum": 1},
+                "totalAmount": {"$sum": "$totalAmount"},
+                "cancelledAmount": {
+                    "$sum": {"$cond": [{"$eq": ["$status", "Cancelled"]}, "$totalAmount", 0]}
+                }
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "day": "$_id.day",
+                "customerId": "$_id.customerId",
+                "customerName": 1,
+                "orderCount": 1,
+                "totalAmount": 1,
+                "cancelledAmount": 1
+            }
+        },
+        {"$merge": {"into": DAILY_CUSTOMER_STATS, "on": ["day", "customerId"], "whenMatched": "replace"}}
+    ], allowDiskUse=True).to_list(length=None)
+    
+    result = {
+        "dailyBuckets": await db[DAILY_STATS].count_documents(day_filter),
+        "customerBuckets": await db[DAILY_CUSTOMER_STATS].count_documents(day_filter)
+    }
+    info(f"Rebuilt order rollups: {result}")
+    return result
+
+
+async def compact_rollups(db: AsyncIOMotorDatabase) -> int:
+    """
+    Remove buckets emptied by status changes
+    
+    Args:
+        db: Database instance
+    
+    Returns:
+        Number of buckets removed
+    """
+    removed = 0
+    for collection in (DAILY_STATS, DAILY_CUSTOMER_STATS):
+        result = await db[collection].delete_many({"orderCount": {"$lte": 0}})
+        removed += result.deleted_count
+    info(f"Compacted order rollups: {removed} empty buckets removed")
+    return removed
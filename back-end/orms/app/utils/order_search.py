@@ -0,0 +1,218 @@
+"""
+Order Search
+Index-backed admin order search with relevance ordering
+
+Admin search used unanchored, case-insensitive $regex clauses on orderId,
+customerName and customerEmail, which no index can answer (every search
+scanned the whole collection). Orders now carry a `search` subdocument
+written at creation time and each kind of query maps onto a B-tree index:
+
+- Order IDs ("ORD-2026-0001", "ord-2026-000123"): exact or prefix range on
+  the unique orderId index
+- Emails (anything containing "@"): exact or prefix range on
+  search.email, the lowercased customer email
+- Words ("john", "jo do"): every word must be a prefix of a word of the
+  customer name or email local part; search.grams holds the edge n-grams
+  of those words and is indexed with orderDate, so the newest matches
+  come first
+
+Relevance: exact matches (whole order ID, whole email, whole words) rank
+above prefix matches, newest first within a tier. Ranking covers the
+first SEARCH_WINDOW matches in index order (the newest ones for word
+searches), so a one-letter query never sorts millions of documents;
+sort by date pages through every match and supports cursors.
+"""
+import re
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from app.config.settings import settings
+from app.utils.cursor import KeysetPage, SortSpec
+
+# Matches ranked by relevance per search
+SEARCH_WINDOW = 1000
+
+# Longest word prefix indexed (longer query words are matched on this prefix)
+MAX_GRAM_LENGTH = 12
+
+# Words of a query that are matched (the rest are ignored)
+MAX_QUERY_WORDS = 5
+
+_WORD = re.compile(r"[^\W_]+")
+_COMPLETE_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]{2,}$")
+
+# Upper bound for prefix ranges on ASCII and BMP strings
+_PREFIX_END = "\uffff"
+
+
+class SearchSort(str, Enum):
+    """Order of search results"""
+    RELEVANCE = "relevance"
+    DATE = "date"
+
+
+class SearchQuery(NamedTuple):
+    """Index-backed match, relevance score and scan order for one search"""
+    kind: str
+    match: Dict[str, Any]
+    score: Any
+    window_sort: SortSpec
+    date_sort: SortSpec
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words of a text (letters and digits, split on everything else)"""
+    return _WORD.findall((text or "").lower())
+
+
+def edge_grams(words: List[str]) -> List[str]:
+    """Prefixes of each word, up to MAX_GRAM_LENGTH characters"""
+    grams = dict.fromkeys(
+        word[:length]
+        for word in words
+        for length in range(1, min(len(word), MAX_GRAM_LENGTH) + 1)
+    )
+    return list(grams)
+
+
+def search_fields(customer_name: Optional[str], customer_email: Optional[str]) -> Dict[str, Any]:
+    """
+    The `search` subdocument stored on an order
+    
+    Args:
+        customer_name: Customer name on the order
+        customer_email: Customer email on the order
+    
+    Returns:
+        {"email": lowercased email, "words": name and email local part
+        words, "grams": edge n-grams of those words}
+    """
+    email = (customer_email or "").strip().lower()
+    words = list(dict.fromkeys(tokenize(customer_name) + tokenize(email.split("@")[0])))
+    return {
+        "email": email,
+        "words": words,
+        "grams": edge_grams(words)
+    }
+
+
+def _prefix(field: str, value: str) -> Dict[str, Any]:
+    """Range condition matching values that start with `value`"""
+    return {field: {"$gte": value, "$lt": value + _PREFIX_END}}
+
+
+def parse_search(text: Optional[str]) -> Optional[SearchQuery]:
+    """
+    Map a search box value onto an index-backed query
+    
+    Args:
+        text: Raw search text
+    
+    Returns:
+        SearchQuery, or None if the text contains nothing searchable
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    
+    order_prefix = settings.ORDER_ID_PREFIX.upper()
+    if text.upper().startswith(order_prefix) and (len(text) == len(order_prefix) or not text[len(order_prefix)].isalpha()):
+        order_id = text.upper()
+        return SearchQuery(
+            kind="orderId",
+            match=_prefix("orderId", order_id),
+            score={"$cond": [{"$eq": ["$orderId", order_id]}, 2, 1]},
+            # Order IDs grow with time, so ID order is creation order
+            window_sort=[("orderId", -1)],
+            date_sort=[("orderId", -1)]
+        )
+    
+    if "@" in text:
+        email = text.lower()
+        complete = bool(_COMPLETE_EMAIL.match(email))
+        return SearchQuery(
+            kind="email",
+            match={"search.email": email} if complete else _prefix("search.email", email),
+            score={"$cond": [{"$eq": ["$search.email", email]}, 2, 1]},
+            # An exact email reads its orders newest first from the index
+            window_sort=[("orderDate", -1), ("_id", -1)] if complete else [("search.email", 1)],
+            date_sort=[("orderDate", -1)]
+        )
+    
+    words = list(dict.fromkeys(word[:MAX_GRAM_LENGTH] for word in tokenize(text)))[:MAX_QUERY_WORDS]
+    if not words:
+        return None
+    return SearchQuery(
+        kind="words",
+        match={"search.grams": words[0]} if len(words) == 1 else {"search.grams": {"$all": words}},
+        score={"$add": [
+            {"$cond": [{"$in": [word, {"$ifNull": ["$search.words", []]}]}, 2, 1]}
+            for word in words
+        ]},
+        window_sort=[("orderDate", -1), ("_id", -1)],
+        date_sort=[("orderDate", -1)]
+    )
+
+
+def search_filter(query: Dict[str, Any], search: SearchQuery) -> Dict[str, Any]:
+    """Combine the list filters (status, customer, dates) with a search match"""
+    if not query:
+        return dict(search.match)
+    return {"$and": [query, search.match]}
+
+
+async def fetch_relevance_page(
+    collection,
+    query: Dict[str, Any],
+    search: SearchQuery,
+    skip: int,
+    limit: int,
+    projection: Optional[Dict[str, int]] = None
+) -> KeysetPage:
+    """
+    One page of matches ordered by relevance, then newest first
+    
+    Args:
+        collection: Motor orders collection
+        query: List filters without the search
+        search: Parsed search
+        skip: Offset into the ranked matches
+        limit: Page size
+        projection: Fields to return
+    
+    Returns:
+        KeysetPage without cursors (relevance pages are addressed by number)
+    """
+    window_projection = None
+    if projection is not None:
+        window_projection = {**projection, "orderId": 1, "orderDate": 1, "search.email": 1, "search.words": 1}
+    
+    pipeline = [
+        {"$match": search_filter(query, search)},
+        {"$sort": dict(search.window_sort)},
+        {"$limit": SEARCH_WINDOW}
+    ]
+    if window_projection is not None:
+        pipeline.append({"$project": window_projection})
+    pipeline += [
+        {"$addFields": {"_relevance": search.score}},
+        {"$sort": {"_relevance": -1, "orderDate": -1, "_id": -1}},
+        {"$skip": skip},
+        {"$limit": limit + 1},
+        {"$project": {"_relevance": 0, "search": 0}}
+    ]
+    
+    docs = await collection.aggregate(pipeline).to_list(length=limit + 1)
+    return KeysetPage(
+        docs=docs[:limit],
+        next_cursor=None,
+        prev_cursor=None,
+        has_next=len(docs) > limit,
+        has_previous=skip > 0
+    )
+
+
+def relevance_total(total: Optional[int], exact: bool) -> Tuple[Optional[int], bool]:
+    """Total items reachable in relevance order (at most SEARCH_WINDOW)"""
+    if total is not None and total > SEARCH_WINDOW:
+        return SEARCH_WINDOW, False
+    return total, exact
@@ -0,0 +1,82 @@
+"""
+Order Writes
+Order status changes and their side effects in as few round-trips as possible
+
+A status change used to be an update, one update per line item, a history
+insert, two or three rollup upserts and a re-read of the order, each
+awaited in turn. Here the order update returns the updated document
+(find_one_and_update), line item changes go out as one unordered
+bulk_write, and the item, history, rollup and outbox writes - which touch
+different collections and do not depend on each other - are sent
+concurrently. A request waits for two round-trips after the order is
+read, however many items the order has.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from app.utils.order_rollups import record_status_change
+
+
+def item_updates(changes: Iterable[tuple]) -> List[UpdateOne]:
+    """
+    Build line item updates for one bulk_write
+    
+    Args:
+        changes: (item _id, fields to $set) pairs
+    
+    Returns:
+        UpdateOne operations; each targets a different item, so they can
+        be applied unordered
+    """
+    return [UpdateOne({"_id": item_id}, {"$set": fields}) for item_id, fields in changes]
+
+
+async def apply_status_change(
+    db: AsyncIOMotorDatabase,
+    order: Dict,
+    new_status: str,
+    update: Dict,
+    history_doc: Dict,
+    items: Optional[List[UpdateOne]] = None,
+    expected: Optional[Dict] = None,
+    follow_ups: Iterable[Callable[[], Awaitable]] = ()
+) -> Optional[Dict]:
+    """
+    Update an order and write everything that goes with the change
+    
+    The order is only updated if its status is still the one that was
+    read (plus any `expected` fields), so two concurrent requests cannot
+    both apply the same transition.
+    
+    Args:
+        db: Database instance
+        order: Order document as read by the handler
+        new_status: Status after the change (may equal the current one)
+        update: Fields to $set on the order
+        history_doc: Order history entry to insert
+        items: Line item updates to apply in the same wave
+        expected: Extra fields the stored order must still match
+        follow_ups: Further writes to issue with the batch (e.g. outbox events)
+    
+    Returns:
+        Updated order document, or None if the order changed in the meantime
+    """
+    updated = await db.orders.find_one_and_update(
+        {"_id": order["_id"], "status": order["status"], **(expected or {})},
+        {"$set": update},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated is None:
+        return None
+    
+    writes = [
+        db.order_history.insert_one(history_doc),
+        record_status_change(db, order, order["status"], new_status)
+    ]
+    if items:
+        writes.append(db.order_items.bulk_write(items, ordered=False))
+    writes.extend(follow_up() for follow_up in follow_ups)
+    
+    await asyncio.gather(*writes)
+    return updated
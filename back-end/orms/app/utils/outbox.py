@@ -0,0 +1,383 @@
+"""
+Statistics Outbox
+Reliable, batched delivery of customer statistics deltas to CRMS
+
+Handlers record each delta in the outbox collection right after the write
+that caused it, instead of awaiting CRMS inline. A background dispatcher
+started in the application lifespan claims due events with a lease, sums
+all pending deltas of the same customer into one, and sends them through
+the CRMS batch endpoint. Failed batches are retried with exponential
+backoff. Delivery is at-least-once: a crash between the CRMS call and the
+outbox update sends that batch again after the lease expires. Each delta
+carries the IDs of its events and CRMS skips events it already applied,
+so a resent delta is not counted twice.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from app.config.settings import settings
+from app.utils.logger import info, warning, error
+
+OUTBOX_COLLECTION = "outbox"
+STATISTICS_TOPIC = "customer.statistics"
+
+# Largest batch the CRMS statistics/deltas endpoint accepts
+MAX_DELTAS_PER_CALL = 500
+
+DeliverDeltas = Callable[[List[Dict]], Awaitable[bool]]
+
+
+def coalesce_deltas(events: Iterable[Dict]) -> List[Dict]:
+    """
+    Combine outbox events into one delta per customer
+    
+    Numeric fields are summed; other fields (last order/complaint dates)
+    keep the latest value. Each delta lists its event IDs. CRMS applies or
+    skips the events of a delta together, so an event claimed before (it
+    may already have been applied) is sent as a delta of its own.
+    
+    Args:
+        events: Outbox documents with customerId and delta
+    
+    Returns:
+        Deltas with a customerId and eventIds each, in first-seen order
+    """
+    merged: Dict[str, Dict] = {}
+    deltas: List[Dict] = []
+    for event in events:
+        customer_id = event["customerId"]
+        resent = event.get("claims", 0) > 1
+        combined = None if resent else merged.get(customer_id)
+        if combined is None:
+            combined = {"customerId": customer_id, "eventIds": []}
+            deltas.append(combined)
+            if not resent:
+                merged[customer_id] = combined
+        combined["eventIds"].append(str(event["_id"]))
+        for field, value in event["delta"].items():
+            if value is None:
+                continue
+            current = combined.get(field)
+            if current is None:
+                combined[field] = value
+            elif isinstance(value, (int, float)):
+                combined[field] = current + value
+            elif value > current:
+                combined[field] = value
+    return deltas
+
+
+class StatisticsOutbox:
+    """
+    Outbox writer and background dispatcher for CRMS statistics deltas
+    
+    Several processes may run the dispatcher against the same collection;
+    each claims events with a unique claim ID, so an event is only sent by
+    one of them at a time.
+    """
+    
+    def __init__(
+        self,
+        batch_size: int = None,
+        max_attempts: int = None,
+        retry_base_delay: float = None,
+        retry_max_delay: float = None,
+        poll_interval: float = None,
+        flush_delay: float = None,
+        lease: float = None
+    ):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.retry_base_delay = settings.OUTBOX_RETRY_BASE_DELAY if retry_base_delay is None else retry_base_delay
+        self.retry_max_delay = settings.OUTBOX_RETRY_MAX_DELAY if retry_max_delay is None else retry_max_delay
+        self.poll_interval = poll_interval or settings.OUTBOX_POLL_INTERVAL
+        self.flush_delay = settings.OUTBOX_FLUSH_DELAY if flush_delay is None else flush_delay
+        self.lease = lease or settings.OUTBOX_LEASE
+        
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self.deliver: Optional[DeliverDeltas] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.stats = {
+            "published": 0,
+            "delivered": 0,
+            "deltasSent": 0,
+            "calls": 0,
+            "retried": 0,
+            "failed": 0
+        }
+        self.last_delivery_lag: Optional[float] = None
+        self.max_delivery_lag: float = 0.0
+    
+    @property
+    def running(self) -> bool:
+        """Whether the dispatcher task is running"""
+        return self._task is not None
+    
+    @property
+    def outbox(self):
+        """Outbox collection"""
+        return self.db[OUTBOX_COLLECTION]
+    
+    async def start(self, db: AsyncIOMotorDatabase, deliver: DeliverDeltas):
+        """
+        Start the dispatcher (called from the application lifespan)
+        
+        Args:
+            db: Database holding the outbox collection
+            deliver: Sends a list of deltas to CRMS, returns True on success
+        """
+        if self.running:
+            return
+        
+        self.db = db
+        self.deliver = deliver
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        info(f"📤 Statistics outbox dispatcher started (batch {self.batch_size}, poll {self.poll_interval}s)")
+    
+    async def stop(self, timeout: float = 10.0):
+        """
+        Flush due events and stop the dispatcher (called from the application lifespan)
+        
+        Events that could not be sent stay in the outbox and are delivered
+        after the next start.
+        """
+        if not self.running:
+            return
+        
+        self._stopping.set()
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            warning("Statistics outbox did not flush before shutdown")
+        except Exception as e:
+            error(f"❌ Statistics outbox dispatcher failed: {str(e)}")
+        self._task = None
+        info("Statistics outbox dispatcher stopped")
+    
+    async def publish(self, customer_id: str, delta: Dict, db: AsyncIOMotorDatabase = None, session=None) -> bool:
+        """
+        Record a statistics delta for delivery to CRMS
+        
+        Only writes to the local database, so it costs one insert instead
+        of a CRMS round-trip. Pass the session of the surrounding write to
+        commit the event with it when running inside a transaction.
+        
+        Args:
+            customer_id: CRMS customer ID
+            delta: Counter changes and optional dates (CRMS delta fields)
+            db: Database to write to (defaults to the service database)
+            session: Optional client session of the surrounding write
+        
+        Returns:
+            True if the event was recorded, False otherwise
+        """
+        if db is None:
+            db = self.db
+        if db is None:
+            from app.config.database import Database
+            db = Database.db
+        if db is None:
+            error(f"❌ No database for statistics outbox - dropping delta for customer {customer_id}")
+            return False
+        
+        now = datetime.utcnow()
+        await db[OUTBOX_COLLECTION].insert_one(
+            {
+                "topic": STATISTICS_TOPIC,
+                "customerId": customer_id,
+                "delta": delta,
+                "status": "pending",
+                "attempts": 0,
+                "claims": 0,
+                "nextAttemptAt": now,
+                "lockedUntil": None,
+                "claimId": None,
+                "lastError": None,
+                "createdAt": now,
+                "deliveredAt": None
+            },
+            session=session
+        )
+        self.stats["published"] += 1
+        
+        if self._wake is not None:
+            self._wake.set()
+        return True
+    
+    async def _claim_due(self) -> List[Dict]:
+        """Lease up to batch_size due events (new, retries and expired leases)"""
+        now = datetime.utcnow()
+        due = {
+            "topic": STATISTICS_TOPIC,
+            "$or": [
+                {"status": "pending", "nextAttemptAt": {"$lte": now}},
+                {"status": "sending", "lockedUntil": {"$lt": now}}
+            ]
+        }
+        candidates = await self.outbox.find(due, {"_id": 1}).sort("nextAttemptAt", 1).limit(
+            self.batch_size
+        ).to_list(length=self.batch_size)
+        if not candidates:
+            return []
+        
+        claim_id = ObjectId()
+        await self.outbox.update_many(
+            {"_id": {"$in": [doc["_id"] for doc in candidates]}, **due},
+            {
+                "$set": {
+                    "status": "sending",
+                    "lockedUntil": now + timedelta(seconds=self.lease),
+                    "claimId": claim_id
+                },
+                "$inc": {"claims": 1}
+            }
+        )
+        return await self.outbox.find({"claimId": claim_id}).to_list(length=None)
+    
+    async def _send(self, deltas: List[Dict]) -> Optional[str]:
+        """Send deltas in CRMS-sized chunks; returns an error message or None"""
+        for start in range(0, len(deltas), MAX_DELTAS_PER_CALL):
+            chunk = deltas[start:start + MAX_DELTAS_PER_CALL]
+            self.stats["calls"] += 1
+            try:
+                if not await self.deliver(chunk):
+                    return "Customer service rejected the statistics batch"
+            except Exception as e:
+                return str(e)
+            self.stats["deltasSent"] += len(chunk)
+        return None
+    
+    async def _record_results(self, events: List[Dict], failure: Optional[str]):
+        """
+        Mark a claimed batch delivered, or schedule its retry
+        
+        Only events still held under this batch's claim are updated: if the
+        lease expired and another dispatcher reclaimed them, that dispatcher
+        records the outcome.
+        """
+        now = datetime.utcnow()
+        claim_id = events[0]["claimId"]
+        
+        if failure is None:
+            result = await self.outbox.update_many(
+                {"_id": {"$in": [event["_id"] for event in events]}, "claimId": claim_id},
+                {
+                    "$set": {"status": "delivered", "deliveredAt": now, "lockedUntil": None},
+                    "$inc": {"attempts": 1}
+                }
+            )
+            if result.modified_count < len(events):
+                warning(f"{len(events) - result.modified_count} statistics events were reclaimed before delivery was recorded")
+            self.stats["delivered"] += result.modified_count
+            self.last_delivery_lag = max((now - event["createdAt"]).total_seconds() for event in events)
+            self.max_delivery_lag = max(self.max_delivery_lag, self.last_delivery_lag)
+            return
+        
+        operations = []
+        for event in events:
+            attempts = event.get("attempts", 0) + 1
+            if attempts >= self.max_attempts:
+                self.stats["failed"] += 1
+                error(
+                    f"❌ Statistics delta for customer {event['customerId']} failed after "
+                    f"{attempts} attempts: {failure}"
+                )
+                update = {"status": "failed", "attempts": attempts, "lastError": failure, "lockedUntil": None}
+            else:
+                self.stats["retried"] += 1
+                delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+                update = {
+                    "status": "pending",
+                    "attempts": attempts,
+                    "nextAttemptAt": now + timedelta(seconds=delay),
+                    "lastError": failure,
+                    "lockedUntil": None
+                }
+            operations.append(UpdateOne({"_id": event["_id"], "claimId": claim_id}, {"$set": update}))
+        
+        await self.outbox.bulk_write(operations, ordered=False)
+        warning(f"Statistics batch of {len(events)} events failed: {failure}")
+    
+    async def dispatch_due(self) -> int:
+        """
+        Deliver one batch of due events
+        
+        Returns:
+            Number of events claimed
+        """
+        events = await self._claim_due()
+        if not events:
+            return 0
+        
+        deltas = coalesce_deltas(events)
+        failure = await self._send(deltas)
+        await self._record_results(events, failure)
+        if failure is None:
+            info(f"📤 Delivered {len(events)} statistics events as {len(deltas)} customer deltas")
+        return len(events)
+    
+    async def _run(self):
+        """Dispatch on new events or every poll interval until stopped"""
+        while not self._stopping.is_set():
+            claimed = 0
+            try:
+                claimed = await self.dispatch_due()
+            except Exception as e:
+                error(f"❌ Statistics outbox dispatch failed: {str(e)}")
+            if claimed >= self.batch_size:
+                continue
+            
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            
+            # Let a burst of events for the same customers collect into one batch
+            if self.flush_delay and not self._stopping.is_set():
+                await asyncio.sleep(self.flush_delay)
+        
+        # Final flush of events published just before shutdown
+        while await self.dispatch_due() >= self.batch_size:
+            pass
+    
+    async def outbox_stats(self) -> Dict:
+        """Get queue depth, delivery lag, counters and outbox status counts"""
+        counts = {}
+        oldest_pending_age = None
+        if self.db is not None:
+            cursor = self.outbox.aggregate([
+                {"$match": {"topic": STATISTICS_TOPIC}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ])
+            counts = {entry["_id"]: entry["count"] async for entry in cursor}
+            
+            oldest = await self.outbox.find_one(
+                {"topic": STATISTICS_TOPIC, "status": {"$in": ["pending", "sending"]}},
+                {"createdAt": 1},
+                sort=[("createdAt", 1)]
+            )
+            if oldest is not None:
+                oldest_pending_age = round((datetime.utcnow() - oldest["createdAt"]).total_seconds(), 3)
+        
+        return {
+            "running": self.running,
+            "queueDepth": counts.get("pending", 0) + counts.get("sending", 0),
+            "oldestPendingAgeSeconds": oldest_pending_age,
+            "lastDeliveryLagSeconds": round(self.last_delivery_lag, 3) if self.last_delivery_lag is not None else None,
+            "maxDeliveryLagSeconds": round(self.max_delivery_lag, 3),
+            "counters": dict(self.stats),
+            "outbox": counts
+        }
+
+
+# Global outbox instance
+statistics_outbox = StatisticsOutbox()
@@ -0,0 +1,160 @@
+"""
+Sequence Generator
+Atomic, per-(prefix, year) counters backed by a MongoDB counters collection
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+COUNTERS_COLLECTION = "counters"
+
+
+class SequenceGenerator:
+    """
+    Issues monotonically increasing sequence numbers per key
+    
+    Each key (e.g. "ORD-2026") is a document in the counters collection that
+    is advanced with a single atomic ``find_one_and_update`` + ``$inc``, so
+    concurrent creates never race for the same number.
+    
+    With ``block_size`` > 1 the generator reserves a range of numbers per
+    round-trip and hands them out from memory. Numbers reserved but not used
+    before a restart are skipped, so IDs stay unique but may have gaps.
+    """
+    
+    def __init__(self, block_size: int = 1, collection_name: str = COUNTERS_COLLECTION):
+        self.block_size = max(1, block_size)
+        self.collection_name = collection_name
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self._seeded: set = set()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._seed_locks: Dict[str, asyncio.Lock] = {}
+    
+    def _lock_for(self, key: str) -> asyncio.Lock:
+        """Get the per-key lock guarding the in-memory block"""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+    
+    def _seed_lock_for(self, key: str) -> asyncio.Lock:
+        """Get the per-key lock that lets one caller seed while the others wait"""
+        lock = self._seed_locks.get(key)
+        if lock is None:
+            lock = self._seed_locks[key] = asyncio.Lock()
+        return lock
+    
+    async def _seed(
+        self,
+        db: AsyncIOMotorDatabase,
+        key: str,
+        seed: Optional[Callable[[], Awaitable[int]]]
+    ):
+        """
+        Make sure the counter starts after any IDs issued before it existed
+        
+        ``$max`` is idempotent, so concurrent workers seeding the same key
+        converge on the same value. Within a process, concurrent callers wait
+        for the first one, so a cold-start burst scans for the seed once.
+        """
+        if key in self._seeded:
+            return
+        
+        async with self._seed_lock_for(key):
+            if key in self._seeded:
+                return
+        
+            counters = db[self.collection_name]
+            if seed is not None and await counters.find_one({"_id": key}, {"_id": 1}) is None:
+                last_value = await seed()
+                try:
+                    await counters.update_one(
+                        {"_id": key},
+                        {"$max": {"seq": last_value}},
+                        upsert=True
+                    )
+                except DuplicateKeyError:
+                    # Another worker created the counter first; retry the $max on it
+                    await counters.update_one({"_id": key}, {"$max": {"seq": last_value}})
+        
+            self._seeded.add(key)
+    
+    async def _reserve(self, db: AsyncIOMotorDatabase, key: str, count: int) -> int:
+        """
+        Atomically advance the counter by ``count``
+        
+        Returns:
+            The last number of the reserved range
+        """
+        counters = db[self.collection_name]
+        for attempt in range(2):
+            try:
+                counter = await counters.find_one_and_update(
+                    {"_id": key},
+                    {"$inc": {"seq": count}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                return counter["seq"]
+            except DuplicateKeyError:
+                # Two upserts raced on a brand-new key; the retry hits the existing doc
+                if attempt == 1:
+                    raise
+    
+    async def next_value(
+        self,
+        db: AsyncIOMotorDatabase,
+        key: str,
+        seed: Optional[Callable[[], Awaitable[int]]] = None
+    ) -> int:
+        """
+        Get the next sequence number for a key
+        
+        Args:
+            db: Database instance
+            key: Counter key (e.g. "ORD-2026")
+            seed: Optional coroutine returning the highest number already
+                issued for this key, used once to initialise a new counter
+        
+        Returns:
+            Next sequence number
+        """
+        await self._seed(db, key, seed)
+        
+        if self.block_size == 1:
+            return await self._reserve(db, key, 1)
+        
+        async with self._lock_for(key):
+            next_number, end = self._blocks.get(key, (1, 0))
+            if next_number > end:
+                end = await self._reserve(db, key, self.block_size)
+                next_number = end - self.block_size + 1
+            self._blocks[key] = (next_number + 1, end)
+            return next_number
+
+
+async def last_issued_number(collection, field: str, prefix: str) -> int:
+    """
+    Find the highest number already issued for an ID prefix
+    
+    Only used to seed a counter that does not exist yet, so the prefix scan
+    runs once per key instead of once per insert.
+    
+    Args:
+        collection: Collection holding the IDs
+        field: ID field name (e.g. "orderId")
+        prefix: ID prefix including year (e.g. "ORD-2026-")
+    
+    Returns:
+        Highest issued number, or 0 if none
+    """
+    last_doc = await collection.find_one(
+        {field: {"$regex": f"^{prefix}"}},
+        {field: 1},
+        sort=[(field, -1)]
+    )
+    if not last_doc:
+        return 0
+    return int(last_doc[field].split("-")[-1])
@@ -0,0 +1,185 @@
+"""
+Pagination total tests
+Checks the includeTotal modes: exact counts every time, estimated reuses
+filtered counts within the TTL and uses the metadata count for unfiltered
+lists, none skips counting, and a limit bounds the count
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.counting import CountCache, TotalMode, count_cache, count_total, normalize_filter
+from app.utils.pagination import calculate_pagination
+
+GRID_REFRESHES = 100
+
+
+class CountingCollection:
+    """Stand-in collection that records count calls"""
+    
+    def __init__(self, name="orders", documents=1234):
+        self.name = name
+        self.documents = documents
+        self.count_calls = 0
+        self.estimate_calls = 0
+    
+    async def count_documents(self, query, limit=0):
+        self.count_calls += 1
+        return min(self.documents, limit) if limit else self.documents
+    
+    async def estimated_document_count(self):
+        self.estimate_calls += 1
+        return self.documents
+
+
+def print_test(test_name):
+    """Print test name"""
+    print(f"\n{'─'*60}")
+    print(f"  Test: {test_name}")
+    print(f"{'─'*60}")
+
+
+def print_result(passed, message):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {message}")
+    return passed
+
+
+async def test_exact_counts_every_request():
+    """exact keeps the previous behaviour"""
+    print_test(f"{GRID_REFRESHES} refreshes with includeTotal=exact")
+    
+    orders = CountingCollection()
+    for _ in range(GRID_REFRESHES):
+        result = await count_total(orders, {"status": "Placed"}, TotalMode.EXACT)
+    
+    return print_result(
+        orders.count_calls == GRID_REFRESHES and result.exact,
+        f"{orders.count_calls} count_documents calls, totalExact={result.exact}"
+    )
+
+
+async def test_estimated_reuses_filtered_count():
+    """estimated counts a filter once per TTL"""
+    print_test(f"{GRID_REFRESHES} refreshes with includeTotal=estimated")
+    
+    count_cache.clear()
+    orders = CountingCollection()
+    results = [
+        await count_total(orders, {"status": "Placed", "customerId": "c-1"}, TotalMode.ESTIMATED)
+        for _ in range(GRID_REFRESHES)
+    ]
+    
+    passed = print_result(orders.count_calls == 1, f"{orders.count_calls} count_documents call")
+    passed &= print_result(
+        results[0].exact and not any(result.exact for result in results[1:]),
+        "First count exact, cached repeats marked estimated"
+    )
+    
+    await count_total(orders, {"customerId": "c-1", "status": "Placed"}, TotalMode.ESTIMATED)
+    passed &= print_result(orders.count_calls == 1, "Same filter with keys reordered hits the cache")
+    
+    await count_total(CountingCollection("order_items"), {"status": "Placed", "customerId": "c-1"}, TotalMode.ESTIMATED)
+    passed &= print_result(count_cache.stats()["size"] == 2, "Other collection cached separately")
+    return passed
+
+
+async def test_estimated_unfiltered_uses_metadata():
+    """estimated on an empty filter never runs count_documents"""
+    print_test("Unfiltered list with includeTotal=estimated")
+    
+    orders = CountingCollection()
+    result = await count_total(orders, {}, TotalMode.ESTIMATED)
+    
+    return print_result(
+        orders.estimate_calls == 1 and orders.count_calls == 0 and not result.exact,
+        f"estimated_document_count used, total={result.total}, totalExact={result.exact}"
+    )
+
+
+async def test_none_skips_count():
+    """none returns no total and pagination still works"""
+    print_test("includeTotal=none")
+    
+    orders = CountingCollection()
+    result = await count_total(orders, {"status": "Placed"}, TotalMode.NONE)
+    skip, pagination = calculate_pagination(3, 20, result.total, result.exact)
+    
+    passed = print_result(orders.count_calls == 0 and result.total is None, "No count issued")
+    passed &= print_result(
+        skip == 40 and pagination.totalItems is None and pagination.totalPages is None and not pagination.totalExact,
+        f"skip={skip}, totalItems={pagination.totalItems}, totalExact={pagination.totalExact}"
+    )
+    return passed
+
+
+async def test_limited_count():
+    """limit stops the count and is part of the cache key"""
+    print_test("Count bounded by limit")
+    
+    count_cache.clear()
+    orders = CountingCollection()
+    bounded = await count_total(orders, {"status": "Placed"}, TotalMode.ESTIMATED, limit=1001)
+    full = await count_total(orders, {"status": "Placed"}, TotalMode.ESTIMATED)
+    
+    passed = print_result(bounded.total == 1001 and full.total == 1234, f"total={bounded.total} with limit, {full.total} without")
+    passed &= print_result(orders.count_calls == 2, "Bounded and full counts cached separately")
+    return passed
+
+
+def test_cache_ttl_and_eviction():
+    """Entries expire after the TTL and the LRU bound holds"""
+    print_test("Count cache TTL and eviction")
+    
+    now = [0.0]
+    cache = CountCache(max_size=2, ttl=10, clock=lambda: now[0])
+    key = ("orders", normalize_filter({"status": "Placed", "orderDate": {"$gte": datetime(2026, 1, 1)}}), None)
+    cache.put(key, 5)
+    
+    now[0] = 9.9
+    passed = print_result(cache.get(key) == 5, "Served within TTL")
+    now[0] = 10.0
+    passed &= print_result(cache.get(key) is None, "Expired at TTL")
+    
+    for n in range(3):
+        cache.put(("orders", str(n)), n)
+    passed &= print_result(
+        cache.stats()["size"] == 2 and cache.stats()["evictions"] == 1 and cache.get(("orders", "0")) is None,
+        "Least recently used entry evicted at max size"
+    )
+    return passed
+
+
+async def run_tests():
+    """Run the async tests in order"""
+    return [
+        await test_exact_counts_every_request(),
+        await test_estimated_reuses_filtered_count(),
+        await test_estimated_unfiltered_uses_metadata(),
+        await test_none_skips_count(),
+        await test_limited_count(),
+        test_cache_ttl_and_eviction()
+    ]
+
+
+def main():
+    """Run all pagination total tests"""
+    print("\n" + "="*60)
+    print("  ORMS - Pagination Total Tests")
+    print("="*60)
+    
+    passed = all(asyncio.run(run_tests()))
+    
+    print("\n" + "="*60)
+    print(f"  Pagination Total Testing {'Passed' if passed else 'Failed'}")
+    print("="*60 + "\n")
+    
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Customer Cache Tests
+Checks the CRMS profile cache: TTL hits, negative caching of 404s,
+single-flight loads for concurrent misses (including a cancelled first
+caller), invalidation by user or customer ID, and LRU eviction
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.customer_cache import CustomerCache
+
+CONCURRENT_REQUESTS = 50
+
+
+class FakeCRMS:
+    """Stand-in for the CRMS user lookup that counts calls"""
+    
+    def __init__(self, customers=None, delay=0.0):
+        self.customers = customers if customers is not None else {}
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+    
+    def loader(self, user_id):
+        async def load():
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("CRMS unavailable")
+            return self.customers.get(user_id)
+        return load
+
+
+def customer(user_id, customer_id, status="Active"):
+    """Customer profile as returned by CRMS"""
+    return {"userId": user_id, "customerId": customer_id, "customerStatus": status}
+
+
+def print_test(test_name):
+    """Print test name"""
+    print(f"\n{'─'*60}")
+    print(f"  Test: {test_name}")
+    print(f"{'─'*60}")
+
+
+def print_result(passed, message):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {message}")
+    return passed
+
+
+def make_cache(now, **overrides):
+    """Cache driven by a fake clock"""
+    options = dict(max_size=100, ttl=300, negative_ttl=30)
+    options.update(overrides)
+    return CustomerCache(clock=lambda: now[0], **options)
+
+
+async def test_ttl_hits():
+    """Profiles are served from memory until the TTL"""
+    print_test("Hits within the TTL")
+    
+    now = [0.0]
+    crms = FakeCRMS({"u1": customer("u1", "c1")})
+    cache = make_cache(now)
+    
+    for _ in range(10):
+        profile = await cache.get_or_load("u1", crms.loader("u1"))
+    passed = print_result(crms.calls == 1 and profile["customerId"] == "c1", f"{crms.calls} CRMS call for 10 lookups")
+    
+    profile["customerStatus"] = "Suspended"
+    passed &= print_result(
+        (await cache.get_or_load("u1", crms.loader("u1")))["customerStatus"] == "Active",
+        "Callers get copies; the cached profile is unchanged"
+    )
+    
+    now[0] = 300.0
+    await cache.get_or_load("u1", crms.loader("u1"))
+    passed &= print_result(crms.calls == 2, "Reloaded after the TTL")
+    return passed
+
+
+async def test_negative_caching():
+    """Users without a profile are remembered for the negative TTL; errors are not cached"""
+    print_test("Negative caching")
+    
+    now = [0.0]
+    crms = FakeCRMS()
+    cache = make_cache(now)
+    
+    results = [await cache.get_or_load("ghost", crms.loader("ghost")) for _ in range(5)]
+    passed = print_result(
+        crms.calls == 1 and results == [None] * 5 and cache.stats()["negativeHits"] == 4,
+        f"{crms.calls} CRMS call for 5 lookups of an unknown user"
+    )
+    
+    now[0] = 30.0
+    await cache.get_or_load("ghost", crms.loader("ghost"))
+    passed &= print_result(crms.calls == 2, "Unknown user rechecked after the negative TTL")
+    
+    crms.fail = True
+    for _ in range(2):
+        try:
+            await cache.get_or_load("u2", crms.loader("u2"))
+        except ConnectionError:
+            pass
+    passed &= print_result(crms.calls == 4, "CRMS failures are not cached")
+    return passed
+
+
+async def test_single_flight():
+    """Concurrent misses for one user share one CRMS call"""
+    print_test(f"{CONCURRENT_REQUESTS} concurrent lookups of an uncached user")
+    
+    now = [0.0]
+    crms = FakeCRMS({"u1": customer("u1", "c1")}, delay=0.05)
+    cache = make_cache(now)
+    
+    profiles = await asyncio.gather(*[
+        cache.get_or_load("u1", crms.loader("u1")) for _ in range(CONCURRENT_REQUESTS)
+    ])
+    stats = cache.stats()
+    
+    passed = print_result(
+        crms.calls == 1 and all(profile["customerId"] == "c1" for profile in profiles),
+        f"{crms.calls} CRMS call, {stats['coalesced']} lookups waited on it"
+    )
+    
+    crms.fail = True
+    results = await asyncio.gather(*[
+        cache.get_or_load("u9", crms.loader("u9")) for _ in range(5)
+    ], return_exceptions=True)
+    passed &= print_result(
+        crms.calls == 2 and all(isinstance(result, ConnectionError) for result in results),
+        "A failed load is reported to every waiter"
+    )
+    return passed
+
+
+async def test_cancelled_waiter():
+    """Cancelling the request that started a load does not cancel the others"""
+    print_test("Cancelled first caller")
+    
+    now = [0.0]
+    crms = FakeCRMS({"u1": customer("u1", "c1")}, delay=0.05)
+    cache = make_cache(now)
+    
+    first = asyncio.create_task(cache.get_or_load("u1", crms.loader("u1")))
+    await asyncio.sleep(0.01)
+    followers = [asyncio.create_task(cache.get_or_load("u1", crms.loader("u1"))) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    first.cancel()
+    results = await asyncio.gather(first, *followers, return_exceptions=True)
+    
+    passed = print_result(isinstance(results[0], asyncio.CancelledError), "First caller cancelled")
+    passed &= print_result(
+        all(isinstance(result, dict) and result["customerId"] == "c1" for result in results[1:]),
+        "Waiting callers still get the profile"
+    )
+    passed &= print_result(
+        crms.calls == 1 and (await cache.get_or_load("u1", crms.loader("u1")))["customerId"] == "c1" and crms.calls == 1,
+        f"{crms.calls} CRMS call; the profile is cached"
+    )
+    
+    # Every waiter gone: the load still completes and fills the cache
+    lone = asyncio.create_task(cache.get_or_load("u2", crms.loader("u2")))
+    await asyncio.sleep(0.01)
+    lone.cancel()
+    await asyncio.sleep(0.06)
+    await cache.get_or_load("u2", crms.loader("u2"))
+    passed &= print_result(crms.calls == 2 and cache.stats()["negativeHits"] == 1, "Load without waiters still cached")
+    return passed
+
+
+async def test_invalidation():
+    """CRMS invalidation drops entries by user or customer ID"""
+    print_test("Invalidation hooks")
+    
+    now = [0.0]
+    crms = FakeCRMS({"u1": customer("u1", "c1"), "u2": customer("u2", "c2")})
+    cache = make_cache(now)
+    await cache.get_or_load("u1", crms.loader("u1"))
+    await cache.get_or_load("u2", crms.loader("u2"))
+    
+    crms.customers["u1"] = customer("u1", "c1", status="Suspended")
+    passed = print_result(cache.invalidate(customer_id="c1") == 1, "Invalidated by customer ID")
+    passed &= print_result(
+        (await cache.get_or_load("u1", crms.loader("u1")))["customerStatus"] == "Suspended",
+        "Next lookup reads the new status"
+    )
+    passed &= print_result(cache.invalidate(user_id="u2") == 1 and cache.invalidate(user_id="u2") == 0, "Invalidated by user ID")
+    
+    # A new profile replaces a cached "no profile" answer
+    await cache.get_or_load("u3", crms.loader("u3"))
+    crms.customers["u3"] = customer("u3", "c3")
+    cache.invalidate(user_id="u3", customer_id="c3")
+    passed &= print_result(
+        (await cache.get_or_load("u3", crms.loader("u3")))["customerId"] == "c3",
+        "Negative entry cleared when the customer is created"
+    )
+    
+    # A profile read before the change must not be cached after it
+    crms.delay = 0.05
+    load = asyncio.create_task(cache.get_or_load("u4", crms.loader("u4")))
+    await asyncio.sleep(0.01)
+    cache.invalidate(user_id="u4")
+    await load
+    passed &= print_result(cache.invalidate(user_id="u4") == 0, "Load in flight during invalidation is not cached")
+    return passed
+
+
+async def test_lru_eviction():
+    """The least recently used profile is evicted at max size"""
+    print_test("LRU eviction")
+    
+    now = [0.0]
+    crms = FakeCRMS({f"u{n}": customer(f"u{n}", f"c{n}") for n in range(3)})
+    cache = make_cache(now, max_size=2)
+    
+    await cache.get_or_load("u0", crms.loader("u0"))
+    await cache.get_or_load("u1", crms.loader("u1"))
+    await cache.get_or_load("u0", crms.loader("u0"))
+    await cache.get_or_load("u2", crms.loader("u2"))
+    stats = cache.stats()
+    
+    passed = print_result(stats["size"] == 2 and stats["evictions"] == 1, f"Size {stats['size']}, evictions {stats['evictions']}")
+    passed &= print_result(cache.invalidate(customer_id="c1") == 0, "Evicted profile no longer indexed by customer ID")
+    passed &= print_result(stats["hitRate"] == 0.25, f"Hit rate {stats['hitRate']}")
+    return passed
+
+
+async def run_tests():
+    """Run the tests in order"""
+    return [
+        await test_ttl_hits(),
+        await test_negative_caching(),
+        await test_single_flight(),
+        await test_cancelled_waiter(),
+        await test_invalidation(),
+        await test_lru_eviction()
+    ]
+
+
+def main():
+    """Run all customer cache tests"""
+    print("\n" + "="*60)
+    print("  ORMS - Customer Cache Tests")
+    print("="*60)
+    
+    passed = all(asyncio.run(run_tests()))
+    
+    print("\n" + "="*60)
+    print(f"  Customer Cache Testing {'Passed' if passed else 'Failed'}")
+    print("="*60 + "\n")
+    
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
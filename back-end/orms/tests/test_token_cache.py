@@ -0,0 +1,149 @@
+"""
+Token cache tests
+Checks that verified JWT payloads are reused until exp, evicted in LRU
+order, and that tampered or expired tokens are never served from cache
+"""
+import os
+import sys
+import time
+
+from jose import jwt, JWTError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.config.settings import settings
+from app.utils.token_cache import TokenCache, decode_access_token, token_cache
+
+REPEATED_REQUESTS = 20000
+
+
+def print_test(test_name):
+    """Print test name"""
+    print(f"\n{'─'*60}")
+    print(f"  Test: {test_name}")
+    print(f"{'─'*60}")
+
+
+def print_result(passed, message):
+    """Print test result"""
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {message}")
+    return passed
+
+
+def make_token(user_id="user-1", expires_in=3600):
+    """Sign a token the way ATHS does"""
+    return jwt.encode(
+        {"userId": user_id, "role": "Customer", "exp": int(time.time()) + expires_in},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM
+    )
+
+
+def test_repeated_token_hits_cache():
+    """A reused bearer token is verified once"""
+    print_test(f"{REPEATED_REQUESTS} requests with the same token")
+    
+    token_cache.clear()
+    hits_before = token_cache.hits
+    token = make_token()
+    
+    started = time.perf_counter()
+    for _ in range(REPEATED_REQUESTS):
+        decode_access_token(token)
+    cached = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    for _ in range(REPEATED_REQUESTS):
+        jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    uncached = time.perf_counter() - started
+    
+    hits = token_cache.hits - hits_before
+    print(f"   Cached:   {cached / REPEATED_REQUESTS * 1e6:.1f} µs/request")
+    print(f"   Uncached: {uncached / REPEATED_REQUESTS * 1e6:.1f} µs/request")
+    return print_result(hits == REPEATED_REQUESTS - 1, f"{hits} cache hits, 1 verification")
+
+
+def test_entry_expires_at_exp():
+    """A cached payload is not served after the token's exp"""
+    print_test("Cached payload expires with the token")
+    
+    now = [1000.0]
+    cache = TokenCache(max_size=10, clock=lambda: now[0])
+    cache.put("token", {"userId": "user-1", "exp": 1060})
+    
+    fresh = cache.get("token") is not None
+    now[0] = 1060.0
+    expired = cache.get("token") is None
+    
+    return print_result(fresh and expired and cache.stats()["size"] == 0, "Hit before exp, miss at exp")
+
+
+def test_lru_eviction():
+    """The least recently used token is evicted first"""
+    print_test("LRU eviction at max size")
+    
+    cache = TokenCache(max_size=2)
+    exp = time.time() + 3600
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    cache.get("a")
+    cache.put("c", {"exp": exp})
+    
+    passed = cache.get("a") is not None and cache.get("b") is None and cache.get("c") is not None
+    return print_result(passed, f"Evicted 'b', kept 'a' and 'c' ({cache.evictions} eviction)")
+
+
+def test_invalid_tokens_not_cached():
+    """Tampered and expired tokens are rejected and never cached"""
+    print_test("Invalid tokens are rejected")
+    
+    token_cache.clear()
+    valid = make_token()
+    tampered = valid[:-2] + ("AA" if not valid.endswith("AA") else "BB")
+    expired = make_token(expires_in=-10)
+    
+    rejected = 0
+    for token in (tampered, expired):
+        try:
+            decode_access_token(token)
+        except JWTError:
+            rejected += 1
+    
+    passed = rejected == 2 and token_cache.stats()["size"] == 0
+    return print_result(passed, f"{rejected}/2 rejected, cache size {token_cache.stats()['size']}")
+
+
+def test_payload_copy():
+    """Callers cannot modify the cached payload"""
+    print_test("Returned payload is a copy")
+    
+    token = make_token()
+    decode_access_token(token)["role"] = "Administrator"
+    return print_result(decode_access_token(token)["role"] == "Customer", "Cached role unchanged")
+
+
+def main():
+    """Run all token cache tests"""
+    print("\n" + "="*60)
+    print("  ORMS - Token Cache Tests")
+    print("="*60)
+    
+    results = [
+        test_repeated_token_hits_cache(),
+        test_entry_expires_at_exp(),
+        test_lru_eviction(),
+        test_invalid_tokens_not_cached(),
+        test_payload_copy()
+    ]
+    passed = all(results)
+    
+    print("\n" + "="*60)
+    print(f"  Token Cache Testing {'Passed' if passed else 'Failed'}")
+    print("="*60 + "\n")
+    
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()